@@ -7,8 +7,20 @@ import os
 # Agregar directorio del proyecto al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from data_processing.loader import load_and_clean
-from data_processing.classifier import classify_dataframe, apply_ai_classifications
+import profiling
+from config import MODO_DESARROLLO
+from data_processing import disk_cache, exports, memo
+from data_processing.incremental import clear_store
+from data_processing.manual_rules import load_rules
+from data_processing.ai_classifier import verdict_mapping
+from data_processing.bundle import list_bundles
+from data_processing.multi import store_name, unique_names
+from data_processing.pipeline import (
+    file_hash, filter_by_store, load_bundle, load_classified, load_incremental,
+    load_incremental_many, load_many, load_stores,
+)
+from visualizations.dev_panel import render_dev_panel
+from visualizations.tables import table_keys
 from pages import overview, products, clients, cities, temporal, costs, novelties, ai_status, pnl, carriers, alerts, ai_advisor
 
 # --- Configuración de la página ---
@@ -26,22 +38,97 @@ with st.sidebar:
 
     st.divider()
 
-    uploaded_file = st.file_uploader(
-        "Sube tu archivo de órdenes (.xlsx)",
-        type=["xlsx"],
-        help="Archivo Excel exportado de Dropi con todas las órdenes",
+    uploaded_files = st.file_uploader(
+        "Sube tus archivos de órdenes (.xlsx, .csv o .parquet)",
+        type=["xlsx", "csv", "parquet"],
+        accept_multiple_files=True,
+        help="Una o varias exportaciones de Dropi (varias tiendas o meses). Se cargan en paralelo "
+             "y de cada orden repetida se usa la de FECHA DE REPORTE más reciente.",
     )
 
-    if uploaded_file:
-        st.success(f"Archivo: {uploaded_file.name}")
-        file_size = uploaded_file.size / (1024 * 1024)
+    if uploaded_files:
+        if len(uploaded_files) == 1:
+            st.success(f"Archivo: {uploaded_files[0].name}")
+        else:
+            st.success(f"{len(uploaded_files)} archivos")
+        file_size = sum(f.size for f in uploaded_files) / (1024 * 1024)
         st.caption(f"Tamaño: {file_size:.1f} MB")
 
+    # Reportes generados en batch con cli.py: se abren sin recalcular
+    precalculado = None
+    reportes = {f"{c.name} · {m['generado'].replace('T', ' ')}": (str(c), m) for c, m in list_bundles()}
+    if reportes and not uploaded_files:
+        elegido = st.selectbox(
+            "O abre un reporte precalculado",
+            ["(ninguno)", *reportes],
+            key="reporte_precalculado",
+            help="Reportes generados con `python cli.py <exportaciones>`",
+        )
+        precalculado = reportes.get(elegido)
+
+    modo_incremental = st.checkbox(
+        "Modo incremental",
+        key="modo_incremental",
+        help="Acumula las exportaciones diarias en un histórico local: "
+             "solo se procesan las órdenes nuevas o con cambios.",
+    )
+    if modo_incremental and st.button("Reiniciar histórico", key="reset_store"):
+        clear_store()
+        st.cache_resource.clear()
+        st.rerun()
+
+    # Tienda de cada archivo: sugerida por el nombre (sin fechas), editable.
+    # En modo incremental queda guardada en el histórico con cada orden
+    tiendas = {}
+    if len(uploaded_files) > 1 or (uploaded_files and modo_incremental):
+        with st.expander("Tiendas por archivo"):
+            nombres = unique_names([f.name for f in uploaded_files])
+            for f, nombre in zip(uploaded_files, nombres):
+                tienda = st.text_input(nombre, value=store_name(f.name), key=f"tienda_{f.file_id}")
+                tiendas[nombre] = tienda.strip().upper() or store_name(f.name)
+
+    with st.expander("Cache en disco"):
+        cache = disk_cache.stats()
+        st.caption(
+            f"{cache['entradas']} datasets — {cache['bytes'] / 1024 ** 2:,.1f} MB "
+            f"de {cache['max_bytes'] / 1024 ** 2:,.0f} MB"
+        )
+        st.caption(
+            f"Aciertos: {cache['hits']} · Fallos: {cache['misses']} · "
+            f"Escrituras: {cache['writes']} · Expulsados: {cache['evictions']}"
+        )
+        descargas = exports.stats()
+        st.caption(
+            f"Descargas en memoria: {descargas['entradas']} — "
+            f"{descargas['bytes'] / 1024 ** 2:,.1f} MB de {descargas['max_bytes'] / 1024 ** 2:,.0f} MB"
+        )
+        metricas = memo.stats()
+        st.caption(
+            f"Métricas en memoria: {metricas['entradas']} — {metricas['bytes'] / 1024 ** 2:,.1f} MB · "
+            f"Aciertos: {metricas['hits']} · Fallos: {metricas['misses']} · "
+            f"Expulsados: {metricas['evictions']}"
+        )
+        if st.button("Vaciar cache", key="clear_disk_cache"):
+            disk_cache.clear()
+            exports.clear()
+            memo.clear()
+            st.cache_resource.clear()
+            st.rerun()
+
+    if MODO_DESARROLLO:
+        with st.expander("🛠️ Modo desarrollador"):
+            medir_memoria = st.checkbox("Medir memoria (tracemalloc)", key="dev_memoria",
+                                        help="Cota inferior: no ve los buffers de Arrow. Hace más lento el rerun.")
+            motor_perfil = st.selectbox("Perfilar la página", ["No perfilar", *profiling.motores()],
+                                        key="dev_motor")
+            panel_dev = st.container()
+        profiling.iniciar(memoria=medir_memoria)
+
     st.divider()
     st.caption("Desarrollado para Veynori Store")
 
 # --- Contenido principal ---
-if not uploaded_file:
+if not uploaded_files and not precalculado:
     st.title("📦 Dashboard de Efectividad de Entregas")
     st.markdown("""
     ### Bienvenido
@@ -57,70 +144,118 @@ if not uploaded_file:
     - **Alertas operativas** (flete sobrecosto, guías demoradas, tránsito lento)
     - **Consejero IA** que analiza tus datos y te da recomendaciones accionables
 
-    **Para comenzar**, sube tu archivo Excel de órdenes en la barra lateral.
+    **Para comenzar**, sube uno o varios archivos de órdenes (Excel, CSV o Parquet) en la
+    barra lateral o abre un reporte precalculado con `python cli.py`.
     """)
     st.stop()
 
 # Cargar y procesar datos
-file_content = uploaded_file.getvalue()
-df = load_and_clean(file_content, uploaded_file.name)
-
-# Clasificar estatus
-df = classify_dataframe(df)
+if uploaded_files:
+    # Hash de cada archivo: se calcula una sola vez por archivo subido
+    hashes = st.session_state.get("file_hashes", {})
+    st.session_state["file_hashes"] = hashes = {
+        f.file_id: hashes.get(f.file_id) or file_hash(f.getvalue()) for f in uploaded_files
+    }
+    file_keys = [hashes[f.file_id] for f in uploaded_files]
+    archivos = [(f.getvalue(), f.name) for f in uploaded_files]
 
-# Aplicar clasificaciones IA si existen
-if st.session_state.get("apply_ai") and st.session_state.get("ai_classifications"):
-    df = apply_ai_classifications(df, st.session_state["ai_classifications"])
-    st.session_state["apply_ai"] = False
+# Veredictos de IA y reglas manuales guardados (ver pages/ai_status): se aplican en cada carga
+overrides = {"ia": verdict_mapping(), "manual": load_rules()}
 
-# --- Tabs de navegación ---
-tabs = st.tabs([
-    "📊 Resumen",           # 0
-    "💵 P&L General",       # 1
-    "📦 Productos",         # 2
-    "👤 Clientes",          # 3
-    "🏙️ Ciudades",         # 4
-    "🚚 Transportadoras",   # 5
-    "⏱️ Tiempos",           # 6
-    "💰 Costos",            # 7
-    "🚨 Alertas",           # 8
-    "⚠️ Novedades",         # 9
-    "🧠 Consejero IA",      # 10
-    "🤖 IA - Estatus",      # 11
-])
+# Fecha de referencia de demorados, atascados y alertas: la del reporte
+# precalculado si se abrió uno (así coincide con sus métricas guardadas)
+hoy = None
 
-with tabs[0]:
-    overview.render(df)
+# Clasificación cacheada por (archivo, configuración, mapeos aplicados)
+with profiling.etapa("carga y clasificación") as medida:
+    if not uploaded_files:
+        carpeta, manifiesto = precalculado
+        abierto = load_bundle(carpeta, manifiesto["generado"], overrides=overrides)
+        if abierto is None:
+            st.warning("El reporte se generó con otra configuración o versión del dashboard. "
+                       "Vuelve a generarlo con `python cli.py`.")
+            st.stop()
+        df, _ = abierto
+        hoy = manifiesto["fecha_referencia"]
+        st.sidebar.caption(
+            f"Reporte de {manifiesto['archivo']}: {manifiesto['filas']:,} órdenes — "
+            f"fecha de referencia {manifiesto['fecha_referencia']}"
+        )
+    elif modo_incremental:
+        if len(archivos) == 1:
+            df, resumen = load_incremental(
+                *archivos[0],
+                file_key=file_keys[0],
+                tienda=tiendas[archivos[0][1]],
+                overrides=overrides,
+            )
+        else:
+            df, resumen = load_incremental_many(archivos, file_keys, tiendas, overrides=overrides)
+        st.sidebar.caption(
+            f"Histórico: {resumen['total']:,} órdenes — {resumen['nuevas']:,} nuevas, "
+            f"{resumen['cambiadas']:,} con cambios, {resumen['sin_cambio']:,} sin cambios, "
+            f"{resumen['antiguas']:,} más viejas que el histórico (ignoradas)"
+        )
+    elif len(archivos) == 1:
+        df = load_classified(
+            *archivos[0],
+            file_key=file_keys[0],
+            overrides=overrides,
+        )
+    else:
+        df = load_many(archivos, file_keys, overrides=overrides)
+        df = load_stores(df, tiendas)
+    medida["salida"] = df
 
-with tabs[1]:
-    pnl.render(df)
+# Filtro por tienda (con varias tiendas): aplica a todas las páginas
+if "TIENDA" in df.columns and len(df["TIENDA"].cat.categories) > 1:
+    todas = list(df["TIENDA"].cat.categories)
+    elegidas = [t for t in st.session_state.get("filtro_tiendas", todas) if t in todas]
+    st.session_state["filtro_tiendas"] = elegidas or todas
+    with st.sidebar:
+        elegidas = st.multiselect("Tiendas", todas, key="filtro_tiendas")
+    if elegidas and len(elegidas) < len(todas):
+        df = filter_by_store(df, elegidas)
 
-with tabs[2]:
-    products.render(df)
+# --- Navegación ---
+# Solo se ejecuta el render() de la página activa: el costo de cada rerun
+# depende de una página, no de la suma de todas.
+PAGINAS = {
+    "📊 Resumen": (overview, []),
+    "💵 P&L General": (pnl, ["gasto_pub_general"]),
+    "📦 Productos": (products, ["min_env_dev", "min_env_rent", "prod_search_keyword", "prod_search_select",
+                               *table_keys("tabla_dev", "tabla_rent")]),
+    "👤 Clientes": (clients, table_keys("tabla_bloquear")),
+    "🏙️ Ciudades": (cities, ["min_env_city_rent", *table_keys("tabla_no_enviar", "tabla_precaucion", "tabla_ciudades")]),
+    "🚚 Transportadoras": (carriers, ["min_env_carrier"]),
+    "⏱️ Tiempos": (temporal, table_keys("tabla_demorados", "tabla_atascados")),
+    "💰 Costos": (costs, []),
+    "🚨 Alertas": (alerts, table_keys("tabla_flete", "tabla_guia", "tabla_transito")),
+    "⚠️ Novedades": (novelties, []),
+    "🧠 Consejero IA": (ai_advisor, ["gasto_pub_ia", "ai_advisor_question"]),
+    "🤖 IA - Estatus": (ai_status, []),
+}
 
-with tabs[3]:
-    clients.render(df)
+# Streamlit descarta el estado de los widgets que no se dibujan en un rerun.
+# Reasignarlos mantiene filtros y textos de cada página al cambiar de sección.
+for _, keys in PAGINAS.values():
+    for key in keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
 
-with tabs[4]:
-    cities.render(df)
-
-with tabs[5]:
-    carriers.render(df)
-
-with tabs[6]:
-    temporal.render(df)
-
-with tabs[7]:
-    costs.render(df)
-
-with tabs[8]:
-    alerts.render(df)
-
-with tabs[9]:
-    novelties.render(df)
-
-with tabs[10]:
-    ai_advisor.render(df)
+with st.sidebar:
+    pagina = st.radio("Sección", list(PAGINAS), key="pagina_activa")
 
-with tabs[11]:
-    ai_status.render(df)
+page_module, _ = PAGINAS[pagina]
+if not MODO_DESARROLLO:
+    page_module.render(df, hoy=hoy)
+else:
+    reporte = None
+    with profiling.etapa(f"página {pagina}"):
+        if motor_perfil == "No perfilar":
+            page_module.render(df, hoy=hoy)
+        else:
+            with profiling.perfil(motor_perfil) as reporte:
+                page_module.render(df, hoy=hoy)
+    with panel_dev:
+        render_dev_panel(profiling.terminar(), reporte)
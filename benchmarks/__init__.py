@@ -0,0 +1 @@
+"""Benchmarks y generador de datos sintéticos para el dashboard."""
@@ -0,0 +1,78 @@
+"""Benchmark: conteos por categoría con lambdas vs indicadores/cubo.
+
+Compara la versión anterior (groupby + lambda por grupo) con las funciones
+actuales del analyzer y verifica que los conteos coincidan.
+
+Uso: python -m benchmarks.bench_aggregations --rows 10000 100000 1000000
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing import analyzer
+from data_processing.classifier import classify_dataframe
+from data_processing.loader import clean_data
+
+
+def _lambda_counts(df, key):
+    """Implementación anterior: una lambda de Python por grupo y categoría."""
+    enviados = df[df["TIENE_GUIA"]]
+    return enviados.groupby(key).agg(
+        Envíos=("ID", "count"),
+        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
+        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
+    ).reset_index()
+
+
+def _lambda_novelty(df):
+    with_novelty = df[df["NOVEDAD"].notna() & (df["NOVEDAD"] != "")]
+    return with_novelty.groupby("NOVEDAD").agg(
+        Total=("ID", "count"),
+        Resueltas=("FUE SOLUCIONADA LA NOVEDAD", lambda x: (x == "SI").sum()),
+    ).reset_index()
+
+
+def _check(name, expected, result, key, cols):
+    # Las claves categóricas se comparan como texto
+    a = expected.astype({key: object}).set_index(key)[cols].sort_index()
+    b = result.astype({key: object}).set_index(key)[cols].sort_index()
+    pd.testing.assert_frame_equal(a, b, check_dtype=False, check_names=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for n in args.rows:
+        df = classify_dataframe(clean_data(generate_orders(n)))
+        cols = ["Envíos", "Devoluciones", "Entregas"]
+        print(f"--- {n:,} filas ---")
+
+        # Producto y ciudad: el cubo se construye dentro del tiempo medido
+        base = df.copy(deep=False)
+        for key, fn in [("PRODUCTO", analyzer.get_product_analysis),
+                        ("CIUDAD DESTINO", lambda d: analyzer.get_city_analysis(d)["por_total"])]:
+            old, t_old = timed(_lambda_counts, df, key)
+            new, t_new = timed(fn, base)
+            _check(key, old, new, key, cols)
+            print(f"{key:>16} | lambda: {t_old:8.3f}s | nativo: {t_new:8.3f}s")
+
+        tel = "TELÉFONO"
+        old, t_old = timed(_lambda_counts, df, tel)
+        new, t_new = timed(lambda d: analyzer.get_client_analysis(d)["bloquear"], df)
+        bloq = old[old["Devoluciones"] >= 3].rename(columns={tel: "Teléfono", "Envíos": "Total_Pedidos"})
+        _check(tel, bloq, new, "Teléfono", ["Total_Pedidos", "Devoluciones", "Entregas"])
+        print(f"{'clientes':>16} | lambda: {t_old:8.3f}s | nativo: {t_new:8.3f}s")
+
+        old, t_old = timed(_lambda_novelty, df)
+        new, t_new = timed(lambda d: analyzer.get_novelty_analysis(d)["novedades_por_tipo"], df)
+        _check("NOVEDAD", old, new, "NOVEDAD", ["Total", "Resueltas"])
+        print(f"{'novedades':>16} | lambda: {t_old:8.3f}s | nativo: {t_new:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
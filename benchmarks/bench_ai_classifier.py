@@ -0,0 +1,83 @@
+"""Benchmark: clasificación IA de estatus en lotes concurrentes y con veredictos guardados.
+
+Usa un cliente local que imita la latencia de la API (no requiere API key ni
+red): cada llamada tarda --latencia segundos y responde el JSON de su lote.
+Mide la clasificación con una sola llamada en vuelo (como antes, en serie)
+vs con IA_CONCURRENCIA llamadas a la vez, y una segunda corrida que sale
+completa de los veredictos guardados sin llamar a la API.
+
+Uso: python -m benchmarks.bench_ai_classifier --estatus 400 --latencia 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from config import IA_CONCURRENCIA, IA_LOTE_ESTATUS
+from data_processing import ai_classifier
+
+_PALABRAS = {"DEVUEL": "DEVOLUCION", "ENTREG": "ENTREGADO", "CANCEL": "NUNCA_ENVIADO"}
+
+
+class StubClient:
+    """Cliente con la forma de AsyncAnthropic que cuenta las llamadas."""
+
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.llamadas = 0
+        self.messages = self
+
+    async def create(self, model, max_tokens, messages):
+        self.llamadas += 1
+        await asyncio.sleep(self.latencia)
+        lista = messages[0]["content"].split("Estatus a clasificar:\n", 1)[1].split("\n\n", 1)[0]
+        lote = [linea[2:] for linea in lista.splitlines()]
+        respuesta = {
+            s: next((c for palabra, c in _PALABRAS.items() if palabra in s), "EN_PROCESO") for s in lote
+        }
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(respuesta))])
+
+
+def _corrida(estatus: list, client: StubClient, concurrencia: int) -> tuple:
+    ai_classifier.IA_CONCURRENCIA = concurrencia
+    t0 = time.perf_counter()
+    resultado, errores = ai_classifier.classify_statuses(estatus, client=client)
+    return resultado, errores, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--estatus", type=int, default=400)
+    parser.add_argument("--latencia", type=float, default=1.5, help="segundos por llamada simulada")
+    args = parser.parse_args()
+
+    sufijos = ["EN REPARTO", "DEVUELTO AL REMITENTE", "ENTREGADO EN OFICINA", "CANCELADO POR CLIENTE"]
+    estatus = [f"ESTADO {i} {sufijos[i % len(sufijos)]}" for i in range(args.estatus)]
+    lotes = -(-len(estatus) // IA_LOTE_ESTATUS)
+    print(f"{len(estatus)} estatus en {lotes} lotes de {IA_LOTE_ESTATUS} · {args.latencia}s por llamada")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ai_classifier.IA_VEREDICTOS = str(Path(tmp) / "veredictos_ia.json")
+        filas = []
+        for nombre, concurrencia in [("en serie", 1), (f"concurrente ({IA_CONCURRENCIA})", IA_CONCURRENCIA)]:
+            ai_classifier.clear_verdicts()
+            client = StubClient(args.latencia)
+            resultado, errores, segundos = _corrida(estatus, client, concurrencia)
+            assert not errores and len(resultado) == len(estatus), errores
+            filas.append((nombre, segundos, client.llamadas))
+
+        client = StubClient(args.latencia)
+        resultado, _, segundos = _corrida(estatus, client, IA_CONCURRENCIA)
+        assert len(resultado) == len(estatus)
+        filas.append(("veredictos guardados", segundos, client.llamadas))
+
+    for nombre, segundos, llamadas in filas:
+        print(f"{nombre:>22}: {segundos:8.2f}s  {llamadas:3d} llamadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: análisis de transportadoras con bucle por transportadora vs cubo.
+
+Reemplaza la transportadora del generador por muchas transportadoras
+pequeñas (distribución de cola larga), que es el caso donde el bucle
+O(transportadoras × filas) se degrada. Verifica que ambos resultados
+coincidan.
+
+Uso: python -m benchmarks.bench_carriers --rows 100000 --carriers 2000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing import analyzer
+from data_processing.classifier import classify_dataframe
+from data_processing.loader import clean_data
+
+
+def _loop_carriers(df, min_envios=5):
+    """Implementación anterior: filtra el frame una vez por transportadora."""
+    enviados = df[df["TIENE_GUIA"]]
+    col_y = "PRECIO PROVEEDOR X CANTIDAD" if "PRECIO PROVEEDOR X CANTIDAD" in df.columns else "PRECIO PROVEEDOR"
+    carriers = []
+    for t in df["TRANSPORTADORA"].unique():
+        sub = enviados[enviados["TRANSPORTADORA"] == t]
+        if len(sub) < min_envios:
+            continue
+        sub_ent = sub[sub["CATEGORIA"] == "ENTREGADO"]
+        sub_dev = sub[sub["CATEGORIA"] == "DEVOLUCION"]
+        ganancia = int(sub_ent["TOTAL DE LA ORDEN"].sum() - sub_ent["PRECIO FLETE"].sum() - sub_ent[col_y].sum())
+        carriers.append({
+            "Transportadora": t,
+            "Envíos": len(sub),
+            "Entregas": len(sub_ent),
+            "Devoluciones": len(sub_dev),
+            "Flete Envío Prom": int(np.floor(sub["PRECIO FLETE"].mean())),
+            "Ganancia": ganancia,
+            "Rentabilidad": ganancia - int(sub_dev["PRECIO FLETE"].sum()),
+        })
+    return pd.DataFrame(carriers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--carriers", type=int, default=2_000)
+    args = parser.parse_args()
+
+    raw = generate_orders(args.rows)
+    rng = np.random.default_rng(7)
+    # Cola larga: pocas transportadoras grandes y muchas con un puñado de envíos
+    peso = 1 / np.arange(1, args.carriers + 1)
+    raw["TRANSPORTADORA"] = rng.choice(
+        [f"TRANSPORTADORA {i}" for i in range(args.carriers)], args.rows, p=peso / peso.sum()
+    )
+    df = classify_dataframe(clean_data(raw))
+
+    old, t_old = timed(_loop_carriers, df)
+    # El cubo se construye dentro del tiempo medido
+    new, t_new = timed(analyzer.get_carrier_analysis, df.copy(deep=False))
+
+    cols = list(old.columns)
+    pd.testing.assert_frame_equal(
+        old.set_index("Transportadora").sort_index(),
+        new[cols].set_index("Transportadora").sort_index(),
+        check_dtype=False, check_index_type=False,
+    )
+    print(f"{args.rows:,} filas · {args.carriers:,} transportadoras · {len(new):,} con >= 5 envíos")
+    print(f"bucle: {t_old:8.3f}s | cubo: {t_new:8.3f}s | {t_old / t_new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
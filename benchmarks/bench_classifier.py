@@ -0,0 +1,42 @@
+"""Benchmark: clasificación fila por fila vs vectorizada.
+
+Uso: python -m benchmarks.bench_classifier --rows 100000
+"""
+
+import argparse
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing.classifier import classify_status, classify_series
+from data_processing.loader import clean_data
+
+
+def _rowwise(df):
+    return df.apply(
+        lambda row: classify_status(row["ESTATUS"], row["TIENE_GUIA"]),
+        axis=1,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.rows:
+        df = clean_data(generate_orders(n))
+
+        expected, t_row = timed(_rowwise, df)
+        result, t_vec = timed(classify_series, df["ESTATUS"], df["TIENE_GUIA"])
+
+        # Paridad exacta con classify_status
+        mismatches = int((result.astype(str) != expected.astype(str)).sum())
+        if mismatches:
+            raise SystemExit(f"{n:,} filas: {mismatches} diferencias entre apply y vectorizado")
+
+        print(f"{n:>10,} filas | apply: {t_row:8.3f}s | vectorizado: {t_vec:8.4f}s "
+              f"| x{t_row / t_vec:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
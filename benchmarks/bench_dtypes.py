@@ -0,0 +1,33 @@
+"""Benchmark: memoria por columna del DataFrame crudo vs el esquema compacto.
+
+Uso: python -m benchmarks.bench_dtypes --rows 100000
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from data_processing.loader import clean_data, memory_report
+from data_processing.classifier import classify_dataframe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    raw = generate_orders(args.rows)
+    df = classify_dataframe(clean_data(raw))
+    report = memory_report(raw, df)
+
+    with pd.option_context("display.max_rows", None, "display.width", 140):
+        print(f"{args.rows:,} filas")
+        print(report.to_string(index=False))
+    total = report.iloc[-1]
+    print(f"\nTotal: {total['Bytes Antes'] / 1e6:.1f} MB → {total['Bytes Después'] / 1e6:.1f} MB "
+          f"({total['Bytes Después'] / total['Bytes Antes']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: descarga CSV eager en cada rerun vs exportación diferida y cacheada.
+
+Antes cada página serializaba sus tablas con to_csv(index=False).encode()
+en cada rerun. Ahora el render no serializa nada; el archivo se arma al
+hacer clic (por bloques) y queda en el cache de exportaciones. Mide el
+costo por rerun anterior, el primer clic en cada formato y el clic
+repetido, y verifica que el CSV por bloques sea idéntico byte a byte y que
+XLSX y Parquet se lean de vuelta con las mismas filas.
+
+Uso: python -m benchmarks.bench_exports --rows 200000
+"""
+
+import argparse
+import io
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing import exports
+from data_processing.classifier import classify_dataframe
+from data_processing.frame_cache import fingerprint
+from data_processing.loader import clean_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--xlsx-rows", type=int, default=20_000,
+                        help="filas para el libro Excel (openpyxl es lento)")
+    args = parser.parse_args()
+
+    df = classify_dataframe(clean_data(generate_orders(args.rows)))
+    tabla = df.drop(columns=["TIENE_GUIA"])
+
+    eager, t_eager = timed(lambda: tabla.to_csv(index=False).encode("utf-8"))
+    print(f"{len(tabla):,} filas · CSV eager por rerun: {t_eager:.2f}s ({len(eager) / 1024 ** 2:.1f} MB)")
+
+    _, t_hash = timed(lambda: fingerprint(df))
+    print(f"fingerprint del dataset (una vez por objeto): {t_hash:.2f}s")
+    clave = (fingerprint(df), "bench", ())
+
+    exports.clear()
+    csv, t_csv = timed(lambda: exports.export(tabla, "csv", clave))
+    assert csv == eager, "el CSV por bloques difiere de to_csv"
+    _, t_hit = timed(lambda: exports.export(tabla, "csv", clave))
+    print(f"CSV por bloques: primer clic {t_csv:.2f}s · clic repetido {t_hit * 1e3:.3f} ms")
+
+    parquet, t_pq = timed(lambda: exports.export(tabla, "parquet", clave))
+    leido = pd.read_parquet(io.BytesIO(parquet))
+    assert len(leido) == len(tabla) and list(leido.columns) == list(tabla.columns)
+    print(f"Parquet: primer clic {t_pq:.2f}s ({len(parquet) / 1024 ** 2:.1f} MB)")
+
+    muestra = tabla.head(args.xlsx_rows)
+    xlsx, t_xlsx = timed(lambda: exports.export(muestra, "xlsx", (clave, "muestra")))
+    leido = pd.read_excel(io.BytesIO(xlsx))
+    assert len(leido) == len(muestra) and list(leido.columns) == list(muestra.columns)
+    print(f"XLSX ({len(muestra):,} filas): primer clic {t_xlsx:.2f}s ({len(xlsx) / 1024 ** 2:.1f} MB)")
+
+    print(f"cache de exportaciones: {exports.stats()}")
+
+
+if __name__ == "__main__":
+    main()
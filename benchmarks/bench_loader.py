@@ -0,0 +1,64 @@
+"""Benchmark: tiempo de parseo y memoria pico por formato y lector.
+
+La memoria se mide con tracemalloc (asignaciones de Python/NumPy); las
+asignaciones internas de lectores nativos (calamine, pyarrow) no se ven
+completas, así que esa columna es una cota inferior para ellos.
+
+Uso: python -m benchmarks.bench_loader --rows 50000
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from data_processing import readers
+
+
+def _measure(fn, payload: bytes):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    df = fn(io.BytesIO(payload))
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    raw = generate_orders(args.rows)
+    payloads = {}
+    buf = io.BytesIO()
+    raw.to_excel(buf, index=False)
+    payloads["xlsx"] = buf.getvalue()
+    payloads["csv"] = raw.to_csv(index=False).encode("utf-8")
+    buf = io.BytesIO()
+    raw.to_parquet(buf, index=False)
+    payloads["parquet"] = buf.getvalue()
+
+    cases = [
+        ("xlsx", "pandas+openpyxl (anterior)", lambda f: pd.read_excel(f, engine="openpyxl")),
+        ("xlsx", "openpyxl read_only", readers._read_xlsx_openpyxl),
+        ("csv", "read_csv", readers.read_csv),
+        ("parquet", "pyarrow", readers.read_parquet),
+    ]
+    if readers._has_calamine():
+        cases.insert(2, ("xlsx", "calamine", readers.read_xlsx))
+
+    print(f"{args.rows:,} filas")
+    for fmt, name, fn in cases:
+        df, elapsed, peak = _measure(fn, payloads[fmt])
+        size_mb = len(payloads[fmt]) / 1e6
+        print(f"{fmt:>8} {size_mb:7.1f} MB | {name:<28} | {elapsed:7.2f}s | "
+              f"pico {peak / 1e6:8.1f} MB | {df.shape[1]} columnas")
+
+
+if __name__ == "__main__":
+    main()
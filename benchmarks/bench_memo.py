@@ -0,0 +1,78 @@
+"""Benchmark: métricas del analyzer recalculadas en cada rerun vs memoizadas.
+
+Antes cada rerun de una página volvía a calcular sus get_*; el resumen del
+Consejero IA recalculaba cinco de ellos (y get_pnl_general dos veces con
+gasto en publicidad). Con data_processing.memo cada métrica se calcula una
+vez por versión del dataset. Mide el resumen del Consejero y el rerun de
+varias páginas sin cache y con él, verifica que los resultados coincidan y
+muestra los contadores del cache.
+
+Uso: python -m benchmarks.bench_memo --rows 500000
+"""
+
+import argparse
+import importlib
+import inspect
+
+from benchmarks.suite import _silenciar_streamlit
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import measure
+from data_processing import analyzer, memo
+from data_processing.classifier import classify_dataframe
+from data_processing.cube import get_cube
+from data_processing.loader import clean_data
+
+PAGINAS = ["overview", "pnl", "products", "cities", "carriers", "temporal", "alerts"]
+
+
+def _resumen(df):
+    from pages.ai_advisor import _build_data_summary
+
+    texto = _build_data_summary(df)
+    analyzer.get_pnl_general(df)  # gasto en publicidad > 0
+    return texto
+
+
+def _check(df):
+    """Los resultados memoizados son iguales al cálculo directo."""
+    for nombre in ("get_general_metrics", "get_pnl_general", "get_city_profitability"):
+        fn = getattr(analyzer, nombre)
+        directo, memoizado = inspect.unwrap(fn)(df), fn(df)
+        iguales = (directo.equals(memoizado) if hasattr(directo, "equals")
+                   else repr(directo) == repr(memoizado))
+        assert iguales, nombre
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = classify_dataframe(clean_data(generate_orders(args.rows)))
+    get_cube(df)
+    _silenciar_streamlit()
+    paginas = [importlib.import_module(f"pages.{p}") for p in PAGINAS]
+
+    def sin_cache(fn):
+        def correr():
+            memo.clear()
+            fn()
+        return correr
+
+    casos = [("resumen Consejero IA", lambda: _resumen(df))]
+    casos += [(f"page.{p.__name__.split('.')[-1]}", lambda p=p: p.render(df)) for p in paginas]
+    print(f"{'':>24} {'sin cache':>12} {'memoizado':>12}")
+    for nombre, fn in casos:
+        frio = measure(sin_cache(fn), 3)["min"]
+        fn()
+        caliente = measure(fn, 3)["min"]
+        print(f"{nombre:>24} {frio * 1e3:10.1f}ms {caliente * 1e3:10.1f}ms  x{frio / caliente:6.1f}")
+
+    _check(df)
+    stats = memo.stats()
+    print(f"cache: {stats['entradas']} entradas, {stats['bytes'] / 1024 ** 2:.1f} MB, "
+          f"{stats['hits']} aciertos, {stats['misses']} fallos, {stats['evictions']} expulsiones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: memoria pico por etapa del pipeline y control de copias.
+
+Para cada etapa (clean_data, classify_dataframe, apply_ai_classifications y
+el conjunto de funciones del analyzer) mide con tracemalloc el tiempo y el
+pico de memoria, expresado en múltiplos del tamaño del frame base (el
+DataFrame limpio). Además verifica que el pipeline retenga como máximo una
+copia materializada del frame base: classify/apply deben compartir las
+columnas de entrada y la memoria retenida al final no puede superar
+MAX_COPIAS. Sale con código 1 si falla (sirve como prueba de regresión).
+
+tracemalloc no ve los buffers de Arrow (columnas str de pandas 3), así que
+para esas columnas el control de copias se hace comparando buffers.
+
+Uso: python -m benchmarks.bench_memory --rows 200000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import generate_orders
+from data_processing import analyzer
+from data_processing.loader import clean_data
+from data_processing.classifier import classify_dataframe, apply_ai_classifications
+
+# Memoria retenida por clean → classify → apply, en copias del frame base
+# (1 copia + las columnas nuevas CATEGORIA/UTILIDAD)
+MAX_COPIAS = 1.25
+
+
+def _frame_bytes(df) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _measure(fn, *args):
+    """(resultado, segundos, pico de la etapa). tracemalloc ya debe estar activo."""
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    return out, elapsed, peak - base
+
+
+def _buffers(series) -> set:
+    """Direcciones de los buffers de datos de una columna (numpy o Arrow)."""
+    arr = series.array
+    if hasattr(arr, "_pa_array"):
+        return {b.address for chunk in arr._pa_array.chunks for b in chunk.buffers() if b is not None}
+    values = getattr(arr, "codes", None)
+    if values is None:
+        values = np.asarray(getattr(arr, "_ndarray", arr))
+    return {values.__array_interface__["data"][0]} if values.size else set()
+
+
+def _shared_columns(src, dst) -> list:
+    """Columnas de src cuyos buffers siguen compartidos por dst (no se copiaron)."""
+    return [
+        col for col in src.columns
+        if col in dst.columns and _buffers(src[col]) and _buffers(src[col]) == _buffers(dst[col])
+    ]
+
+
+def _run_analyzer(df):
+    for name in dir(analyzer):
+        if name.startswith("get_") and name != "get_product_search_metrics":
+            getattr(analyzer, name)(df)
+    analyzer.get_product_search_metrics(df, df["PRODUCTO"].dropna().unique()[:3].tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    raw = generate_orders(args.rows)
+    mapping = {"EN VERIFICACION": "EN PROCESO", "SINIESTRO": "DEVOLUCION"}
+
+    tracemalloc.start()
+    clean, t_clean, p_clean = _measure(clean_data, raw)
+    classified, t_cls, p_cls = _measure(classify_dataframe, clean)
+    with_ai, t_ai, p_ai = _measure(apply_ai_classifications, classified, mapping)
+    retenida, _ = tracemalloc.get_traced_memory()
+    # El cubo se construye fuera de la medición: es un agregado, no una copia
+    analyzer.get_cube(classified)
+    _, t_an, p_an = _measure(_run_analyzer, classified)
+    tracemalloc.stop()
+    base = _frame_bytes(clean)
+
+    etapas = [
+        ("clean_data", t_clean, p_clean, None),
+        ("classify_dataframe", t_cls, p_cls, (clean, classified)),
+        ("apply_ai_classifications", t_ai, p_ai, (classified, with_ai)),
+        ("analyzer.get_*", t_an, p_an, None),
+    ]
+
+    print(f"{args.rows:,} filas · frame base {base / 1e6:.1f} MB")
+    fallas = []
+    for nombre, elapsed, peak, par in etapas:
+        copias = peak / base
+        linea = f"{nombre:<26} {elapsed:7.2f}s | pico {peak / 1e6:8.1f} MB | {copias:5.2f} copias"
+        if par is not None:
+            src, dst = par
+            # Columnas que la etapa reescribe a propósito (ver apply_overrides)
+            esperadas = [c for c in src.columns if c not in ("CATEGORIA", "ORIGEN", "UTILIDAD")]
+            compartidas = _shared_columns(src, dst)
+            linea += f" | columnas compartidas {len([c for c in esperadas if c in compartidas])}/{len(esperadas)}"
+            if any(c not in compartidas for c in esperadas):
+                fallas.append(f"{nombre}: copió columnas de entrada")
+        print(linea)
+
+    copias = retenida / base
+    print(f"\nRetenido por clean → classify → apply: {retenida / 1e6:.1f} MB ({copias:.2f} copias)")
+    if copias > MAX_COPIAS:
+        fallas.append(f"el pipeline retiene {copias:.2f} copias del frame base (máx {MAX_COPIAS})")
+
+    if fallas:
+        print("\n".join(["", "FALLA:"] + fallas))
+        sys.exit(1)
+    print("OK: el pipeline materializa una sola copia del frame base")
+
+
+if __name__ == "__main__":
+    main()
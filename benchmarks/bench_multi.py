@@ -0,0 +1,50 @@
+"""Benchmark: carga de varias exportaciones en secuencia vs en el pool de procesos.
+
+Genera N exportaciones CSV sintéticas (la primera mitad de cada una repite
+los IDs de la anterior, como archivos mensuales que se solapan) y mide
+read_orders + clean_data de todas en secuencia, en paralelo con
+multi.parse_many (pool ya iniciado) y del archivo más grande solo. Con
+suficientes CPUs el tiempo en paralelo se acerca al del archivo más grande.
+Verifica que la unión deduplicada tenga un ID por fila.
+
+Uso: python -m benchmarks.bench_multi --files 4 --rows 300000
+"""
+
+import argparse
+import os
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from config import MAX_PROCESOS_CARGA
+from data_processing import multi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=300_000)
+    args = parser.parse_args()
+
+    archivos = []
+    for i in range(args.files):
+        raw = generate_orders(args.rows, seed=i)
+        raw["ID"] += i * args.rows // 2
+        archivos.append((raw.to_csv(index=False).encode("utf-8"), f"tienda_{i}.csv"))
+
+    print(f"{args.files} archivos de {args.rows:,} filas · {MAX_PROCESOS_CARGA} procesos "
+          f"(DASHBOARD_LOAD_WORKERS) · {os.cpu_count()} CPUs")
+    _, secuencial = timed(lambda: [multi.parse_export(*a) for a in archivos])
+    multi.parse_many(archivos[:2])  # arranque del pool (spawn importa pandas en cada proceso)
+    frames, paralelo = timed(lambda: multi.parse_many(archivos))
+    _, uno = timed(lambda: multi.parse_export(*archivos[0]))
+    df, union = timed(lambda: multi.combine(frames, [n for _, n in archivos]))
+
+    print(f"{'secuencial':>20}: {secuencial:8.2f}s")
+    print(f"{'paralelo':>20}: {paralelo:8.2f}s")
+    print(f"{'un archivo':>20}: {uno:8.2f}s")
+    print(f"{'unión + dedupe':>20}: {union:8.2f}s → {len(df):,} órdenes")
+    assert df["ID"].is_unique
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: métricas del buscador con isin sobre el frame vs tabla por producto.
+
+Compara, para selecciones de distinto tamaño, el filtro anterior
+(df["PRODUCTO"].isin(seleccion) + sumas por categoría, y get_product_profitability
+completo para el desglose) con la suma de filas precalculadas de
+product_metrics. Verifica que las métricas coincidan.
+
+Uso: python -m benchmarks.bench_product_metrics --rows 500000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing import analyzer
+from data_processing.classifier import classify_dataframe
+from data_processing.loader import clean_data
+
+
+def _isin_metrics(df, productos):
+    """Implementación anterior: filtra el DataFrame completo por selección."""
+    sub = df[df["PRODUCTO"].isin(productos)]
+    env = sub[sub["TIENE_GUIA"]]
+    ent = env[env["CATEGORIA"] == "ENTREGADO"]
+    dev = env[env["CATEGORIA"] == "DEVOLUCION"]
+    return {
+        "total_ordenes": len(sub),
+        "envios": len(env),
+        "entregas": len(ent),
+        "devoluciones": len(dev),
+        "perdida_devoluciones": int(dev["PRECIO FLETE"].sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    df = classify_dataframe(clean_data(generate_orders(args.rows)))
+    productos = df["PRODUCTO"].dropna().unique().tolist()
+    rng = np.random.default_rng(1)
+
+    t0 = time.perf_counter()
+    analyzer.get_product_table(df)
+    print(f"{args.rows:,} filas · {len(productos)} productos · tabla en {time.perf_counter() - t0:.2f}s (una vez)")
+
+    for k in (1, 5, 20):
+        sel = rng.choice(productos, min(k, len(productos)), replace=False).tolist()
+        old, t_old = timed(_isin_metrics, df, sel, repeat=5)
+        new, t_new = timed(analyzer.get_product_search_metrics, df, sel, repeat=5)
+        assert all(old[key] == new[key] for key in old), (old, new)
+
+        completo = analyzer.get_product_profitability
+        _, t_old_det = timed(lambda: completo(df)[lambda p: p["PRODUCTO"].isin(sel)], repeat=5)
+        _, t_new_det = timed(analyzer.get_product_profitability, df, sel, repeat=5)
+        print(f"{k:>3} productos | métricas isin: {t_old * 1e3:8.2f} ms | tabla: {t_new * 1e3:6.2f} ms"
+              f" | desglose tabla completa + isin: {t_old_det * 1e3:7.2f} ms | solo selección: {t_new_det * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
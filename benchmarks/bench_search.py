@@ -0,0 +1,86 @@
+"""Benchmark: búsqueda de productos por escaneo lineal vs índice invertido.
+
+Genera un catálogo sintético de nombres de producto y compara el filtro
+anterior (sorted(unique) + `query in nombre` en cada rerun) con
+ProductIndex.search. Verifica que toda coincidencia por subcadena del
+escaneo aparezca también en el índice, en las consultas fijas y en
+consultas aleatorias (subcadenas cortas y tramos que cruzan palabras).
+
+Uso: python -m benchmarks.bench_search --products 50000
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks.timing import timed
+from data_processing.search_index import ProductIndex
+
+_PALABRAS = [
+    "AUDÍFONO", "BLUETOOTH", "LINTERNA", "TÁCTICA", "HIDROLAVADORA", "DRON", "CÁMARA",
+    "RELOJ", "INTELIGENTE", "MASAJEADOR", "CERVICAL", "LÁMPARA", "SOLAR", "CARGADOR",
+    "INALÁMBRICO", "PARLANTE", "PORTÁTIL", "ASPIRADORA", "MINI", "PRO", "MAX", "KIT",
+    "SECADOR", "CABELLO", "PLANCHA", "FAJA", "REDUCTORA", "TERMO", "BOTELLA", "MOCHILA",
+]
+
+_CONSULTAS = ["audif", "linterna tac", "hidrolabadora", "dron", "lampara solar", "kit 12", "xyz"]
+
+
+def _catalogo(n, seed=3):
+    rng = np.random.default_rng(seed)
+    nombres = set()
+    while len(nombres) < n:
+        palabras = rng.choice(_PALABRAS, rng.integers(2, 5), replace=False)
+        nombres.add(" ".join(palabras) + f" {rng.integers(1, 10_000)}")
+    return list(nombres)
+
+
+def _escaneo(productos, query):
+    """Implementación anterior de las páginas de búsqueda."""
+    todos = sorted(productos)
+    return [p for p in todos if query.upper() in p.upper()]
+
+
+def consultas_aleatorias(productos, n, seed=7):
+    """Subcadenas de 1 a 4 caracteres y tramos que cruzan palabras, tomados de nombres reales."""
+    rng = np.random.default_rng(seed)
+    consultas = []
+    for nombre in rng.choice(productos, n):
+        if rng.random() < 0.5:
+            largo = int(rng.integers(1, 5))
+        else:
+            largo = int(rng.integers(5, min(len(nombre), 16) + 1))
+        inicio = int(rng.integers(0, max(1, len(nombre) - largo + 1)))
+        consulta = nombre[inicio:inicio + largo]
+        consultas.append(consulta.lower() if rng.random() < 0.5 else consulta)
+    return consultas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--parity", type=int, default=500, help="consultas aleatorias para verificar paridad")
+    args = parser.parse_args()
+
+    productos = _catalogo(args.products)
+    index, t_index = timed(ProductIndex, productos)
+    print(f"{len(productos):,} productos · índice construido en {t_index:.2f}s")
+
+    for query in _CONSULTAS:
+        viejo, t_old = timed(_escaneo, productos, query)
+        nuevo, t_new = timed(index.search, query, repeat=args.repeat)
+
+        faltan = set(viejo) - set(nuevo)
+        assert not faltan, f"'{query}': el índice no devuelve {len(faltan)} coincidencias del escaneo"
+        print(f"{query!r:>18} | escaneo: {t_old * 1e3:8.2f} ms ({len(viejo):>6,}) | "
+              f"índice: {t_new * 1e3:8.3f} ms ({len(nuevo):>6,})")
+
+    for query in consultas_aleatorias(productos, args.parity):
+        faltan = set(_escaneo(productos, query)) - set(index.search(query))
+        assert not faltan, f"'{query}': el índice no devuelve {len(faltan)} coincidencias del escaneo"
+    print(f"paridad con el escaneo: {args.parity} consultas aleatorias sin faltantes")
+
+
+if __name__ == "__main__":
+    main()
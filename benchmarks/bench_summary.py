@@ -0,0 +1,65 @@
+"""Benchmark: serialización del resumen del negocio (data_processing.summary).
+
+Mide render_lines (formateo por columnas) contra el armado fila a fila con
+iterrows sobre la tabla de rentabilidad por producto completa (sin top-N),
+verifica que ambos den el mismo texto, y mide el resumen completo del
+consejero (business_summary + summary_text / summary_json) con las
+métricas del analyzer ya en cache.
+
+Uso: python -m benchmarks.bench_summary --rows 200000 --products 2000
+"""
+
+import argparse
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import timed
+from data_processing.analyzer import get_product_profitability
+from data_processing.classifier import classify_dataframe
+from data_processing.loader import clean_data
+from data_processing.summary import PLANTILLAS, business_summary, render_lines, summary_json, summary_text
+
+
+def _iterrows(tabla) -> str:
+    texto = ""
+    for _, r in tabla.iterrows():
+        texto += (
+            f"  - {r['PRODUCTO']}: {r['Envíos']} envíos, "
+            f"Rentabilidad=${r['Rentabilidad Real']:,}, "
+            f"Rent/Envío=${r['Rent/Envío']:,}\n"
+        )
+    return texto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    raw = generate_orders(args.rows)
+    raw["PRODUCTO"] = "PRODUCTO " + (raw.index % args.products).astype(str)
+    df = classify_dataframe(clean_data(raw))
+    productos = get_product_profitability(df)
+
+    print(f"{args.rows:,} filas · {len(productos):,} productos")
+    filas = []
+    antes, t_antes = timed(lambda: _iterrows(productos), repeat=args.repeat, warmup=True)
+    ahora, t_ahora = timed(
+        lambda: "".join(render_lines(productos, PLANTILLAS["prod_ganando"])), repeat=args.repeat, warmup=True
+    )
+    assert antes == ahora
+    filas += [("tabla con iterrows", t_antes), ("tabla con render_lines", t_ahora)]
+
+    resumen, t_resumen = timed(lambda: business_summary(df), repeat=args.repeat, warmup=True)
+    texto, t_texto = timed(lambda: summary_text(resumen), repeat=args.repeat, warmup=True)
+    _, t_json = timed(lambda: summary_json(resumen), repeat=args.repeat, warmup=True)
+    filas += [("business_summary", t_resumen), ("summary_text", t_texto), ("summary_json", t_json)]
+
+    for nombre, segundos in filas:
+        print(f"{nombre:>24}: {segundos * 1000:8.2f} ms")
+    print(f"resumen: {len(texto):,} caracteres")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark: tabla completa con formato en texto y Styler vs tabla paginada.
+
+Antes la tabla de rentabilidad convertía cada monto a texto con
+apply(f"${x:,}") y resaltaba filas con Styler.apply(axis=1) sobre la tabla
+entera. La tabla paginada filtra y ordena en el servidor y solo formatea y
+resalta la página visible. Mide ambos caminos sobre una tabla sintética del
+tamaño pedido.
+
+Uso: python -m benchmarks.bench_tables --rows 200000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.timing import timed
+from config import TABLA_FILAS_PAGINA
+from visualizations.tables import filtrar_ordenar
+
+_DINERO = ["Ganancia Entregas", "Pérdida Devoluciones", "Rentabilidad Real", "Rent/Envío"]
+
+
+def _tabla(n, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "PRODUCTO": [f"PRODUCTO {i}" for i in range(n)],
+        "Envíos": rng.integers(1, 500, n),
+        "Entregas": rng.integers(0, 300, n),
+        "Devoluciones": rng.integers(0, 200, n),
+        **{c: rng.integers(-2_000_000, 2_000_000, n) for c in _DINERO},
+    })
+
+
+def _anterior(tabla):
+    """Formato en texto + Styler fila a fila sobre toda la tabla."""
+    def highlight_profit(row):
+        if row.get("Rentabilidad Real", 0) < 0:
+            return ["background-color: #ffcccc"] * len(row)
+        return [""] * len(row)
+
+    display = tabla.copy()
+    for col in _DINERO:
+        display[col] = display[col].apply(lambda x: f"${x:,}")
+    # El resaltado compara sobre los montos numéricos (con texto falla)
+    estilos = tabla.apply(highlight_profit, axis=1, result_type="expand")
+    return display.style.apply(lambda _: estilos.to_numpy(), axis=None)._compute()
+
+
+def _paginada(tabla):
+    """Filtro + orden en servidor; Styler solo sobre la página visible."""
+    pos = filtrar_ordenar(tabla, "PRODUCTO 1", "Rentabilidad Real", True)
+    pagina = tabla.iloc[pos[:TABLA_FILAS_PAGINA]].reset_index(drop=True)
+    mask = (pagina["Rentabilidad Real"] < 0).to_numpy()
+    estilos = np.where(mask, "background-color: #ffcccc", "")
+    return pagina.style.apply(lambda d: np.repeat(estilos[:, None], d.shape[1], axis=1), axis=None)._compute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    tabla = _tabla(args.rows)
+    for nombre, fn in (("completa con Styler", _anterior), ("paginada", _paginada)):
+        _, segundos = timed(fn, tabla)
+        print(f"{nombre:>20}: {segundos:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
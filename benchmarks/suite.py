@@ -0,0 +1,276 @@
+"""Suite de benchmarks del dashboard con historial y detección de regresiones.
+
+Mide, sobre exportaciones sintéticas (ver benchmarks.synthetic) de varios
+tamaños:
+
+- load_and_clean por formato de archivo (sin el cache de Streamlit)
+- classify_dataframe
+- get_cube (estructura compartida por la mayoría de las vistas)
+- cada analyzer.get_* (con las estructuras derivadas ya construidas y sin
+  el cache de métricas de data_processing.memo: se mide el cálculo)
+- el render de cada página en modo bare (sin servidor de Streamlit); el
+  cache de métricas se vacía antes de cada página, así que «primera» es el
+  render en frío y la mediana el rerun con las métricas ya calculadas
+
+Cada corrida se agrega a un historial JSON; compare contrasta dos corridas
+y termina con código 1 si alguna medición empeoró más que el umbral.
+
+Uso:
+    python -m benchmarks.suite run --rows 10000 100000 1000000
+    python -m benchmarks.suite compare --threshold 0.2
+    python -m benchmarks.suite list
+"""
+
+import argparse
+import fnmatch
+import importlib
+import inspect
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from benchmarks.timing import measure
+
+HISTORIAL = Path(__file__).parent / "history.json"
+
+# Páginas del dashboard (módulos en pages/ con render(df))
+PAGINAS = [
+    "overview", "pnl", "products", "clients", "cities", "carriers", "temporal",
+    "costs", "alerts", "novelties", "ai_advisor", "ai_status", "search",
+]
+
+# Encima de este tamaño no se genera el Excel de prueba (openpyxl es muy lento
+# escribiendo y Excel no admite más de ~1M filas)
+MAX_FILAS_XLSX = 100_000
+
+
+def _payload(raw: pd.DataFrame, formato: str) -> bytes:
+    buf = io.BytesIO()
+    if formato == "csv":
+        return raw.to_csv(index=False).encode("utf-8")
+    if formato == "parquet":
+        raw.to_parquet(buf, index=False)
+    else:
+        raw.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+def _silenciar_streamlit():
+    """En modo bare Streamlit avisa en cada elemento (sin ScriptRunContext, deprecaciones)."""
+    for nombre in list(logging.root.manager.loggerDict):
+        if nombre.startswith("streamlit"):
+            logging.getLogger(nombre).disabled = True
+
+
+def _funciones_analyzer(analyzer):
+    """(nombre, función) de cada get_* definido en analyzer."""
+    return [
+        (nombre, fn) for nombre, fn in inspect.getmembers(analyzer, inspect.isfunction)
+        if nombre.startswith("get_") and fn.__module__ == analyzer.__name__
+    ]
+
+
+def _argumentos(fn, df) -> tuple | None:
+    """Argumentos posicionales además de df, o None si no se sabe cómo llamarla."""
+    extra = [
+        p for p in list(inspect.signature(fn).parameters.values())[1:]
+        if p.default is inspect.Parameter.empty
+    ]
+    if not extra:
+        return ()
+    if [p.name for p in extra] == ["productos"]:
+        return (df["PRODUCTO"].value_counts().index[:3].tolist(),)
+    return None
+
+
+def casos(raw: pd.DataFrame, formatos):
+    """Genera (nombre, función a medir) para un dataset crudo."""
+    from data_processing import analyzer, memo
+    from data_processing.classifier import classify_dataframe
+    from data_processing.cube import get_cube
+    from data_processing.loader import load_and_clean
+
+    cargar = getattr(load_and_clean, "__wrapped__", load_and_clean)
+    limpio = None
+    for formato in formatos:
+        if formato == "xlsx" and len(raw) > MAX_FILAS_XLSX:
+            continue
+        payload = _payload(raw, formato)
+        yield f"load_and_clean[{formato}]", lambda p=payload, f=formato: cargar(p, f"ordenes.{f}")
+        if limpio is None:
+            limpio = cargar(payload, f"ordenes.{formato}")
+
+    yield "classify_dataframe", lambda: classify_dataframe(limpio)
+    df = classify_dataframe(limpio)
+
+    # Cubo en frío: cada repetición sobre un objeto nuevo (el cache es por objeto)
+    yield "get_cube", lambda: get_cube(df.copy(deep=False))
+    get_cube(df)
+
+    for nombre, fn in _funciones_analyzer(analyzer):
+        args = _argumentos(fn, df)
+        if args is None:
+            print(f"  (omitido {nombre}: argumentos desconocidos)")
+            continue
+        calculo = inspect.unwrap(fn)
+        yield f"analyzer.{nombre}", lambda fn=calculo, args=args: fn(df, *args)
+
+    _silenciar_streamlit()
+    for pagina in PAGINAS:
+        modulo = importlib.import_module(f"pages.{pagina}")
+        memo.clear()
+        yield f"page.{pagina}", lambda modulo=modulo: modulo.render(df)
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=Path(__file__).parent, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _entorno() -> dict:
+    import streamlit
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "streamlit": streamlit.__version__,
+        "maquina": platform.machine(),
+    }
+
+
+def cargar_historial(path: Path) -> list:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def run(args) -> int:
+    corrida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "etiqueta": args.label,
+        "entorno": _entorno(),
+        "resultados": {},
+    }
+    for n in args.rows:
+        print(f"--- {n:,} filas ---")
+        raw = generate_orders(n)
+        resultados = {}
+        for nombre, fn in casos(raw, args.formats):
+            if args.only and not any(fnmatch.fnmatch(nombre, p) for p in args.only):
+                continue
+            medida = resultados[nombre] = measure(fn, args.repeat)
+            print(f"{nombre:<42} mediana {medida['mediana'] * 1e3:10.1f} ms | "
+                  f"primera {medida['primera'] * 1e3:10.1f} ms")
+        corrida["resultados"][str(n)] = resultados
+
+    historial = cargar_historial(args.history)
+    historial.append(corrida)
+    args.history.write_text(json.dumps(historial, indent=1, ensure_ascii=False), encoding="utf-8")
+    print(f"Corrida #{len(historial) - 1} guardada en {args.history}")
+    return 0
+
+
+def comparar(base: dict, actual: dict, umbral: float, min_ms: float) -> list:
+    """Filas (filas, caso, base s, actual s, razón, estado) de las mediciones comunes."""
+    filas = []
+    for n, casos_base in base["resultados"].items():
+        casos_actual = actual["resultados"].get(n, {})
+        for nombre, medida in casos_base.items():
+            if nombre not in casos_actual:
+                continue
+            # El mínimo de las repeticiones es el menos sensible al ruido de la máquina
+            antes, ahora = medida["min"], casos_actual[nombre]["min"]
+            razon = ahora / antes if antes else float("inf")
+            estado = ""
+            if abs(ahora - antes) * 1e3 >= min_ms:
+                if razon > 1 + umbral:
+                    estado = "REGRESIÓN"
+                elif razon < 1 / (1 + umbral):
+                    estado = "mejora"
+            filas.append((int(n), nombre, antes, ahora, razon, estado))
+    return filas
+
+
+def _titulo(i: int, corrida: dict) -> str:
+    etiqueta = f" «{corrida['etiqueta']}»" if corrida.get("etiqueta") else ""
+    return f"#{i} {corrida['fecha']} ({corrida.get('commit') or 'sin commit'}){etiqueta}"
+
+
+def compare(args) -> int:
+    historial = cargar_historial(args.history)
+    if len(historial) < 2:
+        print(f"Se necesitan al menos dos corridas en {args.history}")
+        return 2
+    i_base = args.base % len(historial)
+    i_actual = args.head % len(historial)
+    base, actual = historial[i_base], historial[i_actual]
+    print(f"Base:   {_titulo(i_base, base)}")
+    print(f"Actual: {_titulo(i_actual, actual)}")
+    if base["entorno"] != actual["entorno"]:
+        print(f"Aviso: entornos distintos {base['entorno']} → {actual['entorno']}")
+
+    filas = comparar(base, actual, args.threshold, args.min_ms)
+    for n, nombre, antes, ahora, razon, estado in filas:
+        if estado or args.all:
+            print(f"{n:>10,} {nombre:<42} {antes * 1e3:10.1f} → {ahora * 1e3:10.1f} ms  "
+                  f"x{razon:5.2f}  {estado}")
+
+    regresiones = sum(1 for *_, estado in filas if estado == "REGRESIÓN")
+    mejoras = sum(1 for *_, estado in filas if estado == "mejora")
+    print(f"{len(filas)} mediciones comparadas · {regresiones} regresiones · {mejoras} mejoras "
+          f"(umbral {args.threshold:.0%}, mínimo {args.min_ms:g} ms)")
+    return 1 if regresiones else 0
+
+
+def listar(args) -> int:
+    for i, corrida in enumerate(cargar_historial(args.history)):
+        tamaños = ", ".join(f"{int(n):,}" for n in corrida["resultados"])
+        print(f"{_titulo(i, corrida)} · filas: {tamaños}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=Path, default=HISTORIAL, help="archivo JSON de historial")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_run = sub.add_parser("run", help="ejecuta la suite y agrega la corrida al historial")
+    p_run.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    p_run.add_argument("--repeat", type=int, default=5)
+    p_run.add_argument("--formats", nargs="+", default=["csv", "parquet"],
+                       choices=["csv", "parquet", "xlsx"])
+    p_run.add_argument("--only", nargs="+", help="patrones de nombres a medir (p.ej. 'page.*')")
+    p_run.add_argument("--label", help="etiqueta libre para la corrida")
+    p_run.set_defaults(fn=run)
+
+    p_cmp = sub.add_parser("compare", help="compara dos corridas del historial")
+    p_cmp.add_argument("--base", type=int, default=-2, help="índice de la corrida base (default: penúltima)")
+    p_cmp.add_argument("--head", type=int, default=-1, help="índice de la corrida a evaluar (default: última)")
+    p_cmp.add_argument("--threshold", type=float, default=0.2, help="empeoramiento relativo tolerado")
+    p_cmp.add_argument("--min-ms", type=float, default=5.0, help="diferencia mínima para marcar (ms)")
+    p_cmp.add_argument("--all", action="store_true", help="muestra también las mediciones sin cambios")
+    p_cmp.set_defaults(fn=compare)
+
+    p_list = sub.add_parser("list", help="lista las corridas del historial")
+    p_list.set_defaults(fn=listar)
+
+    args = parser.parse_args()
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Generador de exportaciones sintéticas de Dropi para benchmarks.
+
+Produce las columnas de config.COLUMNAS_REQUERIDAS (más NOMBRE CLIENTE,
+PRECIO PROVEEDOR X CANTIDAD y novedades) con distribuciones parecidas a
+una tienda real: pocas ciudades y productos concentran la mayoría de las
+órdenes (Zipf), las transportadoras tienen participaciones y tasas de
+devolución distintas, y el estatus depende de la antigüedad de la orden
+(las recientes siguen en proceso, las viejas ya se entregaron o
+devolvieron). Escala de 10k a 5M filas en segundos.
+"""
+
+import numpy as np
+import pandas as pd
+from config import (
+    ESTATUS_NUNCA_ENVIADO,
+    ESTATUS_PENDIENTE_ATASCADO,
+    ESTATUS_DEVOLUCION,
+    ESTATUS_ENTREGADO,
+    ESTATUS_EN_PROCESO,
+)
+
+# Estatus que no están en config para ejercitar la rama DESCONOCIDO
+ESTATUS_RAROS = ["EN VERIFICACION", "RETENIDO EN ADUANA", "SINIESTRO"]
+
+TRANSPORTADORAS = ["INTERRAPIDISIMO", "SERVIENTREGA", "COORDINADORA", "ENVIA", "TCC", "DOMINA"]
+PESO_TRANSPORTADORAS = [0.34, 0.24, 0.16, 0.12, 0.08, 0.06]
+# Multiplicador de la tasa de devolución base por transportadora
+FACTOR_DEVOLUCION = [1.0, 0.9, 1.1, 1.3, 0.8, 1.5]
+
+CIUDADES_PRINCIPALES = [
+    "BOGOTA", "MEDELLIN", "CALI", "BARRANQUILLA", "CARTAGENA", "BUCARAMANGA", "CUCUTA",
+    "PEREIRA", "IBAGUE", "SANTA MARTA", "VILLAVICENCIO", "MANIZALES", "PASTO", "MONTERIA",
+    "NEIVA", "ARMENIA", "VALLEDUPAR", "POPAYAN", "SINCELEJO", "TUNJA",
+]
+
+NOVEDADES = [
+    "DIRECCION ERRADA",
+    "CLIENTE NO CONTESTA",
+    "CLIENTE NO ESTA EN CASA",
+    "RECHAZA EL PEDIDO",
+    "ZONA DE DIFICIL ACCESO",
+]
+
+TASA_DEVOLUCION = 0.16   # base, antes de los factores por transportadora y ciudad
+TASA_NUNCA_ENVIADO = 0.10
+TASA_PENDIENTE = 0.03
+TASA_RAROS = 0.005
+DIAS_CIERRE = 12         # antigüedad a la que casi todas las órdenes ya cerraron
+DIAS_HISTORIA = 365
+
+
+def _zipf(rng, n_valores: int, n_rows: int, a: float = 1.1) -> np.ndarray:
+    """Índices 0..n_valores-1 con frecuencia proporcional a 1/rango^a."""
+    pesos = 1.0 / np.arange(1, n_valores + 1) ** a
+    return rng.choice(n_valores, n_rows, p=pesos / pesos.sum())
+
+
+def _fechas_texto(base: pd.Timestamp, dias: np.ndarray) -> np.ndarray:
+    """'DD-MM-YYYY' de base + dias, formateando solo los días distintos."""
+    unicos, inversa = np.unique(dias, return_inverse=True)
+    textos = (base + pd.to_timedelta(unicos, unit="D")).strftime("%d-%m-%Y").to_numpy(dtype=object)
+    return textos[inversa]
+
+
+def _elegir(rng, opciones, n: int) -> np.ndarray:
+    return np.asarray(opciones, dtype=object)[rng.integers(0, len(opciones), n)]
+
+
+def generate_orders(n_rows: int, seed: int = 42, hasta=None) -> pd.DataFrame:
+    """Genera un DataFrame crudo con el esquema de la exportación de Dropi.
+
+    hasta es la fecha de la orden más reciente (por defecto hoy): las
+    antigüedades quedan realistas para las vistas de demorados y atascados.
+    """
+    rng = np.random.default_rng(seed)
+    hasta = pd.Timestamp(hasta or pd.Timestamp.now()).normalize()
+    inicio = hasta - pd.Timedelta(days=DIAS_HISTORIA - 1)
+
+    n_products = max(20, n_rows // 100)
+    n_cities = max(20, min(1100, n_rows // 50))
+    n_clients = max(50, n_rows // 3)
+
+    producto = _zipf(rng, n_products, n_rows)
+    ciudad = _zipf(rng, n_cities, n_rows, a=1.0)
+    transportadora = rng.choice(len(TRANSPORTADORAS), n_rows, p=PESO_TRANSPORTADORAS)
+    cliente = rng.integers(0, n_clients, n_rows)
+
+    # Antigüedad: más órdenes recientes que viejas (la tienda crece)
+    dia = np.minimum(
+        (DIAS_HISTORIA * rng.power(1.5, n_rows)).astype(np.int64), DIAS_HISTORIA - 1
+    )
+    edad = DIAS_HISTORIA - 1 - dia
+    dia_guia = np.minimum(dia + rng.integers(0, 4, n_rows), DIAS_HISTORIA - 1)
+
+    # Estatus según la antigüedad y las tasas por transportadora y ciudad
+    u = rng.random(n_rows)
+    nunca = u < TASA_NUNCA_ENVIADO
+    pendiente = ~nunca & (u < TASA_NUNCA_ENVIADO + TASA_PENDIENTE)
+    raro = rng.random(n_rows) < TASA_RAROS
+    enviado = ~nunca & ~pendiente & ~raro
+    cerrada = rng.random(n_rows) < np.clip(edad / DIAS_CIERRE, 0, 0.97)
+    factor_ciudad = 0.8 + 0.6 * ciudad / n_cities
+    p_dev = np.clip(TASA_DEVOLUCION * np.take(FACTOR_DEVOLUCION, transportadora) * factor_ciudad, 0, 0.9)
+    devuelta = rng.random(n_rows) < p_dev
+
+    estatus = _elegir(rng, ESTATUS_EN_PROCESO, n_rows)
+    estatus[enviado & cerrada] = ESTATUS_ENTREGADO[0]
+    sel = enviado & cerrada & devuelta
+    estatus[sel] = _elegir(rng, ESTATUS_DEVOLUCION, int(sel.sum()))
+    estatus[nunca] = _elegir(rng, ESTATUS_NUNCA_ENVIADO, int(nunca.sum()))
+    estatus[pendiente] = ESTATUS_PENDIENTE_ATASCADO[0]
+    estatus[raro] = _elegir(rng, ESTATUS_RAROS, int(raro.sum()))
+    # Variaciones de formato que clean_data/classify_status deben normalizar
+    minus = rng.random(n_rows) < 0.05
+    estatus[minus] = np.char.lower(estatus[minus].astype(str))
+
+    # Sin guía: casi todas las nunca enviadas y las pendientes
+    sin_guia = ((nunca | pendiente) & (rng.random(n_rows) < 0.9)) | (rng.random(n_rows) < 0.01)
+
+    # Precios: cada producto tiene su precio base; el flete depende de la ciudad
+    precio_producto = rng.lognormal(np.log(90_000), 0.4, n_products)
+    flete_ciudad = rng.uniform(8_000, 28_000, n_cities)
+    cantidad = rng.choice([1, 2, 3], n_rows, p=[0.75, 0.18, 0.07])
+    total = precio_producto[producto] * (1 + 0.6 * (cantidad - 1)) * rng.uniform(0.9, 1.1, n_rows)
+    flete = flete_ciudad[ciudad] * rng.uniform(0.9, 1.15, n_rows)
+    proveedor = precio_producto[producto] * rng.uniform(0.25, 0.45, n_rows)
+
+    p_novedad = np.where(np.isin(estatus, ESTATUS_DEVOLUCION), 0.6, 0.12)
+    con_novedad = enviado & (rng.random(n_rows) < p_novedad)
+
+    nombres_ciudad = np.array(
+        [c.lower() if i % 3 == 0 else c for i, c in enumerate(CIUDADES_PRINCIPALES)]
+        + [f"ciudad {i}" for i in range(max(0, n_cities - len(CIUDADES_PRINCIPALES)))],
+        dtype=object,
+    )[:n_cities]
+
+    return pd.DataFrame({
+        "FECHA DE REPORTE": _fechas_texto(inicio, dia_guia + rng.integers(0, 15, n_rows)),
+        "ID": np.arange(1, n_rows + 1),
+        "FECHA": _fechas_texto(inicio, dia),
+        "TELÉFONO": cliente + 3_000_000_000,
+        "NOMBRE CLIENTE": np.char.add("CLIENTE ", cliente.astype(str)),
+        "ESTATUS": estatus,
+        "CIUDAD DESTINO": nombres_ciudad[ciudad],
+        "TRANSPORTADORA": np.take(TRANSPORTADORAS, transportadora),
+        "TOTAL DE LA ORDEN": total,
+        "PRECIO FLETE": flete,
+        "PRECIO PROVEEDOR": proveedor,
+        "PRECIO PROVEEDOR X CANTIDAD": proveedor * cantidad,
+        "PRODUCTO": np.char.add("PRODUCTO ", producto.astype(str)),
+        "CANTIDAD": cantidad,
+        "FECHA GUIA GENERADA": np.where(sin_guia, None, _fechas_texto(inicio, dia_guia)),
+        "NOVEDAD": np.where(con_novedad, _elegir(rng, NOVEDADES, n_rows), None),
+        "FUE SOLUCIONADA LA NOVEDAD": np.where(con_novedad, _elegir(rng, ["SI", "NO"], n_rows), None),
+    })
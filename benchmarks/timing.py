@@ -0,0 +1,36 @@
+"""Medición de tiempos compartida por los benchmarks.
+
+- timed: resultado y tiempo promedio de una función (scripts bench_*)
+- measure: primera ejecución, mediana y mínimo (historial de benchmarks.suite)
+"""
+
+import statistics
+import time
+
+
+def timed(fn, *args, repeat: int = 1, warmup: bool = False):
+    """(resultado, segundos promedio) de repeat ejecuciones de fn(*args).
+
+    Con warmup se descarta una primera ejecución (imports, caches en frío).
+    """
+    if warmup:
+        fn(*args)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(*args)
+    return out, (time.perf_counter() - t0) / repeat
+
+
+def measure(fn, repeat: int) -> dict:
+    """Primera ejecución, mediana y mínimo de repeat ejecuciones (segundos)."""
+    tiempos = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+    return {
+        "primera": tiempos[0],
+        "mediana": statistics.median(tiempos),
+        "min": min(tiempos),
+        "repeticiones": repeat,
+    }
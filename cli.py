@@ -0,0 +1,86 @@
+"""Modo batch sin interfaz: precalcula los reportes de una o varias exportaciones.
+
+Por cada archivo carga, limpia y clasifica las órdenes, ejecuta todos los
+get_* del analyzer y guarda un reporte (ver data_processing.bundle) en
+config.REPORTES_DIR/<nombre del archivo>. Los archivos se procesan en
+paralelo, uno por proceso. El dashboard lista los reportes en la barra
+lateral y los abre sin recalcular.
+
+Uso:
+    python cli.py exportaciones/*.xlsx
+    python cli.py ordenes.csv --salida /srv/reportes --workers 4 --hoy 2025-06-30
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import REPORTES_DIR
+from data_processing import bundle
+from data_processing.classifier import classify_dataframe
+from data_processing.frame_cache import seed
+from data_processing.loader import load_and_clean
+from data_processing.pipeline import config_key, dataset_key, file_hash, mapping_key, pipeline_version
+
+
+def procesar(ruta: str, salida: str, hoy=None) -> dict:
+    """Genera el reporte de una exportación. Retorna un resumen de la corrida."""
+    t0 = time.perf_counter()
+    ruta = Path(ruta)
+    contenido = ruta.read_bytes()
+    archivo_hash = file_hash(contenido)
+    clave = dataset_key(archivo_hash, config_key(), mapping_key(None))
+
+    # Sin el cache de Streamlit: cada proceso carga su archivo una sola vez
+    cargar = getattr(load_and_clean, "__wrapped__", load_and_clean)
+    df = classify_dataframe(cargar(contenido, ruta.name))
+    seed(df, "fingerprint", clave)
+
+    resultados = bundle.precompute(df, hoy)
+    meta = bundle.metadata(ruta.name, archivo_hash, clave, pipeline_version(), hoy)
+    carpeta = bundle.write_bundle(Path(salida) / ruta.stem, df, resultados, meta)
+    return {"archivo": ruta.name, "carpeta": str(carpeta), "filas": len(df),
+            "segundos": time.perf_counter() - t0}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archivos", nargs="+", help="exportaciones de Dropi (.xlsx, .csv o .parquet)")
+    parser.add_argument("--salida", default=REPORTES_DIR, help=f"carpeta de reportes (default: {REPORTES_DIR})")
+    parser.add_argument("--workers", type=int, help="procesos en paralelo (default: uno por archivo, hasta los CPUs)")
+    parser.add_argument("--hoy", help="fecha de referencia YYYY-MM-DD para demorados y alertas (default: hoy)")
+    args = parser.parse_args()
+
+    faltantes = [a for a in args.archivos if not Path(a).is_file()]
+    if faltantes:
+        parser.error(f"no existe: {', '.join(faltantes)}")
+    nombres = [Path(a).stem for a in args.archivos]
+    repetidos = sorted({n for n in nombres if nombres.count(n) > 1})
+    if repetidos:
+        parser.error(f"varios archivos generarían el mismo reporte: {', '.join(repetidos)}")
+
+    Path(args.salida).mkdir(parents=True, exist_ok=True)
+    workers = args.workers or min(len(args.archivos), os.cpu_count() or 1)
+    errores = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(procesar, a, args.salida, args.hoy): a for a in args.archivos}
+        for futuro in as_completed(futuros):
+            try:
+                r = futuro.result()
+            except Exception as e:
+                errores += 1
+                print(f"ERROR {futuros[futuro]}: {e}", file=sys.stderr)
+                continue
+            print(f"{r['archivo']}: {r['filas']:,} órdenes en {r['segundos']:.1f}s → {r['carpeta']}")
+
+    print(f"{len(args.archivos) - errores} reportes generados, {errores} con error")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
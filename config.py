@@ -1,5 +1,7 @@
 """Configuración y constantes del dashboard."""
 
+import os
+
 # --- Categorías de Estatus ---
 # Mapeo de estatus originales a categorías de clasificación
 
@@ -89,6 +91,7 @@ UMBRAL_DIAS_DEMORADO = 6  # >6 días = envío demorado
 UMBRAL_DIAS_ATASCADO = 3  # >3 días = pedido atascado en pendiente
 UMBRAL_DIAS_GUIA_DEMORADA = 3  # guía impresa >3d sin despacho
 UMBRAL_FLETE_SOBRECOSTO = 20000  # flete > $20,000 = alerta
+MIN_ENVIOS_TRANSPORTADORA = 5  # transportadoras con menos envíos no se analizan
 
 # Rangos para análisis temporal
 RANGOS_DEMORADOS = [
@@ -130,3 +133,77 @@ COLUMNAS_MONETARIAS = [
     "PRECIO PROVEEDOR",
     "PRECIO PROVEEDOR X CANTIDAD",
 ]
+
+# Columnas de texto con pocos valores distintos: se guardan como category
+COLUMNAS_CATEGORICAS = [
+    "ESTATUS",
+    "CIUDAD DESTINO",
+    "TRANSPORTADORA",
+    "PRODUCTO",
+    "NOVEDAD",
+    "FUE SOLUCIONADA LA NOVEDAD",
+    "CATEGORIA",
+    "ORIGEN",
+]
+
+# Columnas opcionales que usan las páginas (se leen si existen)
+COLUMNAS_OPCIONALES = [
+    "PRECIO PROVEEDOR X CANTIDAD",
+    "NOMBRE CLIENTE",
+    "NOVEDAD",
+    "FUE SOLUCIONADA LA NOVEDAD",
+    "FECHA DE NOVEDAD",
+]
+
+# Columnas opcionales que se buscan por patrón (encoding variable en el Excel)
+PATRONES_COLUMNAS_OPCIONALES = [
+    "SOLUCI",    # SOLUCIÓN, FECHA DE SOLUCIÓN
+    "LTIMO",     # FECHA DE ÚLTIMO MOVIMIENTO
+    "FONO",      # TELÉFONO
+    "TELEFONO",
+]
+
+# --- Cache en disco de datasets procesados ---
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", ".cache")
+CACHE_MAX_MB = int(os.environ.get("DASHBOARD_CACHE_MAX_MB", "2048"))  # LRU por tamaño total
+ALMACEN_MAX_PARTES = 20  # partes del histórico incremental antes de consolidarlas en una
+
+# --- Exportaciones (CSV / XLSX / Parquet) ---
+EXPORT_CHUNK_FILAS = 50_000  # filas serializadas por bloque
+EXPORT_CACHE_MB = int(os.environ.get("DASHBOARD_EXPORT_CACHE_MB", "256"))  # LRU en memoria
+
+# --- Resultados del analyzer memoizados por dataset (ver data_processing.memo) ---
+ANALYZER_CACHE_MB = int(os.environ.get("DASHBOARD_ANALYZER_CACHE_MB", "256"))
+
+# --- Carga de varios archivos a la vez (ver data_processing.multi) ---
+MAX_PROCESOS_CARGA = int(os.environ.get("DASHBOARD_LOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# --- IA: clasificación de estatus (ver data_processing.ai_classifier) y consejero ---
+IA_MODELO = "claude-sonnet-4-5-20250929"
+IA_LOTE_ESTATUS = 40   # estatus por llamada: la respuesta JSON cabe holgada en max_tokens
+IA_CONCURRENCIA = 4    # llamadas simultáneas a la API
+IA_VEREDICTOS = os.path.join(CACHE_DIR, "veredictos_ia.json")  # sobrevive entre sesiones
+IA_PRESUPUESTO_PROMPT = 3000  # tokens del prompt del consejero; el resumen se recorta para caber
+IA_RESPUESTAS_MAX = 32        # respuestas del consejero guardadas en memoria
+
+# Filas por sección del resumen del negocio (ver data_processing.summary); None = todas
+RESUMEN_TOP = {
+    "prod_perdiendo": 15,
+    "prod_ganando": 10,
+    "cities_no": 15,
+    "cities_prec": 10,
+    "cities_ok": 10,
+    "carriers": None,
+}
+REGLAS_MANUALES = os.path.join(CACHE_DIR, "reglas_manuales.json")  # estatus → categoría fijados por el usuario
+
+# --- Reportes precalculados por cli.py (ver data_processing.bundle) ---
+REPORTES_DIR = os.environ.get("DASHBOARD_REPORTS_DIR", "reportes")
+
+# --- Tablas paginadas ---
+TABLA_FILAS_PAGINA = 50
+TABLA_OPCIONES_PAGINA = [25, 50, 100, 250]
+COLOR_RESALTADO = "#ffcccc"  # filas a pausar / con pérdida
+
+# --- Modo desarrollador (panel de instrumentación en la barra lateral) ---
+MODO_DESARROLLO = os.environ.get("DASHBOARD_DEV", "").lower() in ("1", "true", "si", "sí")
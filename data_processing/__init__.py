@@ -0,0 +1,7 @@
+import pandas as pd
+
+# El pipeline no hace copias defensivas: depende de copy-on-write (por defecto
+# desde pandas 3.0) para que las selecciones y copias superficiales no copien
+# datos hasta que alguien escriba en ellas.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
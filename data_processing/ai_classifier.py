@@ -0,0 +1,180 @@
+"""Clasificación con IA de estatus desconocidos, por lotes y con veredictos persistentes.
+
+Los estatus se normalizan (strip + mayúsculas, como clean_data) y se
+buscan primero en el archivo de veredictos (config.IA_VEREDICTOS): solo los
+que nunca se clasificaron van a la API. Esos se parten en lotes de
+IA_LOTE_ESTATUS y se envían en paralelo con asyncio (hasta IA_CONCURRENCIA
+llamadas a la vez); max_tokens se dimensiona por lote, así una lista larga
+no queda truncada. Un lote que falla no descarta los demás.
+
+Los veredictos nuevos se guardan en disco y la app los aplica en cada carga
+(ver verdict_mapping), en esta y en las próximas sesiones.
+
+El cliente se puede inyectar: cualquier objeto con un
+`async messages.create(**kwargs)` que devuelva `.content[0].text` sirve
+(p.ej. un stub local en pruebas o benchmarks).
+"""
+
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from config import IA_CONCURRENCIA, IA_LOTE_ESTATUS, IA_MODELO, IA_VEREDICTOS
+
+# Categorías que devuelve el modelo → nombres internos
+CATEGORIAS_IA = {
+    "NUNCA_ENVIADO": "NUNCA ENVIADO",
+    "DEVOLUCION": "DEVOLUCION",
+    "ENTREGADO": "ENTREGADO",
+    "EN_PROCESO": "EN PROCESO",
+    "GUIA_DEMORADA": "GUIA DEMORADA",
+}
+
+_lock = threading.Lock()
+
+
+def normalize_status(estatus) -> str:
+    """Misma normalización que clean_data aplica a ESTATUS."""
+    return str(estatus).strip().upper()
+
+
+# ============================================================
+# VEREDICTOS EN DISCO
+# ============================================================
+
+def load_verdicts() -> dict:
+    """{estatus normalizado: {"categoria", "fecha", "modelo"}} guardados."""
+    try:
+        return json.loads(Path(IA_VEREDICTOS).read_text(encoding="utf-8"))
+    except (FileNotFoundError, OSError, ValueError):
+        return {}
+
+
+def save_verdicts(nuevos: dict, modelo: str = IA_MODELO) -> None:
+    """Agrega {estatus: categoria} al archivo de veredictos (escritura atómica)."""
+    if not nuevos:
+        return
+    path = Path(IA_VEREDICTOS)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fecha = datetime.now().isoformat(timespec="seconds")
+    with _lock:
+        veredictos = load_verdicts()
+        for estatus, categoria in nuevos.items():
+            veredictos[normalize_status(estatus)] = {"categoria": categoria, "fecha": fecha, "modelo": modelo}
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(veredictos, indent=1, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def clear_verdicts() -> None:
+    """Olvida todos los veredictos guardados."""
+    with _lock:
+        Path(IA_VEREDICTOS).unlink(missing_ok=True)
+
+
+def verdict_mapping() -> dict:
+    """{estatus: categoria} para apply_ai_classifications."""
+    return {estatus: v["categoria"] for estatus, v in load_verdicts().items()}
+
+
+# ============================================================
+# LLAMADAS A LA API
+# ============================================================
+
+def _prompt(lote: list) -> str:
+    statuses_text = "\n".join(f"- {s}" for s in lote)
+    return f"""Eres un experto en logística de e-commerce en Colombia (plataforma Dropi).
+Clasifica cada uno de estos estatus de orden en UNA de estas categorías:
+- NUNCA_ENVIADO: La orden nunca fue enviada (cancelada, rechazada, sin guía, guía anulada, indemnización)
+- DEVOLUCION: El paquete fue devuelto o está en proceso de devolución
+- ENTREGADO: El paquete fue entregado exitosamente al cliente
+- EN_PROCESO: El paquete está en tránsito o en algún punto del proceso de envío
+- GUIA_DEMORADA: La guía fue generada pero no ha sido despachada en más de 3 días
+
+Estatus a clasificar:
+{statuses_text}
+
+Responde SOLO con formato JSON como: {{"ESTATUS": "CATEGORIA", ...}}
+Sin explicaciones adicionales."""
+
+
+def _max_tokens(lote: list) -> int:
+    """Presupuesto de salida del lote: el JSON repite cada estatus más su categoría."""
+    return 256 + sum(len(s) // 3 + 16 for s in lote)
+
+
+def parse_response(texto: str, lote: list) -> dict:
+    """{estatus normalizado: categoría interna} de la respuesta, solo para estatus del lote."""
+    inicio, fin = texto.find("{"), texto.rfind("}")
+    if inicio < 0 or fin < inicio:
+        raise ValueError("la respuesta no contiene JSON")
+    pedidos = set(lote)
+    resultado = {}
+    for estatus, categoria in json.loads(texto[inicio:fin + 1]).items():
+        estatus = normalize_status(estatus)
+        categoria = CATEGORIAS_IA.get(normalize_status(categoria).replace(" ", "_"))
+        if estatus in pedidos and categoria is not None:
+            resultado[estatus] = categoria
+    return resultado
+
+
+async def _clasificar_lotes(lotes: list, client, progreso=None) -> tuple:
+    """(veredictos, errores) de todos los lotes, con hasta IA_CONCURRENCIA en vuelo."""
+    semaforo = asyncio.Semaphore(IA_CONCURRENCIA)
+
+    async def uno(lote):
+        async with semaforo:
+            respuesta = await client.messages.create(
+                model=IA_MODELO,
+                max_tokens=_max_tokens(lote),
+                messages=[{"role": "user", "content": _prompt(lote)}],
+            )
+        return parse_response(respuesta.content[0].text, lote)
+
+    tareas = [asyncio.ensure_future(uno(lote)) for lote in lotes]
+    veredictos, errores = {}, []
+    for hechos, tarea in enumerate(asyncio.as_completed(tareas), start=1):
+        try:
+            veredictos.update(await tarea)
+        except Exception as e:
+            errores.append(str(e))
+        if progreso is not None:
+            progreso(hechos, len(lotes))
+    return veredictos, errores
+
+
+async def _con_cliente(lotes: list, api_key: str, progreso) -> tuple:
+    from anthropic import AsyncAnthropic
+
+    async with AsyncAnthropic(api_key=api_key) as client:
+        return await _clasificar_lotes(lotes, client, progreso)
+
+
+def classify_statuses(statuses: list, api_key: str | None = None, client=None, progreso=None) -> tuple:
+    """Clasifica estatus con IA usando y alimentando los veredictos guardados.
+
+    Retorna ({estatus normalizado: categoría}, [errores]). Solo se llama a la
+    API por estatus sin veredicto; progreso(hechos, total) se invoca al
+    terminar cada lote.
+    """
+    guardados = load_verdicts()
+    pedidos = list(dict.fromkeys(normalize_status(s) for s in statuses))
+    resultado = {s: guardados[s]["categoria"] for s in pedidos if s in guardados}
+    pendientes = [s for s in pedidos if s not in guardados]
+    if not pendientes or (client is None and not api_key):
+        return resultado, []
+
+    lotes = [pendientes[i:i + IA_LOTE_ESTATUS] for i in range(0, len(pendientes), IA_LOTE_ESTATUS)]
+    if client is None:
+        nuevos, errores = asyncio.run(_con_cliente(lotes, api_key, progreso))
+    else:
+        nuevos, errores = asyncio.run(_clasificar_lotes(lotes, client, progreso))
+
+    save_verdicts(nuevos)
+    sin_respuesta = len(pendientes) - len(nuevos)
+    if sin_respuesta and not errores:
+        errores.append(f"{sin_respuesta} estatus sin categoría válida en la respuesta")
+    return {**resultado, **nuevos}, errores
@@ -14,16 +14,21 @@ REGLAS DE NEGOCIO (dropshipping):
 
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from config import (
     UMBRAL_DEVOLUCION_PAUSAR,
     UMBRAL_DEVOLUCIONES_BLOQUEAR,
     UMBRAL_DIAS_DEMORADO,
     UMBRAL_DIAS_ATASCADO,
     UMBRAL_FLETE_SOBRECOSTO,
+    MIN_ENVIOS_TRANSPORTADORA,
     RANGOS_DEMORADOS,
     RANGOS_ATASCADOS,
 )
+from data_processing.cube import get_cube, totals, rollup, category_counts, count_of
+from data_processing.product_metrics import get_product_table, select_products, combined
+from data_processing.day_index import fecha_referencia, dias_hasta, contar_rangos
+from data_processing.memo import memoizado
+from profiling import instrumentado
 
 
 # ============================================================
@@ -43,50 +48,77 @@ def _col_y(df):
     """Retorna el nombre de la columna de costo producto."""
     return "PRECIO PROVEEDOR X CANTIDAD" if "PRECIO PROVEEDOR X CANTIDAD" in df.columns else "PRECIO PROVEEDOR"
 
+def _por_categoria(cube):
+    """Medidas del cubo sumadas por CATEGORIA."""
+    return cube.groupby("CATEGORIA", observed=True)[["filas", "PRECIO FLETE"]].sum()
+
+def _n_cat(por_cat, categoria):
+    return int(por_cat["filas"].get(categoria, 0))
+
+def _sum_cat(por_cat, categoria, medida):
+    return int(por_cat[medida].get(categoria, 0))
+
+def _posiciones(mask):
+    """Posiciones (iloc) de las filas donde mask es verdadero."""
+    return np.flatnonzero(np.asarray(mask, dtype=bool))
+
+def _demorados(df, hoy):
+    """Posiciones de envíos EN PROCESO con más de UMBRAL_DIAS_DEMORADO en tránsito."""
+    en_proc = df["TIENE_GUIA"].to_numpy(dtype=bool) & (df["CATEGORIA"] == "EN PROCESO").to_numpy()
+    return _posiciones(en_proc & (dias_hasta(df, "FECHA GUIA GENERADA", hoy) > UMBRAL_DIAS_DEMORADO))
+
+def _atascados(df, hoy):
+    """Posiciones de PENDIENTE ATASCADO con más de UMBRAL_DIAS_ATASCADO esperando."""
+    pend = (df["CATEGORIA"] == "PENDIENTE ATASCADO").to_numpy()
+    return _posiciones(pend & (dias_hasta(df, "FECHA", hoy) > UMBRAL_DIAS_ATASCADO))
+
+def _dias(desde, hasta):
+    """(hasta - desde) en días como Series independiente (no agrega columnas al frame)."""
+    return (hasta - desde).dt.days
+
+def _filas(df, pos, cols, **extra):
+    """Solo las columnas cols de las filas pos, más columnas derivadas; no copia el resto."""
+    cols = [c for c in cols if c in df.columns]
+    out = df.iloc[pos, df.columns.get_indexer(cols)]
+    for name, values in extra.items():
+        out[name] = np.asarray(values)
+    return out
+
 
 # ============================================================
 # GENERAL
 # ============================================================
 
-def get_general_metrics(df):
-    """KPIs generales del negocio."""
-    total = len(df)
-    enviados = _enviados(df)
-    ent = _entregados(df)
-    dev = _devueltos(df)
-    n_enviados = len(enviados)
-    n_entregados = len(ent)
-    n_devoluciones = len(dev)
-    n_en_proceso = len(df[df["CATEGORIA"] == "EN PROCESO"])
-    n_nunca = len(df[df["CATEGORIA"] == "NUNCA ENVIADO"])
-    n_pendientes = len(df[df["CATEGORIA"] == "PENDIENTE ATASCADO"])
-    n_guia_demorada = len(df[df["CATEGORIA"] == "GUIA DEMORADA"])
+@instrumentado
+@memoizado
+def get_general_metrics(df, hoy=None):
+    """KPIs generales del negocio. hoy: fecha de referencia (por defecto, hoy)."""
+    cube = get_cube(df)
+    por_cat = _por_categoria(cube)
+    total = int(cube["filas"].sum())
+    n_enviados = int(totals(cube, enviados=True)["filas"])
+    n_entregados = _n_cat(por_cat, "ENTREGADO")
+    n_devoluciones = _n_cat(por_cat, "DEVOLUCION")
+    n_en_proceso = _n_cat(por_cat, "EN PROCESO")
+    n_nunca = _n_cat(por_cat, "NUNCA ENVIADO")
+    n_pendientes = _n_cat(por_cat, "PENDIENTE ATASCADO")
+    n_guia_demorada = _n_cat(por_cat, "GUIA DEMORADA")
 
     tasa_conversion = n_enviados / total if total > 0 else 0
     tasa_exito = n_entregados / n_enviados if n_enviados > 0 else 0
     tasa_devolucion = n_devoluciones / n_enviados if n_enviados > 0 else 0
 
     # Flete promedio solo de entregados (lo que realmente se paga)
-    flete_prom = int(np.floor(ent["PRECIO FLETE"].mean())) if n_entregados > 0 else 0
+    flete_ent = _sum_cat(por_cat, "ENTREGADO", "PRECIO FLETE")
+    flete_prom = int(np.floor(flete_ent / n_entregados)) if n_entregados > 0 else 0
 
     # Pérdida = flete de envío T pagado en devueltos (dinero perdido, el envío no generó venta)
-    perdida_total = int(dev["PRECIO FLETE"].sum())
+    perdida_total = _sum_cat(por_cat, "DEVOLUCION", "PRECIO FLETE")
 
     # Demorados y atascados
-    hoy = pd.Timestamp(datetime.now().date())
-    en_proc = df[(df["TIENE_GUIA"]) & (df["CATEGORIA"] == "EN PROCESO")].copy()
-    if not en_proc.empty and en_proc["FECHA GUIA GENERADA"].notna().any():
-        en_proc["DIAS_TRANSITO"] = (hoy - en_proc["FECHA GUIA GENERADA"]).dt.days
-        demorados = int((en_proc["DIAS_TRANSITO"] > UMBRAL_DIAS_DEMORADO).sum())
-    else:
-        demorados = 0
-
-    pend = df[df["CATEGORIA"] == "PENDIENTE ATASCADO"].copy()
-    if not pend.empty and pend["FECHA"].notna().any():
-        pend["DIAS_ESPERA"] = (hoy - pend["FECHA"]).dt.days
-        atascados = int((pend["DIAS_ESPERA"] > UMBRAL_DIAS_ATASCADO).sum())
-    else:
-        atascados = 0
+    hoy = fecha_referencia(hoy)
+    demorados = len(_demorados(df, hoy))
+    atascados = len(_atascados(df, hoy))
 
     return {
         "total_ordenes": total,
@@ -107,10 +139,13 @@ def get_general_metrics(df):
     }
 
 
+@instrumentado
+@memoizado
 def get_status_distribution(df):
     """Distribución por categoría clasificada."""
-    dist = df["CATEGORIA"].value_counts().reset_index()
-    dist.columns = ["Categoría", "Cantidad"]
+    counts = _por_categoria(get_cube(df))["filas"]
+    counts = counts[counts > 0].sort_values(ascending=False)
+    dist = pd.DataFrame({"Categoría": counts.index.astype(object), "Cantidad": counts.to_numpy()})
     dist["Porcentaje"] = (dist["Cantidad"] / dist["Cantidad"].sum() * 100).round(1)
     return dist
 
@@ -119,6 +154,8 @@ def get_status_distribution(df):
 # P&L GENERAL
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_pnl_general(df):
     """Resumen de ganancias y pérdidas generales del negocio.
 
@@ -128,23 +165,23 @@ def get_pnl_general(df):
     Utilidad = R - T - Y (solo entregas).
     Venta neta = Ventas Brutas - Costo producto - Flete envío (todos).
     """
-    enviados = _enviados(df)
-    ent = _entregados(df)
-    dev = _devueltos(df)
+    cube = get_cube(df)
+    enviados = totals(cube, enviados=True)
+    ent = totals(cube, categorias=["ENTREGADO"])
+    dev = totals(cube, categorias=["DEVOLUCION"])
+    en_transito = totals(cube, categorias=["EN PROCESO", "GUIA DEMORADA"])
 
-    ventas_brutas = int(ent["TOTAL DE LA ORDEN"].sum())
-    col_y = _col_y(ent)
-    costo_producto = int(ent[col_y].sum())
+    ventas_brutas = int(ent["TOTAL DE LA ORDEN"])
+    costo_producto = int(ent["COSTO Y"])
 
     # Flete desglosado por categoría
-    flete_entregados = int(ent["PRECIO FLETE"].sum())
-    flete_devueltos = int(dev["PRECIO FLETE"].sum())
-    en_transito = df[df["CATEGORIA"].isin(["EN PROCESO", "GUIA DEMORADA"])]
-    flete_en_transito = int(en_transito["PRECIO FLETE"].sum())
-    flete_total = int(enviados["PRECIO FLETE"].sum())
+    flete_entregados = int(ent["PRECIO FLETE"])
+    flete_devueltos = int(dev["PRECIO FLETE"])
+    flete_en_transito = int(en_transito["PRECIO FLETE"])
+    flete_total = int(enviados["PRECIO FLETE"])
 
     # Utilidad calculada de entregas (R - T - Y)
-    utilidad_entregas = int(ent["UTILIDAD"].sum())
+    utilidad_entregas = int(ent["UTILIDAD"])
 
     # Venta neta real: solo costos de pedidos resueltos (entregados + devueltos)
     # Flete entregados = costo asociado a ventas realizadas
@@ -152,14 +189,13 @@ def get_pnl_general(df):
     venta_neta = ventas_brutas - costo_producto - flete_entregados - flete_devueltos
 
     # Proyección: si todos los pedidos en tránsito se entregaran
-    n_en_transito = len(en_transito)
-    col_y_t = _col_y(en_transito)
+    n_en_transito = int(en_transito["filas"])
     proy_utilidad_transito = int(
-        en_transito["TOTAL DE LA ORDEN"].sum()
-        - en_transito["PRECIO FLETE"].sum()
-        - en_transito[col_y_t].sum()
+        en_transito["TOTAL DE LA ORDEN"]
+        - en_transito["PRECIO FLETE"]
+        - en_transito["COSTO Y"]
     ) if n_en_transito > 0 else 0
-    proy_ventas_transito = int(en_transito["TOTAL DE LA ORDEN"].sum())
+    proy_ventas_transito = int(en_transito["TOTAL DE LA ORDEN"])
     proy_utilidad_total = utilidad_entregas + proy_utilidad_transito
 
     return {
@@ -171,9 +207,9 @@ def get_pnl_general(df):
         "flete_total": flete_total,
         "utilidad_entregas": utilidad_entregas,
         "venta_neta": venta_neta,
-        "total_entregas": len(ent),
-        "total_devoluciones": len(dev),
-        "total_envios": len(enviados),
+        "total_entregas": int(ent["filas"]),
+        "total_devoluciones": int(dev["filas"]),
+        "total_envios": int(enviados["filas"]),
         "proy_en_transito": n_en_transito,
         "proy_utilidad_transito": proy_utilidad_transito,
         "proy_ventas_transito": proy_ventas_transito,
@@ -185,20 +221,25 @@ def get_pnl_general(df):
 # PRODUCTOS
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_product_analysis(df):
     """Análisis por producto: tasas de devolución."""
-    enviados = _enviados(df)
-
-    products = enviados.groupby("PRODUCTO").agg(
-        Envíos=("ID", "count"),
-        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
-        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
-        Precio_Prom=("PRECIO PROVEEDOR", "mean"),
-        Ticket_Venta=("TOTAL DE LA ORDEN", "mean"),
-        Flete_Prom=("PRECIO FLETE", "mean"),
-        Cantidad_Total=("CANTIDAD", "sum"),
-        Ingreso_Total=("TOTAL DE LA ORDEN", "sum"),
-    ).reset_index()
+    cube = get_cube(df)
+    tot = rollup(cube, "PRODUCTO", enviados=True)
+    cnt = category_counts(cube, "PRODUCTO", tot.index, enviados=True)
+
+    products = pd.DataFrame({
+        "PRODUCTO": tot.index,
+        "Envíos": tot["ids"].to_numpy(),
+        "Devoluciones": count_of(cnt, "DEVOLUCION").to_numpy(),
+        "Entregas": count_of(cnt, "ENTREGADO").to_numpy(),
+        "Precio_Prom": (tot["PRECIO PROVEEDOR"] / tot["filas"]).to_numpy(),
+        "Ticket_Venta": (tot["TOTAL DE LA ORDEN"] / tot["filas"]).to_numpy(),
+        "Flete_Prom": (tot["PRECIO FLETE"] / tot["filas"]).to_numpy(),
+        "Cantidad_Total": tot["CANTIDAD"].to_numpy(),
+        "Ingreso_Total": tot["TOTAL DE LA ORDEN"].to_numpy(),
+    })
 
     products["% Devolución"] = (products["Devoluciones"] / products["Envíos"] * 100).round(1)
     products["% Éxito"] = (products["Entregas"] / products["Envíos"] * 100).round(1)
@@ -211,9 +252,9 @@ def get_product_analysis(df):
         0,
     )
 
-    products["Acción"] = products["% Devolución"].apply(
-        lambda x: "PAUSAR" if x > UMBRAL_DEVOLUCION_PAUSAR * 100 else "OK"
-    )
+    products["Acción"] = np.where(
+        products["% Devolución"] > UMBRAL_DEVOLUCION_PAUSAR * 100, "PAUSAR", "OK"
+    ).astype(object)
 
     products = products.sort_values("% Devolución", ascending=False)
 
@@ -222,47 +263,36 @@ def get_product_analysis(df):
                       "Flete Prom", "Precio/Unidad", "Acción"]]
 
 
-def get_product_profitability(df):
+@instrumentado
+@memoizado
+def get_product_profitability(df, productos=None):
     """Rentabilidad real por producto.
 
     Ganancia = R - T - Y por producto para entregados (UTILIDAD calculada)
     Pérdida = flete T pagado en devoluciones (envío perdido)
     Rentabilidad = Ganancia - Pérdida
-    """
-    enviados = _enviados(df)
-    entregados = enviados[enviados["CATEGORIA"] == "ENTREGADO"]
-    devueltos = enviados[enviados["CATEGORIA"] == "DEVOLUCION"]
 
-    col_y = _col_y(entregados)
-
-    # Ganancia por producto: R - T - Y
-    gan = entregados.groupby("PRODUCTO").agg(
-        Ingresos=("TOTAL DE LA ORDEN", "sum"),
-        Flete=("PRECIO FLETE", "sum"),
-        Costo_Prod=(col_y, "sum"),
-    ).reset_index()
-    gan["Ganancia Entregas"] = (gan["Ingresos"] - gan["Flete"] - gan["Costo_Prod"]).astype(int)
-    gan = gan[["PRODUCTO", "Ganancia Entregas"]]
-
-    # Pérdida por producto: flete T pagado en devoluciones
-    per = devueltos.groupby("PRODUCTO")["PRECIO FLETE"].sum().reset_index()
-    per.columns = ["PRODUCTO", "Pérdida Devoluciones"]
-
-    # Conteos
-    conteos = enviados.groupby("PRODUCTO").agg(
-        Envíos=("ID", "count"),
-        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
-        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
-    ).reset_index()
-
-    result = conteos.merge(gan, on="PRODUCTO", how="left")
-    result = result.merge(per, on="PRODUCTO", how="left")
-    result["Ganancia Entregas"] = result["Ganancia Entregas"].fillna(0).astype(int)
-    result["Pérdida Devoluciones"] = result["Pérdida Devoluciones"].fillna(0).astype(int)
+    Con productos, solo se calculan esas filas (desglose del buscador).
+    """
+    tabla = get_product_table(df)
+    if productos is not None:
+        tabla = select_products(tabla, productos)
+    tabla = tabla[tabla["env_filas"] > 0]
+
+    result = pd.DataFrame({
+        "PRODUCTO": tabla.index,
+        "Envíos": tabla["env_ids"].to_numpy(),
+        "Entregas": tabla["ent_filas"].to_numpy(),
+        "Devoluciones": tabla["dev_filas"].to_numpy(),
+        # Ganancia por producto: R - T - Y de entregados
+        "Ganancia Entregas": (tabla["ent_total"] - tabla["ent_flete"] - tabla["ent_costo"]).to_numpy(),
+        # Pérdida por producto: flete T pagado en devoluciones
+        "Pérdida Devoluciones": tabla["dev_flete"].to_numpy(),
+    })
     result["Rentabilidad Real"] = result["Ganancia Entregas"] - result["Pérdida Devoluciones"]
     result["Rent/Envío"] = np.where(
         result["Envíos"] > 0,
-        np.floor(result["Rentabilidad Real"] / result["Envíos"]).astype(int),
+        np.floor(result["Rentabilidad Real"] / result["Envíos"].where(result["Envíos"] > 0)).fillna(0).astype(int),
         0,
     )
 
@@ -274,6 +304,8 @@ def get_product_profitability(df):
 # CLIENTES
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_client_analysis(df):
     """Análisis por cliente (teléfono)."""
     col_tel = None
@@ -284,24 +316,36 @@ def get_client_analysis(df):
     if col_tel is None:
         col_tel = df.columns[5]
 
-    enviados = _enviados(df)
-
-    clients = enviados.groupby(col_tel).agg(
-        Nombre=("NOMBRE CLIENTE", "first"),
+    # Solo las columnas necesarias de los enviados (sin copiar el frame completo)
+    guia = df["TIENE_GUIA"].to_numpy(dtype=bool)
+    categoria = df["CATEGORIA"][guia]
+
+    # Indicadores 0/1 por fila: el groupby usa sum nativo en vez de lambdas por grupo
+    es_dev = (categoria == "DEVOLUCION").to_numpy()
+    # "first" sobre texto es caro: se toma la posición del primer nombre no nulo
+    nombres = df["NOMBRE CLIENTE"][guia]
+    work = pd.DataFrame({
+        "Fila": np.where(nombres.notna().to_numpy(), np.arange(len(nombres)), np.nan),
+        "ID": df["ID"][guia],
+        "Devoluciones": es_dev.astype(np.int64),
+        "Entregas": (categoria == "ENTREGADO").to_numpy().astype(np.int64),
+        # Pérdida: flete T pagado en devoluciones por cliente
+        "Monto Perdido": np.where(es_dev, df["PRECIO FLETE"].to_numpy()[guia], 0),
+    }, index=categoria.index, copy=False)
+
+    clients = work.groupby(df[col_tel][guia]).agg(
+        Nombre=("Fila", "first"),
         Total_Pedidos=("ID", "count"),
-        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
-        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
+        Devoluciones=("Devoluciones", "sum"),
+        Entregas=("Entregas", "sum"),
+        Monto_Perdido=("Monto Perdido", "sum"),
     ).reset_index()
+    fila = clients["Nombre"].fillna(-1).to_numpy(dtype=np.intp)
+    clients["Nombre"] = nombres.array.take(fila, allow_fill=True)
 
-    clients.rename(columns={col_tel: "Teléfono"}, inplace=True)
+    clients.rename(columns={col_tel: "Teléfono", "Monto_Perdido": "Monto Perdido"}, inplace=True)
     clients["% Devolución"] = (clients["Devoluciones"] / clients["Total_Pedidos"] * 100).round(1)
-
-    # Pérdida: flete T pagado en devoluciones por cliente
-    dev = enviados[enviados["CATEGORIA"] == "DEVOLUCION"]
-    dev_loss = dev.groupby(col_tel)["PRECIO FLETE"].sum().reset_index()
-    dev_loss.columns = ["Teléfono", "Monto Perdido"]
-    clients = clients.merge(dev_loss, on="Teléfono", how="left")
-    clients["Monto Perdido"] = clients["Monto Perdido"].fillna(0).astype(int)
+    clients["Monto Perdido"] = clients["Monto Perdido"].astype(int)
 
     bloquear = clients[clients["Devoluciones"] >= UMBRAL_DEVOLUCIONES_BLOQUEAR].sort_values(
         "Devoluciones", ascending=False
@@ -322,17 +366,22 @@ def get_client_analysis(df):
 # CIUDADES
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_city_analysis(df):
     """Análisis por ciudad: por tasa % y por cantidad total."""
-    enviados = _enviados(df)
-
-    cities = enviados.groupby("CIUDAD DESTINO").agg(
-        Envíos=("ID", "count"),
-        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
-        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
-        En_Proceso=("CATEGORIA", lambda x: (x == "EN PROCESO").sum()),
-        Flete_Prom=("PRECIO FLETE", "mean"),
-    ).reset_index()
+    cube = get_cube(df)
+    tot = rollup(cube, "CIUDAD DESTINO", enviados=True)
+    cnt = category_counts(cube, "CIUDAD DESTINO", tot.index, enviados=True)
+
+    cities = pd.DataFrame({
+        "CIUDAD DESTINO": tot.index,
+        "Envíos": tot["ids"].to_numpy(),
+        "Devoluciones": count_of(cnt, "DEVOLUCION").to_numpy(),
+        "Entregas": count_of(cnt, "ENTREGADO").to_numpy(),
+        "En_Proceso": count_of(cnt, "EN PROCESO").to_numpy(),
+        "Flete_Prom": (tot["PRECIO FLETE"] / tot["filas"]).to_numpy(),
+    })
 
     cities["% Devolución"] = (cities["Devoluciones"] / cities["Envíos"] * 100).round(1)
     cities["% Éxito"] = (cities["Entregas"] / cities["Envíos"] * 100).round(1)
@@ -347,38 +396,27 @@ def get_city_analysis(df):
     return {"por_tasa": by_rate, "por_total": by_total}
 
 
+@instrumentado
+@memoizado
 def get_city_profitability(df):
     """Rentabilidad por ciudad.
 
     Ganancia = R - T - Y de entregas (calculada, no GANANCIA)
     Pérdida = flete T pagado en devoluciones (envío perdido)
     """
-    ent = _entregados(df)
-    dev = _devueltos(df)
-    col_y = _col_y(ent)
-
-    gan = ent.groupby("CIUDAD DESTINO").agg(
-        Entregas=("ID", "count"),
-        Ingresos=("TOTAL DE LA ORDEN", "sum"),
-        Flete=("PRECIO FLETE", "sum"),
-        Costo_Prod=(col_y, "sum"),
-    ).reset_index()
-    gan["Ganancia"] = (gan["Ingresos"] - gan["Flete"] - gan["Costo_Prod"]).astype(int)
-    gan = gan[["CIUDAD DESTINO", "Entregas", "Ganancia"]]
-
-    per = dev.groupby("CIUDAD DESTINO").agg(
-        Devoluciones=("ID", "count"),
-        Pérdida=("PRECIO FLETE", "sum"),
-    ).reset_index()
-
-    env = _enviados(df).groupby("CIUDAD DESTINO").agg(
-        Envíos=("ID", "count"),
-    ).reset_index()
-
-    result = env.merge(gan, on="CIUDAD DESTINO", how="left")
-    result = result.merge(per, on="CIUDAD DESTINO", how="left")
-    for col in ["Entregas", "Ganancia", "Devoluciones", "Pérdida"]:
-        result[col] = result[col].fillna(0).astype(int)
+    cube = get_cube(df)
+    env = rollup(cube, "CIUDAD DESTINO", enviados=True)
+    gan = rollup(cube, "CIUDAD DESTINO", categorias=["ENTREGADO"]).reindex(env.index, fill_value=0)
+    per = rollup(cube, "CIUDAD DESTINO", categorias=["DEVOLUCION"]).reindex(env.index, fill_value=0)
+
+    result = pd.DataFrame({
+        "CIUDAD DESTINO": env.index,
+        "Envíos": env["ids"].to_numpy(),
+        "Entregas": gan["ids"].to_numpy().astype(int),
+        "Ganancia": (gan["TOTAL DE LA ORDEN"] - gan["PRECIO FLETE"] - gan["COSTO Y"]).to_numpy().astype(int),
+        "Devoluciones": per["ids"].to_numpy().astype(int),
+        "Pérdida": per["PRECIO FLETE"].to_numpy().astype(int),
+    })
     result["Rentabilidad"] = result["Ganancia"] - result["Pérdida"]
     result["Rent/Envío"] = np.where(
         result["Envíos"] > 0,
@@ -386,11 +424,14 @@ def get_city_profitability(df):
         0,
     )
     result["% Devolución"] = (result["Devoluciones"] / result["Envíos"] * 100).round(1)
-    result["Veredicto"] = result.apply(
-        lambda r: "NO ENVIAR" if r["Rentabilidad"] < 0 and r["Envíos"] >= 5
-        else ("PRECAUCIÓN" if r["% Devolución"] > 30 else "OK"),
-        axis=1,
-    )
+    result["Veredicto"] = np.select(
+        [
+            (result["Rentabilidad"] < 0) & (result["Envíos"] >= 5),
+            result["% Devolución"] > 30,
+        ],
+        ["NO ENVIAR", "PRECAUCIÓN"],
+        default="OK",
+    ).astype(object)
     result = result.sort_values("Rentabilidad", ascending=True)
     return result
 
@@ -399,48 +440,46 @@ def get_city_profitability(df):
 # TEMPORAL
 # ============================================================
 
-def get_temporal_analysis(df):
+@instrumentado
+@memoizado
+def get_temporal_analysis(df, hoy=None):
     """Análisis temporal: pedidos demorados y atascados."""
-    hoy = pd.Timestamp(datetime.now().date())
-
-    en_proceso = df[(df["TIENE_GUIA"]) & (df["CATEGORIA"] == "EN PROCESO")].copy()
-    demorados_df = pd.DataFrame()
-    if not en_proceso.empty and en_proceso["FECHA GUIA GENERADA"].notna().any():
-        en_proceso["Días en Tránsito"] = (hoy - en_proceso["FECHA GUIA GENERADA"]).dt.days
-        demorados_df = en_proceso[en_proceso["Días en Tránsito"] > UMBRAL_DIAS_DEMORADO].copy()
-
-    rangos_dem = []
-    for min_d, max_d, label in RANGOS_DEMORADOS:
-        count = len(demorados_df[
-            (demorados_df["Días en Tránsito"] >= min_d) &
-            (demorados_df["Días en Tránsito"] <= max_d)
-        ]) if not demorados_df.empty else 0
-        rangos_dem.append({"Rango": label, "Cantidad": count})
-
-    pendientes = df[df["CATEGORIA"] == "PENDIENTE ATASCADO"].copy()
-    atascados_df = pd.DataFrame()
-    if not pendientes.empty and pendientes["FECHA"].notna().any():
-        pendientes["Días Esperando"] = (hoy - pendientes["FECHA"]).dt.days
-        atascados_df = pendientes[pendientes["Días Esperando"] > UMBRAL_DIAS_ATASCADO].copy()
-
-    rangos_atas = []
-    for min_d, max_d, label in RANGOS_ATASCADOS:
-        count = len(atascados_df[
-            (atascados_df["Días Esperando"] >= min_d) &
-            (atascados_df["Días Esperando"] <= max_d)
-        ]) if not atascados_df.empty else 0
-        rangos_atas.append({"Rango": label, "Cantidad": count})
+    hoy = fecha_referencia(hoy)
+
+    # Días precalculados por fila (ver day_index); el detalle solo
+    # materializa las columnas que se muestran
+    pos_dem = _demorados(df, hoy)
+    dias_dem = dias_hasta(df, "FECHA GUIA GENERADA", hoy)[pos_dem]
+    rangos_dem = pd.DataFrame({
+        "Rango": [label for _, _, label in RANGOS_DEMORADOS],
+        "Cantidad": contar_rangos(dias_dem, RANGOS_DEMORADOS),
+    })
+
+    pos_atas = _atascados(df, hoy)
+    dias_atas = dias_hasta(df, "FECHA", hoy)[pos_atas]
+    rangos_atas = pd.DataFrame({
+        "Rango": [label for _, _, label in RANGOS_ATASCADOS],
+        "Cantidad": contar_rangos(dias_atas, RANGOS_ATASCADOS),
+    })
 
     dem_cols = ["ID", "PRODUCTO", "ESTATUS", "CIUDAD DESTINO", "TRANSPORTADORA",
                 "FECHA GUIA GENERADA", "Días en Tránsito"]
-    dem_detail = demorados_df[dem_cols].sort_values("Días en Tránsito", ascending=False) if not demorados_df.empty else pd.DataFrame(columns=dem_cols)
+    if len(pos_dem):
+        dem_detail = _filas(df, pos_dem, dem_cols[:-1], **{"Días en Tránsito": dias_dem})
+        dem_detail = dem_detail.sort_values("Días en Tránsito", ascending=False)
+    else:
+        dem_detail = pd.DataFrame(columns=dem_cols)
 
     atas_cols = ["ID", "PRODUCTO", "CIUDAD DESTINO", "FECHA", "Días Esperando"]
-    atas_detail = atascados_df[atas_cols].sort_values("Días Esperando", ascending=False) if not atascados_df.empty else pd.DataFrame(columns=atas_cols)
+    if len(pos_atas):
+        atas_detail = _filas(df, pos_atas, atas_cols[:-1], **{"Días Esperando": dias_atas})
+        atas_detail = atas_detail.sort_values("Días Esperando", ascending=False)
+    else:
+        atas_detail = pd.DataFrame(columns=atas_cols)
 
     return {
-        "rangos_demorados": pd.DataFrame(rangos_dem),
-        "rangos_atascados": pd.DataFrame(rangos_atas),
+        "rangos_demorados": rangos_dem,
+        "rangos_atascados": rangos_atas,
         "detalle_demorados": dem_detail,
         "detalle_atascados": atas_detail,
     }
@@ -450,42 +489,31 @@ def get_temporal_analysis(df):
 # COSTOS
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_cost_analysis(df):
     """Análisis de costos e impacto económico.
 
     Flete T se cobra en todos los enviados. Columna U se ignora.
     Pérdida de devoluciones = flete T pagado en devueltos.
     """
-    enviados = _enviados(df)
-    ent = _entregados(df)
-    dev = _devueltos(df)
+    cube = get_cube(df)
+    enviados = totals(cube, enviados=True)
+    ent = totals(cube, categorias=["ENTREGADO"])
+    dev = totals(cube, categorias=["DEVOLUCION"])
 
-    flete_envios = int(enviados["PRECIO FLETE"].sum())
-    flete_devueltos = int(dev["PRECIO FLETE"].sum())
+    flete_envios = int(enviados["PRECIO FLETE"])
+    flete_devueltos = int(dev["PRECIO FLETE"])
 
-    col_y = _col_y(ent)
-    costo_producto = int(ent[col_y].sum())
-    ingreso_perdido = int(dev["TOTAL DE LA ORDEN"].sum())
+    costo_producto = int(ent["COSTO Y"])
+    ingreso_perdido = int(dev["TOTAL DE LA ORDEN"])
 
     # Inventario atascado
-    en_proceso = df[df["CATEGORIA"].isin(["EN PROCESO", "PENDIENTE ATASCADO"])]
-    valor_inventario = int(en_proceso["TOTAL DE LA ORDEN"].sum())
+    valor_inventario = int(totals(cube, categorias=["EN PROCESO", "PENDIENTE ATASCADO"])["TOTAL DE LA ORDEN"])
 
-    # Top 10 pérdida por ciudad (flete T de devueltos)
-    dev_city = dev.groupby("CIUDAD DESTINO").agg(
-        Devoluciones=("ID", "count"),
-        Pérdida_Flete=("PRECIO FLETE", "sum"),
-    ).reset_index()
-    dev_city.rename(columns={"Pérdida_Flete": "Pérdida Total"}, inplace=True)
-    top_cities = dev_city.sort_values("Pérdida Total", ascending=False).head(10)
-
-    # Top 10 pérdida por producto (flete T de devueltos)
-    dev_prod = dev.groupby("PRODUCTO").agg(
-        Devoluciones=("ID", "count"),
-        Pérdida_Flete=("PRECIO FLETE", "sum"),
-    ).reset_index()
-    dev_prod.rename(columns={"Pérdida_Flete": "Pérdida Total"}, inplace=True)
-    top_products = dev_prod.sort_values("Pérdida Total", ascending=False).head(10)
+    # Top 10 pérdida por ciudad y por producto (flete T de devueltos)
+    top_cities = _top_perdida(cube, "CIUDAD DESTINO")
+    top_products = _top_perdida(cube, "PRODUCTO")
 
     return {
         "flete_envios": flete_envios,
@@ -498,10 +526,39 @@ def get_cost_analysis(df):
     }
 
 
+def _top_perdida(cube, dim, n=10):
+    """Top n por pérdida de flete en devoluciones agrupando por dim."""
+    dev = rollup(cube, dim, categorias=["DEVOLUCION"])
+    top = pd.DataFrame({
+        dim: dev.index,
+        "Devoluciones": dev["ids"].to_numpy(),
+        "Pérdida Total": dev["PRECIO FLETE"].to_numpy(),
+    })
+    return top.sort_values("Pérdida Total", ascending=False).head(n)
+
+
 # ============================================================
 # NOVEDADES
 # ============================================================
 
+def _conteos(serie: pd.Series) -> pd.Series:
+    """value_counts que en columnas category da el mismo orden que en object.
+
+    Solo cuenta categorías observadas y desempata por orden de aparición.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.value_counts()
+    codes = serie.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    orden = pd.unique(codes)
+    cantidad = np.bincount(codes, minlength=len(serie.cat.categories))[orden]
+    pos = np.argsort(-cantidad, kind="stable")
+    index = pd.Index(serie.cat.categories.take(orden[pos]), dtype=object, name=serie.name)
+    return pd.Series(cantidad[pos], index=index, name="count")
+
+
+@instrumentado
+@memoizado
 def get_novelty_analysis(df):
     """Análisis de novedades, soluciones y tasa de resolución."""
     with_novelty = df[df["NOVEDAD"].notna() & (df["NOVEDAD"] != "")]
@@ -515,11 +572,12 @@ def get_novelty_analysis(df):
 
     total = len(with_novelty)
     col_sol = "FUE SOLUCIONADA LA NOVEDAD"
-    resueltas = len(with_novelty[with_novelty[col_sol] == "SI"]) if col_sol in with_novelty.columns else 0
+    resuelta = (with_novelty[col_sol] == "SI").to_numpy() if col_sol in with_novelty.columns else None
+    resueltas = int(resuelta.sum()) if resuelta is not None else 0
     no_resueltas = total - resueltas
     tasa = resueltas / total if total > 0 else 0
 
-    top_nov = with_novelty["NOVEDAD"].value_counts().reset_index()
+    top_nov = _conteos(with_novelty["NOVEDAD"]).reset_index()
     top_nov.columns = ["Novedad", "Cantidad"]
     top_nov["Porcentaje"] = (top_nov["Cantidad"] / total * 100).round(1)
 
@@ -535,13 +593,17 @@ def get_novelty_analysis(df):
     if col_solucion:
         with_sol = with_novelty[with_novelty[col_solucion].notna() & (with_novelty[col_solucion] != "")]
         if not with_sol.empty:
-            top_sol = with_sol[col_solucion].value_counts().head(5).reset_index()
+            top_sol = _conteos(with_sol[col_solucion]).head(5).reset_index()
             top_sol.columns = ["Solución", "Cantidad"]
 
-    if col_sol in with_novelty.columns:
-        nov_tipo = with_novelty.groupby("NOVEDAD").agg(
+    if resuelta is not None:
+        work = pd.DataFrame(
+            {"ID": with_novelty["ID"], "Resueltas": resuelta.astype(np.int64)},
+            index=with_novelty.index,
+        )
+        nov_tipo = work.groupby(with_novelty["NOVEDAD"], observed=True).agg(
             Total=("ID", "count"),
-            Resueltas=(col_sol, lambda x: (x == "SI").sum()),
+            Resueltas=("Resueltas", "sum"),
         ).reset_index()
         nov_tipo["No Resueltas"] = nov_tipo["Total"] - nov_tipo["Resueltas"]
         nov_tipo["% Resolución"] = (nov_tipo["Resueltas"] / nov_tipo["Total"] * 100).round(1)
@@ -561,98 +623,86 @@ def get_novelty_analysis(df):
 # TRANSPORTADORAS
 # ============================================================
 
-def get_carrier_analysis(df):
+@instrumentado
+@memoizado
+def get_carrier_analysis(df, min_envios=MIN_ENVIOS_TRANSPORTADORA):
     """Análisis detallado por transportadora: fletes, tasas, costos.
 
-    Ganancia usa R - T - Y (no columna GANANCIA).
+    Ganancia usa R - T - Y (no columna GANANCIA). Se omiten las
+    transportadoras con menos de min_envios envíos.
     """
-    enviados = _enviados(df)
-    col_y = _col_y(df)
-
-    carriers = []
-    for t in df["TRANSPORTADORA"].unique():
-        sub = enviados[enviados["TRANSPORTADORA"] == t]
-        if len(sub) < 5:
-            continue
-
-        sub_ent = sub[sub["CATEGORIA"] == "ENTREGADO"]
-        sub_dev = sub[sub["CATEGORIA"] == "DEVOLUCION"]
-        sub_proc = sub[sub["CATEGORIA"] == "EN PROCESO"]
-
-        n_env = len(sub)
-        n_ent = len(sub_ent)
-        n_dev = len(sub_dev)
-        n_proc = len(sub_proc)
-
-        flete_envio_prom = int(np.floor(sub["PRECIO FLETE"].mean()))
-        flete_dev_prom = int(np.floor(sub_dev["PRECIO FLETE"].mean())) if n_dev > 0 else 0
-
-        flete_envio_total = int(sub["PRECIO FLETE"].sum())
-        flete_dev_total = int(sub_dev["PRECIO FLETE"].sum())
-
-        # Ganancia = R - T - Y de entregados
-        ganancia_total = int(
-            sub_ent["TOTAL DE LA ORDEN"].sum()
-            - sub_ent["PRECIO FLETE"].sum()
-            - sub_ent[col_y].sum()
-        )
-        rentabilidad = ganancia_total - flete_dev_total
-
-        carriers.append({
-            "Transportadora": t,
-            "Envíos": n_env,
-            "Entregas": n_ent,
-            "Devoluciones": n_dev,
-            "En Proceso": n_proc,
-            "% Éxito": round(n_ent / n_env * 100, 1) if n_env > 0 else 0,
-            "% Devolución": round(n_dev / n_env * 100, 1) if n_env > 0 else 0,
-            "Flete Envío Prom": flete_envio_prom,
-            "Flete Dev Prom": flete_dev_prom,
-            "Flete Envío Total": flete_envio_total,
-            "Flete Dev Total": flete_dev_total,
-            "Ganancia": ganancia_total,
-            "Rentabilidad": rentabilidad,
-        })
-
-    return pd.DataFrame(carriers).sort_values("Envíos", ascending=False) if carriers else pd.DataFrame()
+    cube = get_cube(df)
+    env = rollup(cube, "TRANSPORTADORA", enviados=True)
+    # Mismo orden que df["TRANSPORTADORA"].unique() (primera aparición)
+    orden = pd.Index(cube["TRANSPORTADORA"].dropna().unique(), dtype=object)
+    env = env.reindex(orden.intersection(env.index, sort=False))
+    env = env[env["filas"] >= max(min_envios, 1)]
+    if env.empty:
+        return pd.DataFrame()
+
+    counts = category_counts(cube, "TRANSPORTADORA", env.index, enviados=True)
+    ent = rollup(cube, "TRANSPORTADORA", enviados=True, categorias=["ENTREGADO"]).reindex(env.index, fill_value=0)
+    dev = rollup(cube, "TRANSPORTADORA", enviados=True, categorias=["DEVOLUCION"]).reindex(env.index, fill_value=0)
+
+    n_env = env["filas"]
+    n_ent = count_of(counts, "ENTREGADO")
+    n_dev = count_of(counts, "DEVOLUCION")
+    flete_dev_total = dev["PRECIO FLETE"]
+    # Ganancia = R - T - Y de entregados
+    ganancia = ent["TOTAL DE LA ORDEN"] - ent["PRECIO FLETE"] - ent["COSTO Y"]
+
+    carriers = pd.DataFrame({
+        "Transportadora": env.index,
+        "Envíos": n_env.to_numpy(),
+        "Entregas": n_ent.to_numpy(),
+        "Devoluciones": n_dev.to_numpy(),
+        "En Proceso": count_of(counts, "EN PROCESO").to_numpy(),
+        "% Éxito": (n_ent / n_env * 100).round(1).to_numpy(),
+        "% Devolución": (n_dev / n_env * 100).round(1).to_numpy(),
+        "Flete Envío Prom": np.floor(env["PRECIO FLETE"] / n_env).astype(np.int64).to_numpy(),
+        "Flete Dev Prom": np.floor(flete_dev_total / n_dev.where(n_dev > 0)).fillna(0).astype(np.int64).to_numpy(),
+        "Flete Envío Total": env["PRECIO FLETE"].to_numpy(),
+        "Flete Dev Total": flete_dev_total.to_numpy(),
+        "Ganancia": ganancia.to_numpy(),
+        "Rentabilidad": (ganancia - flete_dev_total).to_numpy(),
+    })
+    return carriers.sort_values("Envíos", ascending=False)
 
 
 # ============================================================
 # BUSCADOR DE PRODUCTOS
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_product_search_metrics(df, productos) -> dict:
     """Métricas detalladas para uno o varios productos seleccionados.
 
-    Ganancia usa R - T - Y (no columna GANANCIA).
+    Ganancia usa R - T - Y (no columna GANANCIA). Suma las filas
+    precalculadas de los productos elegidos (ver product_metrics).
     """
-    filtered = df[df["PRODUCTO"].isin(productos)]
-    enviados = _enviados(filtered)
-    ent = enviados[enviados["CATEGORIA"] == "ENTREGADO"]
-    dev = enviados[enviados["CATEGORIA"] == "DEVOLUCION"]
-    cancelados = filtered[filtered["CATEGORIA"] == "NUNCA ENVIADO"]
-
-    col_y = _col_y(ent)
+    m = combined(get_product_table(df), productos)
 
     # Ganancia = R - T - Y de entregados
-    ganancia = int(
-        ent["TOTAL DE LA ORDEN"].sum()
-        - ent["PRECIO FLETE"].sum()
-        - ent[col_y].sum()
-    )
-    perdida = int(dev["PRECIO FLETE"].sum())
-    flete_envios = int(enviados["PRECIO FLETE"].sum())
-    costo_producto = int(ent[col_y].sum())
-    ventas_brutas = int(ent["TOTAL DE LA ORDEN"].sum())
+    ganancia = int(m["ent_total"] - m["ent_flete"] - m["ent_costo"])
+    perdida = int(m["dev_flete"])
+    flete_envios = int(m["env_flete"])
+    costo_producto = int(m["ent_costo"])
+    ventas_brutas = int(m["ent_total"])
+
+    n_total = int(m["filas"])
+    n_env = int(m["env_filas"])
+    n_ent = int(m["ent_filas"])
+    n_dev = int(m["dev_filas"])
 
     return {
-        "total_ordenes": len(filtered),
-        "envios": len(enviados),
-        "entregas": len(ent),
-        "devoluciones": len(dev),
-        "cancelados": len(cancelados),
-        "tasa_exito": len(ent) / len(enviados) if len(enviados) > 0 else 0,
-        "tasa_devolucion": len(dev) / len(enviados) if len(enviados) > 0 else 0,
+        "total_ordenes": n_total,
+        "envios": n_env,
+        "entregas": n_ent,
+        "devoluciones": n_dev,
+        "cancelados": int(m["cancelados"]),
+        "tasa_exito": n_ent / n_env if n_env > 0 else 0,
+        "tasa_devolucion": n_dev / n_env if n_env > 0 else 0,
         "ventas_brutas": ventas_brutas,
         "ingreso_bruto": ventas_brutas,
         "costo_producto": costo_producto,
@@ -661,7 +711,7 @@ def get_product_search_metrics(df, productos) -> dict:
         "ganancia_entregas": ganancia,
         "perdida_devoluciones": perdida,
         "rentabilidad": ganancia - perdida,
-        "ticket_promedio": int(np.floor(filtered["TOTAL DE LA ORDEN"].mean())) if len(filtered) > 0 else 0,
+        "ticket_promedio": int(np.floor(m["total"] / n_total)) if n_total > 0 else 0,
     }
 
 
@@ -669,21 +719,22 @@ def get_product_search_metrics(df, productos) -> dict:
 # EVOLUCIÓN TEMPORAL
 # ============================================================
 
+@instrumentado
+@memoizado
 def get_temporal_evolution(df):
     """Evolución temporal de entregas vs devoluciones por fecha de guía generada."""
-    enviados = df[df["TIENE_GUIA"] & df["FECHA GUIA GENERADA"].notna()].copy()
-    if enviados.empty:
+    cube = get_cube(df)
+    tot = rollup(cube, "DIA", enviados=True)
+    if tot.empty:
         return pd.DataFrame()
-
-    enviados["Fecha"] = enviados["FECHA GUIA GENERADA"].dt.date
-
-    evolution = enviados.groupby("Fecha").agg(
-        Envíos=("ID", "count"),
-        Entregas=("CATEGORIA", lambda x: (x == "ENTREGADO").sum()),
-        Devoluciones=("CATEGORIA", lambda x: (x == "DEVOLUCION").sum()),
-    ).reset_index()
-
-    evolution["Fecha"] = pd.to_datetime(evolution["Fecha"])
+    cnt = category_counts(cube, "DIA", tot.index, enviados=True)
+
+    evolution = pd.DataFrame({
+        "Fecha": pd.to_datetime(tot.index),
+        "Envíos": tot["ids"].to_numpy(),
+        "Entregas": count_of(cnt, "ENTREGADO").to_numpy(),
+        "Devoluciones": count_of(cnt, "DEVOLUCION").to_numpy(),
+    })
     return evolution.sort_values("Fecha")
 
 
@@ -691,51 +742,88 @@ def get_temporal_evolution(df):
 # ALERTAS OPERATIVAS
 # ============================================================
 
-def get_operational_alerts(df):
+@instrumentado
+@memoizado
+def get_operational_alerts(df, hoy=None):
     """Retorna dict con DataFrames de alertas operativas.
 
     - flete_sobrecosto: pedidos donde T > $20,000
     - guia_demorada: pedidos CATEGORIA == "GUIA DEMORADA"
     - transito_demorado: en proceso >6 días desde FECHA GUIA GENERADA
     """
-    hoy = pd.Timestamp(datetime.now().date())
+    hoy = fecha_referencia(hoy)
 
     # Flete sobrecosto: pedidos ENVIADOS con flete > umbral (solo los que se pagaron)
-    flete_sobrecosto = df[(df["PRECIO FLETE"] > UMBRAL_FLETE_SOBRECOSTO) & (df["TIENE_GUIA"])].copy()
-    if not flete_sobrecosto.empty:
-        flete_cols = ["ID", "PRODUCTO", "CIUDAD DESTINO", "TRANSPORTADORA", "PRECIO FLETE", "ESTATUS", "CATEGORIA"]
-        flete_cols = [c for c in flete_cols if c in flete_sobrecosto.columns]
-        flete_sobrecosto = flete_sobrecosto[flete_cols].sort_values("PRECIO FLETE", ascending=False)
+    flete_cols = ["ID", "PRODUCTO", "CIUDAD DESTINO", "TRANSPORTADORA", "PRECIO FLETE", "ESTATUS", "CATEGORIA"]
+    pos = _posiciones((df["PRECIO FLETE"] > UMBRAL_FLETE_SOBRECOSTO) & (df["TIENE_GUIA"]))
+    flete_sobrecosto = _filas(df, pos, flete_cols).sort_values("PRECIO FLETE", ascending=False)
 
     # Guías demoradas: categoría asignada en classifier
-    guia_demorada = df[df["CATEGORIA"] == "GUIA DEMORADA"].copy()
-    if not guia_demorada.empty:
-        if "FECHA GUIA GENERADA" in guia_demorada.columns and "FECHA DE REPORTE" in guia_demorada.columns:
-            guia_demorada["Días Sin Despacho"] = (
-                guia_demorada["FECHA DE REPORTE"] - guia_demorada["FECHA GUIA GENERADA"]
-            ).dt.days
-        guia_cols = ["ID", "PRODUCTO", "CIUDAD DESTINO", "TRANSPORTADORA", "FECHA GUIA GENERADA", "ESTATUS"]
-        if "Días Sin Despacho" in guia_demorada.columns:
-            guia_cols.append("Días Sin Despacho")
-        guia_cols = [c for c in guia_cols if c in guia_demorada.columns]
-        guia_demorada = guia_demorada[guia_cols]
-        if "Días Sin Despacho" in guia_demorada.columns:
-            guia_demorada = guia_demorada.sort_values("Días Sin Despacho", ascending=False)
+    guia_cols = ["ID", "PRODUCTO", "CIUDAD DESTINO", "TRANSPORTADORA", "FECHA GUIA GENERADA", "ESTATUS"]
+    pos = _posiciones(df["CATEGORIA"] == "GUIA DEMORADA")
+    if "FECHA GUIA GENERADA" in df.columns and "FECHA DE REPORTE" in df.columns:
+        sin_despacho = _dias(df["FECHA GUIA GENERADA"].iloc[pos], df["FECHA DE REPORTE"].iloc[pos])
+        guia_demorada = _filas(df, pos, guia_cols, **{"Días Sin Despacho": sin_despacho})
+        guia_demorada = guia_demorada.sort_values("Días Sin Despacho", ascending=False)
+    else:
+        guia_demorada = _filas(df, pos, guia_cols)
 
     # Tránsito demorado: en proceso >6 días
-    en_proceso = df[(df["TIENE_GUIA"]) & (df["CATEGORIA"] == "EN PROCESO")].copy()
+    pos = _demorados(df, hoy)
     transito_demorado = pd.DataFrame()
-    if not en_proceso.empty and en_proceso["FECHA GUIA GENERADA"].notna().any():
-        en_proceso["Días en Tránsito"] = (hoy - en_proceso["FECHA GUIA GENERADA"]).dt.days
-        transito_demorado = en_proceso[en_proceso["Días en Tránsito"] > UMBRAL_DIAS_DEMORADO].copy()
-        if not transito_demorado.empty:
-            trans_cols = ["ID", "PRODUCTO", "ESTATUS", "CIUDAD DESTINO", "TRANSPORTADORA",
-                          "FECHA GUIA GENERADA", "Días en Tránsito"]
-            trans_cols = [c for c in trans_cols if c in transito_demorado.columns]
-            transito_demorado = transito_demorado[trans_cols].sort_values("Días en Tránsito", ascending=False)
+    if len(pos):
+        trans_cols = ["ID", "PRODUCTO", "ESTATUS", "CIUDAD DESTINO", "TRANSPORTADORA", "FECHA GUIA GENERADA"]
+        dias = dias_hasta(df, "FECHA GUIA GENERADA", hoy)[pos]
+        transito_demorado = _filas(df, pos, trans_cols, **{"Días en Tránsito": dias})
+        transito_demorado = transito_demorado.sort_values("Días en Tránsito", ascending=False)
 
     return {
         "flete_sobrecosto": flete_sobrecosto,
         "guia_demorada": guia_demorada,
         "transito_demorado": transito_demorado,
     }
+
+
+# ============================================================
+# TIENDAS
+# ============================================================
+
+@instrumentado
+@memoizado
+def get_store_comparison(df):
+    """Comparativo por TIENDA (carga de varios archivos): volumen, tasas y P&L.
+
+    Mismas reglas que get_carrier_analysis: Ganancia = R - T - Y de
+    entregados, Rentabilidad = Ganancia - flete de devueltos.
+    """
+    if "TIENDA" not in df.columns:
+        return pd.DataFrame()
+
+    env = df["TIENE_GUIA"].to_numpy(dtype=bool)
+    ent = (df["CATEGORIA"] == "ENTREGADO").to_numpy()
+    dev = (df["CATEGORIA"] == "DEVOLUCION").to_numpy()
+    flete = df["PRECIO FLETE"].to_numpy(dtype=np.int64)
+    medidas = pd.DataFrame({
+        "ordenes": np.ones(len(df), dtype=np.int64),
+        "envios": env,
+        "entregas": ent,
+        "devoluciones": dev,
+        "ventas": np.where(ent, df["TOTAL DE LA ORDEN"].to_numpy(dtype=np.int64), 0),
+        "ganancia": np.where(ent, df["UTILIDAD"].to_numpy(dtype=np.int64), 0),
+        "flete_dev": np.where(dev, flete, 0),
+    }).groupby(df["TIENDA"].to_numpy(), sort=True).sum()
+
+    n_env = medidas["envios"].where(medidas["envios"] > 0)
+    return pd.DataFrame({
+        "Tienda": medidas.index.astype(object),
+        "Órdenes": medidas["ordenes"].to_numpy(),
+        "Envíos": medidas["envios"].to_numpy(),
+        "Entregas": medidas["entregas"].to_numpy(),
+        "Devoluciones": medidas["devoluciones"].to_numpy(),
+        "% Éxito": (medidas["entregas"] / n_env * 100).round(1).fillna(0).to_numpy(),
+        "% Devolución": (medidas["devoluciones"] / n_env * 100).round(1).fillna(0).to_numpy(),
+        "Ventas Brutas": medidas["ventas"].to_numpy(),
+        "Ganancia": medidas["ganancia"].to_numpy(),
+        "Pérdida Devoluciones": medidas["flete_dev"].to_numpy(),
+        "Rentabilidad": (medidas["ganancia"] - medidas["flete_dev"]).to_numpy(),
+    })
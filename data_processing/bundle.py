@@ -0,0 +1,166 @@
+"""Reportes precalculados: órdenes clasificadas + resultados del analyzer en disco.
+
+cli.py genera un reporte por exportación; el dashboard lo abre sin volver a
+parsear, clasificar ni calcular: lee las órdenes y siembra el cubo, la
+huella del dataset y los resultados de cada get_* en el cache de métricas
+(ver memo). Lo que no esté precalculado (otros filtros, otra fecha de
+referencia) se calcula en vivo como siempre.
+
+Archivos de cada reporte (una carpeta dentro de config.REPORTES_DIR):
+- kpis.json: metadatos, versión y los valores escalares de cada get_*
+- ordenes.parquet: órdenes clasificadas
+- cubo.parquet: cubo de agregados (ver data_processing.cube)
+- tablas/<función>[.<clave>].parquet: los DataFrames de cada get_*
+"""
+
+import inspect
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from config import REPORTES_DIR
+from data_processing import analyzer, frame_cache, memo
+from data_processing.cube import get_cube
+from data_processing.day_index import fecha_referencia
+from data_processing.disk_cache import parquet_safe
+
+MANIFIESTO = "kpis.json"
+
+
+def funciones() -> list:
+    """(nombre, función) de cada get_* del analyzer que se llama solo con df."""
+    return [
+        (nombre, fn) for nombre, fn in inspect.getmembers(analyzer, inspect.isfunction)
+        if nombre.startswith("get_") and fn.__module__ == analyzer.__name__
+        and all(p.default is not inspect.Parameter.empty
+                for p in list(inspect.signature(fn).parameters.values())[1:])
+    ]
+
+
+def _argumentos(fn, hoy) -> dict:
+    return {"hoy": hoy} if "hoy" in inspect.signature(fn).parameters else {}
+
+
+def precompute(df: pd.DataFrame, hoy=None) -> dict:
+    """Resultado de cada get_* con sus argumentos por defecto (y la fecha dada)."""
+    hoy = fecha_referencia(hoy)
+    return {nombre: fn(df, **_argumentos(fn, hoy)) for nombre, fn in funciones()}
+
+
+def _escribir_tabla(carpeta: Path, nombre: str, tabla: pd.DataFrame) -> dict:
+    """Guarda la tabla; anota las columnas object (Parquet las devuelve como str)."""
+    ruta = Path("tablas") / f"{nombre}.parquet"
+    parquet_safe(tabla).to_parquet(carpeta / ruta)
+    return {"archivo": ruta.as_posix(), "objeto": [c for c in tabla.columns if tabla[c].dtype == object]}
+
+
+def _leer_tabla(carpeta: Path, guardada: dict) -> pd.DataFrame:
+    tabla = pd.read_parquet(carpeta / guardada["archivo"])
+    return tabla.astype({c: object for c in guardada["objeto"]}) if guardada["objeto"] else tabla
+
+
+def _json(valor):
+    """Escalares de numpy/pandas que json no serializa."""
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+
+def write_bundle(carpeta, df: pd.DataFrame, resultados: dict, meta: dict) -> Path:
+    """Escribe el reporte en carpeta (reemplazando uno anterior de forma atómica)."""
+    carpeta = Path(carpeta)
+    tmp = carpeta.with_name(f".{carpeta.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    (tmp / "tablas").mkdir(parents=True)
+    try:
+        parquet_safe(df).to_parquet(tmp / "ordenes.parquet", index=False)
+        parquet_safe(get_cube(df)).to_parquet(tmp / "cubo.parquet", index=False)
+
+        salida = {}
+        for nombre, valor in resultados.items():
+            if isinstance(valor, pd.DataFrame):
+                salida[nombre] = {"tabla": _escribir_tabla(tmp, nombre, valor)}
+                continue
+            salida[nombre] = {
+                "valores": {k: v for k, v in valor.items() if not isinstance(v, pd.DataFrame)},
+                "tablas": {
+                    k: _escribir_tabla(tmp, f"{nombre}.{k}", v)
+                    for k, v in valor.items() if isinstance(v, pd.DataFrame)
+                },
+            }
+
+        manifiesto = {**meta, "filas": len(df), "resultados": salida}
+        texto = json.dumps(manifiesto, indent=1, ensure_ascii=False, default=_json)
+        (tmp / MANIFIESTO).write_text(texto, encoding="utf-8")
+        shutil.rmtree(carpeta, ignore_errors=True)
+        os.replace(tmp, carpeta)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return carpeta
+
+
+def read_manifest(carpeta) -> dict | None:
+    """kpis.json del reporte, o None si la carpeta no es un reporte válido."""
+    try:
+        return json.loads((Path(carpeta) / MANIFIESTO).read_text(encoding="utf-8"))
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def _resultado(carpeta: Path, guardado: dict):
+    if "tabla" in guardado:
+        return _leer_tabla(carpeta, guardado["tabla"])
+    return {
+        **guardado["valores"],
+        **{k: _leer_tabla(carpeta, tabla) for k, tabla in guardado["tablas"].items()},
+    }
+
+
+def read_bundle(carpeta, version: str):
+    """(órdenes, kpis.json) del reporte, o None si no existe o es de otra versión.
+
+    Siembra la huella (la clave del dataset con la que se generó), el cubo y
+    los resultados precalculados: las páginas los encuentran en el cache.
+    """
+    carpeta = Path(carpeta)
+    manifiesto = read_manifest(carpeta)
+    if manifiesto is None or manifiesto.get("version") != version:
+        return None
+
+    df = pd.read_parquet(carpeta / "ordenes.parquet")
+    frame_cache.seed(df, "fingerprint", manifiesto["clave"])
+    frame_cache.seed(df, "cube", pd.read_parquet(carpeta / "cubo.parquet"))
+
+    hoy = fecha_referencia(manifiesto["fecha_referencia"])
+    por_nombre = dict(funciones())
+    for nombre, guardado in manifiesto["resultados"].items():
+        fn = por_nombre.get(nombre)
+        if fn is not None:
+            memo.seed(fn, df, _resultado(carpeta, guardado), **_argumentos(fn, hoy))
+    return df, manifiesto
+
+
+def list_bundles(base=None) -> list:
+    """(carpeta, kpis.json) de los reportes en base, del más reciente al más viejo."""
+    base = Path(base or REPORTES_DIR)
+    if not base.is_dir():
+        return []
+    reportes = [
+        (carpeta, manifiesto) for carpeta in base.iterdir()
+        if carpeta.is_dir() and not carpeta.name.startswith(".")
+        and (manifiesto := read_manifest(carpeta)) is not None
+    ]
+    return sorted(reportes, key=lambda r: r[1].get("generado", ""), reverse=True)
+
+
+def metadata(archivo: str, archivo_hash: str, clave: str, version: str, hoy) -> dict:
+    """Metadatos del reporte guardados en kpis.json."""
+    return {
+        "archivo": archivo,
+        "archivo_hash": archivo_hash,
+        "clave": clave,
+        "version": version,
+        "fecha_referencia": fecha_referencia(hoy).date().isoformat(),
+        "generado": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -1,8 +1,12 @@
-"""Clasificación de estatus de órdenes: reglas deterministas + IA."""
+"""Clasificación de estatus de órdenes: reglas deterministas + IA + reglas manuales."""
 
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 from config import (
+    CATEGORIAS,
     ESTATUS_NUNCA_ENVIADO,
     ESTATUS_PENDIENTE_ATASCADO,
     ESTATUS_DEVOLUCION,
@@ -10,6 +14,11 @@ from config import (
     ESTATUS_EN_PROCESO,
     UMBRAL_DIAS_GUIA_DEMORADA,
 )
+from data_processing.loader import downcast_int
+from profiling import instrumentado
+
+# Origen de la categoría de cada orden (columna ORIGEN)
+ORIGENES = ["REGLAS", "IA", "MANUAL"]
 
 
 def classify_status(estatus: str, tiene_guia: bool) -> str:
@@ -58,6 +67,60 @@ def classify_status(estatus: str, tiene_guia: bool) -> str:
     return "DESCONOCIDO"
 
 
+@lru_cache(maxsize=1)
+def _known_status_lookup() -> dict:
+    """Tabla (estatus normalizado, tiene_guia) → categoría para los estatus de config.
+
+    Se construye una sola vez; los estatus que no están en config se resuelven
+    con classify_status al vuelo (solo una vez por valor único).
+    """
+    known = set(
+        ESTATUS_NUNCA_ENVIADO
+        + ESTATUS_PENDIENTE_ATASCADO
+        + ESTATUS_DEVOLUCION
+        + ESTATUS_ENTREGADO
+        + ESTATUS_EN_PROCESO
+    )
+    return {
+        (estatus, tiene_guia): classify_status(estatus, tiene_guia)
+        for estatus in known
+        for tiene_guia in (False, True)
+    }
+
+
+def classify_series(estatus: pd.Series, tiene_guia: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de classify_status para columnas completas.
+
+    Factoriza ESTATUS en códigos categóricos, resuelve cada valor único con la
+    tabla de búsqueda (una vez por par estatus/guía) y mapea todas las filas
+    indexando un arreglo de códigos × 2. Devuelve exactamente lo mismo que
+    aplicar classify_status fila por fila.
+    """
+    if isinstance(estatus.dtype, pd.CategoricalDtype):
+        # Ya viene factorizado desde clean_data; el código -1 (nulo) se resuelve como "nan"
+        uniques = np.append(estatus.cat.categories.astype(str).to_numpy(dtype=object), "nan")
+        codes = np.where(estatus.cat.codes.to_numpy() < 0, len(uniques) - 1, estatus.cat.codes.to_numpy())
+    else:
+        codes, uniques = pd.factorize(estatus.astype(str), use_na_sentinel=False)
+    lookup = _known_status_lookup()
+    cat_index = {c: i for i, c in enumerate(CATEGORIAS)}
+
+    # table[codigo_estatus, tiene_guia] → índice en CATEGORIAS
+    table = np.empty((len(uniques), 2), dtype=np.int8)
+    for i, raw in enumerate(uniques):
+        norm = str(raw).strip().upper()
+        for guia in (0, 1):
+            categoria = lookup.get((norm, bool(guia)))
+            if categoria is None:
+                categoria = classify_status(norm, bool(guia))
+            table[i, guia] = cat_index[categoria]
+
+    guia_idx = tiene_guia.to_numpy(dtype=bool).astype(np.intp)
+    result = pd.Categorical.from_codes(table[codes, guia_idx], categories=CATEGORIAS)
+    return pd.Series(result, index=estatus.index)
+
+
 def _compute_utilidad(df: pd.DataFrame) -> pd.DataFrame:
     """Calcula columna UTILIDAD (reemplaza GANANCIA no confiable).
 
@@ -67,28 +130,29 @@ def _compute_utilidad(df: pd.DataFrame) -> pd.DataFrame:
     """
     col_y = "PRECIO PROVEEDOR X CANTIDAD" if "PRECIO PROVEEDOR X CANTIDAD" in df.columns else "PRECIO PROVEEDOR"
 
-    df["UTILIDAD"] = 0
-
-    mask_ent = df["CATEGORIA"] == "ENTREGADO"
-    df.loc[mask_ent, "UTILIDAD"] = (
-        df.loc[mask_ent, "TOTAL DE LA ORDEN"]
-        - df.loc[mask_ent, "PRECIO FLETE"]
-        - df.loc[mask_ent, col_y]
-    ).astype(int)
-
-    mask_dev = df["CATEGORIA"] == "DEVOLUCION"
-    df.loc[mask_dev, "UTILIDAD"] = (-df.loc[mask_dev, "PRECIO FLETE"]).astype(int)
+    # Se calcula en int64 (los montos pueden venir en int32) y luego se reduce
+    total = df["TOTAL DE LA ORDEN"].to_numpy(dtype=np.int64)
+    flete = df["PRECIO FLETE"].to_numpy(dtype=np.int64)
+    costo = df[col_y].to_numpy(dtype=np.int64)
+    categoria = df["CATEGORIA"]
+    utilidad = np.select(
+        [(categoria == "ENTREGADO").to_numpy(), (categoria == "DEVOLUCION").to_numpy()],
+        [total - flete - costo, -flete],
+        default=0,
+    )
+    df["UTILIDAD"] = downcast_int(pd.Series(utilidad, index=df.index))
 
     return df
 
 
+@instrumentado
 def classify_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Clasifica todos los estatus del DataFrame."""
-    df = df.copy()
-    df["CATEGORIA"] = df.apply(
-        lambda row: classify_status(row["ESTATUS"], row["TIENE_GUIA"]),
-        axis=1,
-    )
+    """Clasifica todos los estatus del DataFrame.
+
+    Devuelve un frame nuevo que comparte las columnas de df (copia superficial)
+    y agrega CATEGORIA, ORIGEN (REGLAS) y UTILIDAD; df no se modifica.
+    """
+    categoria = classify_series(df["ESTATUS"], df["TIENE_GUIA"])
 
     # Guías impresas hace >3 días sin movimiento = GUIA DEMORADA
     if "FECHA GUIA GENERADA" in df.columns and "FECHA DE REPORTE" in df.columns:
@@ -99,7 +163,11 @@ def classify_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             & (df["FECHA DE REPORTE"].notna())
             & ((df["FECHA DE REPORTE"] - df["FECHA GUIA GENERADA"]).dt.days > UMBRAL_DIAS_GUIA_DEMORADA)
         )
-        df.loc[mask, "CATEGORIA"] = "GUIA DEMORADA"
+        categoria = categoria.mask(mask, "GUIA DEMORADA")
+
+    df = df.copy(deep=False)
+    df["CATEGORIA"] = categoria
+    df["ORIGEN"] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=ORIGENES)
 
     # Calcular UTILIDAD (reemplaza GANANCIA)
     df = _compute_utilidad(df)
@@ -113,77 +181,86 @@ def get_unknown_statuses(df: pd.DataFrame) -> list:
     return sorted(unknown)
 
 
-def classify_with_ai(statuses: list, api_key: str) -> dict:
+def classify_with_ai(statuses: list, api_key: str, progreso=None) -> dict:
     """
-    Llama a Claude API para clasificar estatus desconocidos.
+    Clasifica estatus desconocidos con Claude (por lotes, en paralelo).
 
-    Retorna dict {estatus_original: categoria_sugerida}.
+    Retorna dict {estatus: categoria_sugerida}. Los veredictos quedan
+    guardados y se reutilizan (ver data_processing.ai_classifier);
+    progreso(hechos, total) se llama al terminar cada lote.
     """
     if not statuses or not api_key:
         return {}
 
-    try:
-        from anthropic import Anthropic
-
-        client = Anthropic(api_key=api_key)
-
-        statuses_text = "\n".join(f"- {s}" for s in statuses)
-        prompt = f"""Eres un experto en logística de e-commerce en Colombia (plataforma Dropi).
-Clasifica cada uno de estos estatus de orden en UNA de estas categorías:
-- NUNCA_ENVIADO: La orden nunca fue enviada (cancelada, rechazada, sin guía, guía anulada, indemnización)
-- DEVOLUCION: El paquete fue devuelto o está en proceso de devolución
-- ENTREGADO: El paquete fue entregado exitosamente al cliente
-- EN_PROCESO: El paquete está en tránsito o en algún punto del proceso de envío
-- GUIA_DEMORADA: La guía fue generada pero no ha sido despachada en más de 3 días
-
-Estatus a clasificar:
-{statuses_text}
+    from data_processing.ai_classifier import classify_statuses
 
-Responde SOLO con formato JSON como: {{"ESTATUS": "CATEGORIA", ...}}
-Sin explicaciones adicionales."""
-
-        response = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
+    try:
+        resultados, errores = classify_statuses(statuses, api_key, progreso=progreso)
+    except Exception as e:
+        errores, resultados = [str(e)], {}
+    for error in errores:
+        st.error(f"Error al clasificar con IA: {error}")
+    return resultados
+
+
+def _tabla_destinos(categorias_estatus, reglas: dict, cat_index: dict) -> np.ndarray:
+    """Índice en CATEGORIAS por código de ESTATUS (-1 = sin regla); último lugar = nulo."""
+    destinos = {str(e).strip().upper(): cat_index[c] for e, c in reglas.items() if c in cat_index}
+    tabla = np.full(len(categorias_estatus) + 1, -1, dtype=np.int8)
+    for i, estatus in enumerate(categorias_estatus):
+        tabla[i] = destinos.get(str(estatus).strip().upper(), -1)
+    return tabla
+
+
+@instrumentado
+def apply_overrides(df: pd.DataFrame, ia: dict | None = None, manual: dict | None = None) -> pd.DataFrame:
+    """Aplica mapeos {estatus: categoria} sobre la clasificación por reglas.
+
+    - ia: solo reclasifica órdenes que las reglas dejaron en DESCONOCIDO
+    - manual: reglas del usuario, valen para todas las órdenes del estatus
+      y ganan sobre la IA
+
+    Una sola pasada sobre los códigos categóricos: cada mapeo se traduce a
+    una tabla código de estatus → categoría y se indexa con los códigos de
+    todas las filas. ORIGEN registra de dónde sale cada categoría y UTILIDAD
+    se recalcula si alguna orden cambió. Solo se reemplazan CATEGORIA,
+    ORIGEN y UTILIDAD; el resto de columnas se comparte con df.
+    """
+    if not ia and not manual:
+        return df
 
-        import json
-        text = response.content[0].text.strip()
-        # Extract JSON from response
-        if "```" in text:
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-            text = text.strip()
-
-        result = json.loads(text)
-
-        # Map AI categories back to our internal names
-        category_map = {
-            "NUNCA_ENVIADO": "NUNCA ENVIADO",
-            "DEVOLUCION": "DEVOLUCION",
-            "ENTREGADO": "ENTREGADO",
-            "EN_PROCESO": "EN PROCESO",
-            "GUIA_DEMORADA": "GUIA DEMORADA",
-        }
-
-        return {
-            k: category_map.get(v, v)
-            for k, v in result.items()
-        }
+    if isinstance(df["ESTATUS"].dtype, pd.CategoricalDtype):
+        categorias_estatus = df["ESTATUS"].cat.categories
+        codigos = df["ESTATUS"].cat.codes.to_numpy()
+    else:
+        codigos, categorias_estatus = pd.factorize(df["ESTATUS"])
+    cat_index = {c: i for i, c in enumerate(CATEGORIAS)}
+
+    # Las filas con ESTATUS nulo (código -1) caen en la última posición de la tabla
+    destino_ia = _tabla_destinos(categorias_estatus, ia or {}, cat_index)[codigos]
+    destino_manual = _tabla_destinos(categorias_estatus, manual or {}, cat_index)[codigos]
+
+    categoria = df["CATEGORIA"].astype(pd.CategoricalDtype(CATEGORIAS)).cat.codes.to_numpy()
+    usa_manual = destino_manual >= 0
+    usa_ia = ~usa_manual & (destino_ia >= 0) & (categoria == cat_index["DESCONOCIDO"])
+    if not (usa_manual.any() or usa_ia.any()):
+        return df
 
-    except Exception as e:
-        st.error(f"Error al clasificar con IA: {e}")
-        return {}
+    if "ORIGEN" in df.columns:
+        origen = df["ORIGEN"].astype(pd.CategoricalDtype(ORIGENES)).cat.codes.to_numpy()
+    else:
+        origen = np.zeros(len(df), dtype=np.int8)
+    df = df.copy(deep=False)
+    df["CATEGORIA"] = pd.Categorical.from_codes(
+        np.where(usa_manual, destino_manual, np.where(usa_ia, destino_ia, categoria)), categories=CATEGORIAS
+    )
+    df["ORIGEN"] = pd.Categorical.from_codes(
+        np.where(usa_manual, ORIGENES.index("MANUAL"), np.where(usa_ia, ORIGENES.index("IA"), origen)),
+        categories=ORIGENES,
+    )
+    return _compute_utilidad(df)
 
 
 def apply_ai_classifications(df: pd.DataFrame, ai_results: dict) -> pd.DataFrame:
-    """Aplica las clasificaciones de IA al DataFrame."""
-    if not ai_results:
-        return df
-    df = df.copy()
-    for estatus, categoria in ai_results.items():
-        mask = (df["ESTATUS"] == estatus) & (df["CATEGORIA"] == "DESCONOCIDO")
-        df.loc[mask, "CATEGORIA"] = categoria
-    return df
+    """Aplica las clasificaciones de IA al DataFrame (ver apply_overrides)."""
+    return apply_overrides(df, ia=ai_results)
@@ -0,0 +1,138 @@
+"""Cubo de agregados precalculado sobre el DataFrame clasificado.
+
+Una sola pasada de groupby por (PRODUCTO, CIUDAD DESTINO, TRANSPORTADORA,
+DIA, TIENE_GUIA, CATEGORIA) guarda conteos y sumas. Las funciones del
+analyzer hacen rollups sobre el cubo (miles de filas) en lugar de volver a
+filtrar y agrupar el DataFrame completo en cada llamada.
+
+Medidas:
+- filas: número de órdenes
+- ids: órdenes con ID no nulo (equivale a agg("ID", "count"))
+- TOTAL DE LA ORDEN, PRECIO FLETE, PRECIO PROVEEDOR, COSTO Y, UTILIDAD, CANTIDAD: sumas
+"""
+
+import numpy as np
+import pandas as pd
+from data_processing.frame_cache import per_frame
+from profiling import instrumentado
+
+DIMENSIONES = ["PRODUCTO", "CIUDAD DESTINO", "TRANSPORTADORA", "DIA", "TIENE_GUIA", "CATEGORIA"]
+
+SUMAS = ["TOTAL DE LA ORDEN", "PRECIO FLETE", "PRECIO PROVEEDOR", "COSTO Y", "UTILIDAD", "CANTIDAD"]
+
+MEDIDAS = ["filas", "ids"] + SUMAS
+
+
+def _col_y(df):
+    return "PRECIO PROVEEDOR X CANTIDAD" if "PRECIO PROVEEDOR X CANTIDAD" in df.columns else "PRECIO PROVEEDOR"
+
+
+@instrumentado
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Construye el cubo en una sola pasada sobre el DataFrame clasificado."""
+    keys = [
+        df["PRODUCTO"],
+        df["CIUDAD DESTINO"],
+        df["TRANSPORTADORA"],
+        df["FECHA GUIA GENERADA"].dt.normalize().rename("DIA"),
+        df["TIENE_GUIA"],
+        df["CATEGORIA"],
+    ]
+    cube = df.groupby(keys, dropna=False, observed=True, sort=False).agg(
+        filas=("CATEGORIA", "size"),
+        ids=("ID", "count"),
+        **{
+            "TOTAL DE LA ORDEN": ("TOTAL DE LA ORDEN", "sum"),
+            "PRECIO FLETE": ("PRECIO FLETE", "sum"),
+            "PRECIO PROVEEDOR": ("PRECIO PROVEEDOR", "sum"),
+            "COSTO Y": (_col_y(df), "sum"),
+            "UTILIDAD": ("UTILIDAD", "sum"),
+            "CANTIDAD": ("CANTIDAD", "sum"),
+        },
+    ).reset_index()
+    cube[MEDIDAS] = cube[MEDIDAS].astype(np.int64)
+    return cube
+
+
+def get_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Cubo del DataFrame, calculado una sola vez por objeto."""
+    return per_frame(df, "cube", build_cube)
+
+
+def select(cube, enviados=False, categorias=None, cols=None):
+    """Filtra filas del cubo: solo enviados (TIENE_GUIA) y/o ciertas categorías.
+
+    cols limita las columnas que se copian al filtrar; sin filtro no se copia nada.
+    """
+    if cols is not None:
+        cube = cube[cols]
+    if not enviados and categorias is None:
+        return cube
+    mask = np.ones(len(cube), dtype=bool)
+    if enviados:
+        mask &= cube["TIENE_GUIA"].to_numpy(dtype=bool)
+    if categorias is not None:
+        mask &= cube["CATEGORIA"].isin(categorias).to_numpy()
+    return cube[mask]
+
+
+def totals(cube, enviados=False, categorias=None) -> pd.Series:
+    """Suma de todas las medidas (sin agrupar)."""
+    return select(cube, enviados, categorias, cols=["TIENE_GUIA", "CATEGORIA"] + MEDIDAS)[MEDIDAS].sum()
+
+
+def _plain_index(frame):
+    """Índice categórico → Index object, para que los resultados se vean como antes."""
+    if isinstance(frame.index, pd.CategoricalIndex):
+        frame.index = frame.index.astype(object)
+    elif isinstance(frame.index, pd.MultiIndex):
+        frame.index = frame.index.set_levels(
+            [lvl.astype(object) if isinstance(lvl, pd.CategoricalIndex) else lvl for lvl in frame.index.levels]
+        )
+    return frame
+
+
+def rollup(cube, dims, enviados=False, categorias=None) -> pd.DataFrame:
+    """Sumas de las medidas agrupadas por dims (NaN en dims se descarta, igual que groupby)."""
+    dims = list(np.atleast_1d(dims))
+    sub = select(cube, enviados, categorias, cols=list(dict.fromkeys(dims + ["TIENE_GUIA", "CATEGORIA"] + MEDIDAS)))
+    return _plain_index(sub.groupby(dims, observed=True)[MEDIDAS].sum())
+
+
+def category_counts(cube, dims, index, enviados=False, medida="filas") -> pd.DataFrame:
+    """Conteo por CATEGORIA (columnas) alineado a index; categorías ausentes = 0."""
+    keys = list(dict.fromkeys([*np.atleast_1d(dims), "CATEGORIA"]))
+    sub = select(cube, enviados, cols=list(dict.fromkeys(keys + ["TIENE_GUIA", medida])))
+    counts = sub.groupby(keys, observed=True)[medida].sum()
+    wide = counts.unstack("CATEGORIA", fill_value=0)
+    wide.columns = wide.columns.astype(object)
+    return _plain_index(wide).reindex(index, fill_value=0)
+
+
+def count_of(counts: pd.DataFrame, categoria: str) -> pd.Series:
+    """Columna de conteo de una categoría, o ceros si no aparece."""
+    if categoria in counts.columns:
+        return counts[categoria].astype(np.int64)
+    return pd.Series(0, index=counts.index, dtype=np.int64)
+
+
+def merge_cubes(base, add=None, remove=None) -> pd.DataFrame:
+    """Actualiza un cubo sumando las filas de add y restando las de remove.
+
+    Las medidas son aditivas, así que reemplazar un conjunto de órdenes solo
+    requiere el cubo de las órdenes viejas y el de las nuevas (tamaño del delta).
+    """
+    parts = [base]
+    if add is not None and not add.empty:
+        parts.append(add)
+    if remove is not None and not remove.empty:
+        neg = remove.copy()
+        neg[MEDIDAS] = -neg[MEDIDAS]
+        parts.append(neg)
+    if len(parts) == 1:
+        return base
+
+    merged = pd.concat(parts, ignore_index=True).groupby(
+        DIMENSIONES, dropna=False, observed=True, sort=False
+    )[MEDIDAS].sum().reset_index()
+    return merged[merged["filas"] > 0].reset_index(drop=True)
@@ -0,0 +1,52 @@
+"""Índice de días transcurridos por orden, compartido por las vistas temporales.
+
+Los días entre una columna de fecha y la fecha de referencia (hoy) se
+calculan una sola vez por DataFrame, columna y fecha como un arreglo int32
+alineado con las filas. Resumen, Tiempos y Alertas leen el mismo arreglo en
+lugar de recalcular (hoy - fecha).dt.days sobre subconjuntos copiados.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from data_processing.frame_cache import per_frame
+
+# Valor para fechas nulas: nunca supera un umbral ni cae en un rango
+DIAS_NULO = np.iinfo(np.int32).min
+
+
+def fecha_referencia(hoy=None) -> pd.Timestamp:
+    """Fecha (sin hora) contra la que se cuentan los días; por defecto hoy."""
+    if hoy is None:
+        return pd.Timestamp(datetime.now().date())
+    return pd.Timestamp(hoy).normalize()
+
+
+def _build(df, col, hoy) -> np.ndarray:
+    fechas = df[col].to_numpy()
+    # Floor division: igual que Timedelta.days para diferencias con hora
+    with np.errstate(invalid="ignore"):  # NaT; se reemplaza abajo
+        dias = (np.datetime64(hoy) - fechas) // np.timedelta64(1, "D")
+    dias = np.where(np.isnat(fechas), DIAS_NULO, dias).astype(np.int32)
+    dias.flags.writeable = False
+    return dias
+
+
+def dias_hasta(df, col, hoy) -> np.ndarray:
+    """Días entre df[col] y hoy por fila (int32, DIAS_NULO si la fecha es nula)."""
+    return per_frame(df, ("dias", col, hoy), lambda d: _build(d, col, hoy))
+
+
+def contar_rangos(dias, rangos) -> np.ndarray:
+    """Cantidad de valores en cada rango (min, max, etiqueta) inclusivo.
+
+    Los rangos deben venir ordenados y sin solaparse (como en config). Un
+    solo searchsorted ubica cada valor y bincount cuenta por rango.
+    """
+    mins = np.array([r[0] for r in rangos])
+    maxs = np.array([r[1] for r in rangos])
+    idx = np.searchsorted(mins, dias, side="right") - 1
+    dentro = idx >= 0
+    dentro[dentro] = dias[dentro] <= maxs[idx[dentro]]
+    return np.bincount(idx[dentro], minlength=len(rangos))
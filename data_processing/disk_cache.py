@@ -0,0 +1,125 @@
+"""Cache persistente en disco (Parquet) de datasets limpios y clasificados.
+
+Sobrevive reinicios y redeploys: si se vuelve a subir la misma exportación,
+el DataFrame se lee del Parquet en lugar de parsear el Excel otra vez.
+Cada entrada es un archivo <clave>.parquet dentro de config.CACHE_DIR; el
+mtime se usa como marca de último acceso para la expulsión LRU por tamaño.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+from config import CACHE_DIR, CACHE_MAX_MB
+
+_SUBDIR = "datasets"
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+def _dir() -> Path:
+    path = Path(CACHE_DIR) / _SUBDIR
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _path(key: str) -> Path:
+    return _dir() / f"{key}.parquet"
+
+
+def parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte a texto las columnas object con tipos mezclados (p.ej. int y str).
+
+    pyarrow no puede escribir columnas heterogéneas. loader.clean_data ya
+    normaliza estas columnas (ver loader.uniform_text); esto queda como
+    resguardo para frames que no pasan por ahí.
+    """
+    mixed = [
+        c for c in df.columns
+        if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    return df.assign(**{c: df[c].where(df[c].isna(), df[c].astype(str)) for c in mixed})
+
+
+def load(key: str) -> pd.DataFrame | None:
+    """DataFrame cacheado para key, o None si no existe."""
+    path = _path(key)
+    try:
+        df = pd.read_parquet(path)
+    except (FileNotFoundError, OSError, ValueError):
+        with _lock:
+            _stats["misses"] += 1
+        return None
+
+    # Marca de acceso para LRU
+    os.utime(path, None)
+    with _lock:
+        _stats["hits"] += 1
+    return df
+
+
+def save(key: str, df: pd.DataFrame) -> None:
+    """Guarda df bajo key (escritura atómica) y aplica la expulsión LRU."""
+    path = _path(key)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        parquet_safe(df).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    with _lock:
+        _stats["writes"] += 1
+    evict()
+
+
+def _entries() -> list:
+    """(ruta, tamaño, último acceso) de cada entrada, de más antigua a más reciente."""
+    entries = []
+    for p in _dir().glob("*.parquet"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((p, st.st_size, st.st_mtime))
+    return sorted(entries, key=lambda e: e[2])
+
+
+def evict(max_bytes: int | None = None) -> int:
+    """Borra las entradas menos usadas hasta quedar bajo max_bytes. Retorna cuántas borró."""
+    if max_bytes is None:
+        max_bytes = CACHE_MAX_MB * 1024 * 1024
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    with _lock:
+        _stats["evictions"] += removed
+    return removed
+
+
+def clear() -> None:
+    """Vacía el cache en disco."""
+    for path, _, _ in _entries():
+        path.unlink(missing_ok=True)
+
+
+def stats() -> dict:
+    """Estadísticas del cache: entradas, tamaño y contadores del proceso."""
+    entries = _entries()
+    with _lock:
+        counters = dict(_stats)
+    return {
+        "entradas": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "max_bytes": CACHE_MAX_MB * 1024 * 1024,
+        **counters,
+    }
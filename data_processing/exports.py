@@ -0,0 +1,141 @@
+"""Exportación de tablas a CSV, XLSX y Parquet.
+
+Los archivos se generan solo cuando alguien los pide (ver
+visualizations.downloads) y se serializan por bloques de filas para no
+armar el texto completo de la tabla de una vez. El resultado queda en un
+LRU en memoria, acotado por tamaño, bajo una clave que identifica el
+dataset, la tabla y los filtros que la produjeron: un segundo clic sobre
+la misma descarga no vuelve a serializar.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from config import EXPORT_CACHE_MB, EXPORT_CHUNK_FILAS
+from data_processing.disk_cache import parquet_safe
+
+# Límite de filas de una hoja de Excel (incluye el encabezado)
+MAX_FILAS_HOJA = 1_048_576 - 1
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _bloques(df: pd.DataFrame, filas: int):
+    for inicio in range(0, max(len(df), 1), filas):
+        yield inicio, df.iloc[inicio:inicio + filas]
+
+
+def iter_csv(df: pd.DataFrame, filas: int = EXPORT_CHUNK_FILAS):
+    """Bytes UTF-8 del CSV de df, un bloque de filas a la vez."""
+    for inicio, bloque in _bloques(df, filas):
+        yield bloque.to_csv(index=False, header=inicio == 0).encode("utf-8")
+
+
+def to_csv_bytes(df: pd.DataFrame, filas: int = EXPORT_CHUNK_FILAS) -> bytes:
+    """CSV de df (mismo contenido que to_csv(index=False)) armado por bloques."""
+    buffer = io.BytesIO()
+    for parte in iter_csv(df, filas):
+        buffer.write(parte)
+    return buffer.getvalue()
+
+
+def _valores(bloque: pd.DataFrame):
+    """Filas de bloque como tuplas de tipos Python; nulos como celdas vacías."""
+    return bloque.astype(object).where(bloque.notna(), None).itertuples(index=False, name=None)
+
+
+def to_xlsx_bytes(df: pd.DataFrame, filas: int = EXPORT_CHUNK_FILAS) -> bytes:
+    """Libro XLSX de df escrito en modo streaming (write_only de openpyxl).
+
+    Si df supera el límite de filas de Excel se reparte en varias hojas.
+    """
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    encabezado = [str(c) for c in df.columns]
+    hoja = None
+    for inicio, bloque in _bloques(df, min(filas, MAX_FILAS_HOJA)):
+        if inicio % MAX_FILAS_HOJA == 0:
+            hoja = libro.create_sheet(f"Hoja{inicio // MAX_FILAS_HOJA + 1}")
+            hoja.append(encabezado)
+        for fila in _valores(bloque):
+            hoja.append(fila)
+
+    buffer = io.BytesIO()
+    libro.save(buffer)
+    return buffer.getvalue()
+
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Parquet de df (sin índice)."""
+    buffer = io.BytesIO()
+    parquet_safe(df).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+# formato → (nombre visible, mime, extensión, serializador)
+FORMATOS = {
+    "csv": ("CSV", "text/csv", ".csv", to_csv_bytes),
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx", to_xlsx_bytes),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", ".parquet", to_parquet_bytes),
+}
+
+
+def export(df: pd.DataFrame, formato: str, clave=None) -> bytes:
+    """Bytes de df en formato; si hay clave, se reutiliza el resultado cacheado."""
+    serializar = FORMATOS[formato][3]
+    if clave is None:
+        return serializar(df)
+
+    clave = (clave, formato)
+    with _lock:
+        data = _cache.get(clave)
+        if data is not None:
+            _cache.move_to_end(clave)
+            _stats["hits"] += 1
+            return data
+        _stats["misses"] += 1
+
+    data = serializar(df)
+    _store(clave, data)
+    return data
+
+
+def _store(clave, data: bytes) -> None:
+    global _bytes
+    limite = EXPORT_CACHE_MB * 1024 * 1024
+    if len(data) > limite:
+        return
+    with _lock:
+        if clave in _cache:
+            return
+        _cache[clave] = data
+        _bytes += len(data)
+        while _bytes > limite:
+            _, viejo = _cache.popitem(last=False)
+            _bytes -= len(viejo)
+            _stats["evictions"] += 1
+
+
+def clear() -> None:
+    """Vacía el cache de exportaciones."""
+    global _bytes
+    with _lock:
+        _cache.clear()
+        _bytes = 0
+
+
+def stats() -> dict:
+    """Estadísticas del cache de exportaciones: entradas, tamaño y contadores."""
+    with _lock:
+        return {
+            "entradas": len(_cache),
+            "bytes": _bytes,
+            "max_bytes": EXPORT_CACHE_MB * 1024 * 1024,
+            **_stats,
+        }
@@ -0,0 +1,43 @@
+"""Cache de estructuras derivadas ligadas a un DataFrame concreto.
+
+El DataFrame clasificado se trata como solo lectura (ver pipeline), así que
+cualquier índice o agregado calculado sobre él es válido mientras el objeto
+viva. La entrada se elimina automáticamente cuando el DataFrame se libera.
+"""
+
+import hashlib
+import weakref
+
+import pandas as pd
+
+_CACHE = {}
+
+
+def per_frame(df, name, builder):
+    """Devuelve builder(df) calculándolo una sola vez por objeto DataFrame."""
+    key = (id(df), name)
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0]() is df:
+        return hit[1]
+
+    value = builder(df)
+    _CACHE[key] = (weakref.ref(df, lambda _, k=key: _CACHE.pop(k, None)), value)
+    return value
+
+
+def seed(df, name, value):
+    """Registra un valor precalculado para df (p.ej. un cubo actualizado)."""
+    key = (id(df), name)
+    _CACHE[key] = (weakref.ref(df, lambda _, k=key: _CACHE.pop(k, None)), value)
+
+
+def fingerprint(df) -> str:
+    """Hash del contenido de df (columnas, tipos y valores), calculado una vez por objeto."""
+    return per_frame(df, "fingerprint", _hash)
+
+
+def _hash(df) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((df.shape, list(df.columns), [str(t) for t in df.dtypes])).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
@@ -0,0 +1,291 @@
+"""Ingesta incremental de exportaciones diarias de Dropi.
+
+Mantiene en disco un almacén de órdenes ya clasificadas, indexado por ID.
+Al subir una nueva exportación solo se clasifican las órdenes nuevas o las
+que cambiaron (ESTATUS, FECHA DE REPORTE, campos de novedad o TIENDA), y el
+cubo de agregados se actualiza restando las versiones viejas y sumando las
+nuevas.
+Una orden guardada solo se reemplaza si la exportación trae una FECHA DE
+REPORTE igual o más reciente (como multi.combine): subir un archivo viejo
+después de uno nuevo no devuelve órdenes a estatus anteriores.
+
+Cada fusión agrega una parte con el delta en vez de reescribir el
+histórico, así el costo en disco depende del tamaño del delta. Al leer, la
+versión de una orden en la parte más reciente gana sobre las anteriores.
+Cuando hay ALMACEN_MAX_PARTES partes se consolidan en una sola.
+
+Archivos en config.CACHE_DIR/store:
+- partes/<n>.ordenes.parquet: órdenes clasificadas del delta n
+- partes/<n>.huellas.parquet: ID, huella de los campos de cambio y FECHA
+  DE REPORTE de esas mismas filas
+- cubo.parquet: cubo de agregados (ver data_processing.cube)
+- meta.json: versión de configuración, id del almacén, generación (sube en
+  cada fusión con cambios) y partes vigentes
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from config import ALMACEN_MAX_PARTES, CACHE_DIR
+from data_processing.classifier import classify_dataframe
+from data_processing.cube import build_cube, merge_cubes
+from data_processing.disk_cache import parquet_safe
+from data_processing import frame_cache
+
+# Campos cuyo cambio obliga a reclasificar una orden. TIENDA no afecta la
+# clasificación, pero renombrar una tienda debe reemplazar sus órdenes
+CAMPOS_CAMBIO = [
+    "ESTATUS",
+    "FECHA DE REPORTE",
+    "FECHA GUIA GENERADA",
+    "NOVEDAD",
+    "FUE SOLUCIONADA LA NOVEDAD",
+    "FECHA DE NOVEDAD",
+    "TIENDA",
+]
+
+_lock = threading.RLock()
+_actual = None  # último almacén leído o escrito por este proceso
+
+
+def _store_dir() -> Path:
+    path = Path(CACHE_DIR) / "store"
+    (path / "partes").mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _huellas(df: pd.DataFrame) -> pd.DataFrame:
+    """ID, huella uint64 de los campos de cambio y FECHA DE REPORTE (ns, NaT = mínimo) por fila."""
+    cols = [c for c in CAMPOS_CAMBIO if c in df.columns]
+    text = df[cols].astype(str)
+    if "FECHA DE REPORTE" in df.columns:
+        fecha = df["FECHA DE REPORTE"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    else:
+        fecha = np.full(len(df), np.iinfo(np.int64).min)
+    return pd.DataFrame({
+        "ID": df["ID"].to_numpy(),
+        "HUELLA": pd.util.hash_pandas_object(text, index=False).to_numpy(),
+        "FECHA": fecha,
+    })
+
+
+def _concat(frames: list) -> pd.DataFrame:
+    """concat que une las columnas category con union_categoricals.
+
+    pd.concat de categóricas con categorías distintas cae a object y
+    obligaba a recompactar todo el histórico; así solo se extienden las
+    categorías con las del delta.
+    """
+    frames = [f for f in frames if len(f)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    columnas = list(dict.fromkeys(c for f in frames for c in f.columns))
+    categoricas = [
+        c for c in columnas if any(c in f.columns and isinstance(f[c].dtype, pd.CategoricalDtype) for f in frames)
+    ]
+    # Columna nueva (p.ej. TIENDA en un histórico anterior a ella): nula en los frames que no la tienen
+    frames = [
+        f.assign(**{c: pd.Categorical([None] * len(f)) for c in categoricas if c not in f.columns})
+        for f in frames
+    ]
+    unidas = {}
+    for c in categoricas:
+        partes = [f[c] if isinstance(f[c].dtype, pd.CategoricalDtype) else f[c].astype("category") for f in frames]
+        try:
+            unidas[c] = union_categoricals(partes)
+        except TypeError:
+            # Categorías de tipos distintos (p.ej. object vs str): se unen como texto
+            unidas[c] = union_categoricals([p.cat.rename_categories(p.cat.categories.astype(object)) for p in partes])
+    df = pd.concat([f.drop(columns=categoricas) for f in frames], ignore_index=True)
+    for c in categoricas:
+        df[c] = unidas[c]
+    return df[columnas]
+
+
+# ============================================================
+# ALMACÉN EN DISCO
+# ============================================================
+
+def _leer_meta(path: Path) -> dict | None:
+    try:
+        return json.loads((path / "meta.json").read_text())
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def _escribir_meta(path: Path, meta: dict) -> None:
+    tmp = path / f".meta.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, path / "meta.json")
+
+
+def store_state(version: str):
+    """(id, generación) del almacén, o None si no existe o es de otra versión.
+
+    Cambia cada vez que una fusión modifica el almacén (en cualquier sesión).
+    """
+    meta = _leer_meta(_store_dir())
+    if meta is None or meta.get("version") != version or "partes" not in meta:
+        return None
+    return meta["id"], meta["generacion"]
+
+
+def _registrar(almacen: dict) -> dict:
+    """Deja el almacén como el actual del proceso y siembra huella y cubo de sus órdenes."""
+    global _actual
+    ordenes = almacen["ordenes"]
+    if "TIENDA" in ordenes.columns and isinstance(ordenes["TIENDA"].dtype, pd.CategoricalDtype):
+        # Tiendas renombradas o reemplazadas no quedan como opción vacía del filtro
+        ordenes["TIENDA"] = ordenes["TIENDA"].cat.remove_unused_categories()
+    _actual = almacen
+    frame_cache.seed(almacen["ordenes"], "fingerprint", f"almacen-{almacen['id']}-{almacen['generacion']}")
+    frame_cache.seed(almacen["ordenes"], "cube", almacen["cubo"])
+    return almacen
+
+
+def load_store(version: str) -> dict | None:
+    """Almacén vigente {"ordenes", "huellas", "cubo", "id", "generacion"}, o None.
+
+    Mientras la generación no cambie se devuelven los mismos objetos (no se
+    relee el disco en cada rerun).
+    """
+    with _lock:
+        path = _store_dir()
+        meta = _leer_meta(path)
+        if meta is None or meta.get("version") != version or "partes" not in meta:
+            return None
+        if _actual is not None and (_actual["id"], _actual["generacion"]) == (meta["id"], meta["generacion"]):
+            return _actual
+        try:
+            ordenes = _concat([pd.read_parquet(path / "partes" / f"{n}.ordenes.parquet") for n in meta["partes"]])
+            huellas = pd.concat(
+                [pd.read_parquet(path / "partes" / f"{n}.huellas.parquet") for n in meta["partes"]],
+                ignore_index=True,
+            )
+            cubo = pd.read_parquet(path / "cubo.parquet")
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+        # La versión de cada ID en la parte más reciente reemplaza a las anteriores
+        vigente = ~huellas["ID"].duplicated(keep="last").to_numpy()
+        if not vigente.all():
+            ordenes = ordenes[vigente].reset_index(drop=True)
+            huellas = huellas[vigente].reset_index(drop=True)
+        return _registrar({
+            "ordenes": ordenes, "huellas": huellas, "cubo": cubo,
+            "id": meta["id"], "generacion": meta["generacion"], "meta": meta,
+        })
+
+
+def _escribir_parte(path: Path, n: int, ordenes: pd.DataFrame, huellas: pd.DataFrame) -> None:
+    parquet_safe(ordenes).to_parquet(path / "partes" / f"{n}.ordenes.parquet", index=False)
+    huellas.to_parquet(path / "partes" / f"{n}.huellas.parquet", index=False)
+
+
+def _guardar(version: str, anterior: dict | None, delta, delta_huellas, ordenes, huellas, cubo) -> dict:
+    """Agrega el delta como parte nueva (o consolida) y confirma con meta.json."""
+    path = _store_dir()
+    meta = dict(anterior["meta"]) if anterior else {
+        "version": version, "id": uuid.uuid4().hex, "generacion": 0, "partes": [], "siguiente": 0,
+    }
+    n = meta["siguiente"]
+    viejas = []
+    if len(meta["partes"]) + 1 > ALMACEN_MAX_PARTES:
+        # Consolidación: una sola parte con el histórico vigente
+        _escribir_parte(path, n, ordenes, huellas)
+        viejas, partes = meta["partes"], [n]
+    else:
+        _escribir_parte(path, n, delta, delta_huellas)
+        partes = meta["partes"] + [n]
+    parquet_safe(cubo).to_parquet(path / "cubo.parquet", index=False)
+    meta = {**meta, "generacion": meta["generacion"] + 1, "partes": partes, "siguiente": n + 1}
+    _escribir_meta(path, meta)
+    for v in viejas:
+        for tipo in ("ordenes", "huellas"):
+            (path / "partes" / f"{v}.{tipo}.parquet").unlink(missing_ok=True)
+    return _registrar({
+        "ordenes": ordenes, "huellas": huellas, "cubo": cubo,
+        "id": meta["id"], "generacion": meta["generacion"], "meta": meta,
+    })
+
+
+def clear_store() -> None:
+    """Borra el histórico acumulado."""
+    global _actual
+    with _lock:
+        _actual = None
+        path = _store_dir()
+        for f in [*path.iterdir(), *(path / "partes").iterdir()]:
+            if f.is_file():
+                f.unlink()
+
+
+# ============================================================
+# FUSIÓN
+# ============================================================
+
+def merge_export(new_clean: pd.DataFrame, version: str):
+    """Fusiona una exportación limpia (salida de clean_data) con el almacén.
+
+    Retorna (DataFrame clasificado completo, resumen). El cubo actualizado y
+    la huella del almacén quedan registrados para el DataFrame devuelto, así
+    el analyzer no los recalcula desde cero.
+    """
+    sin_id = int(new_clean["ID"].isna().sum())
+    new_clean = new_clean[new_clean["ID"].notna()].drop_duplicates("ID", keep="last")
+    new_huellas = _huellas(new_clean)
+
+    with _lock:
+        almacen = load_store(version)
+        if almacen is None:
+            clear_store()
+            ordenes = classify_dataframe(new_clean).reset_index(drop=True)
+            almacen = _guardar(version, None, ordenes, new_huellas, ordenes, new_huellas, build_cube(ordenes))
+            return almacen["ordenes"], {
+                "nuevas": len(ordenes), "cambiadas": 0, "sin_cambio": 0, "antiguas": 0,
+                "total": len(ordenes), "sin_id": sin_id,
+            }
+
+        ordenes, huellas, cubo = almacen["ordenes"], almacen["huellas"], almacen["cubo"]
+
+        # huellas está alineado fila a fila con ordenes: pos sirve para ambos
+        pos = pd.Index(huellas["ID"]).get_indexer(new_huellas["ID"])
+        es_nueva = pos < 0
+        fila = np.where(es_nueva, 0, pos)
+        if len(huellas):
+            distinta = es_nueva | (huellas["HUELLA"].to_numpy()[fila] != new_huellas["HUELLA"].to_numpy())
+            antigua = ~es_nueva & distinta & (new_huellas["FECHA"].to_numpy() < huellas["FECHA"].to_numpy()[fila])
+        else:
+            distinta, antigua = es_nueva, np.zeros(len(pos), dtype=bool)
+        cambio = distinta & ~antigua
+
+        n_nuevas = int(es_nueva.sum())
+        resumen = {
+            "nuevas": n_nuevas,
+            "cambiadas": int(cambio.sum()) - n_nuevas,
+            "sin_cambio": int((~distinta).sum()),
+            "antiguas": int(antigua.sum()),
+            "sin_id": sin_id,
+        }
+        if not cambio.any():
+            return ordenes, {**resumen, "total": len(ordenes)}
+
+        delta = classify_dataframe(new_clean[cambio]).reset_index(drop=True)
+        delta_huellas = new_huellas[cambio].reset_index(drop=True)
+        reemplazar = np.zeros(len(ordenes), dtype=bool)
+        reemplazar[pos[cambio & ~es_nueva]] = True
+        viejas = ordenes[reemplazar]
+
+        # Cubo: restar versiones viejas y sumar las nuevas (costo ∝ delta)
+        cubo = merge_cubes(cubo, add=build_cube(delta), remove=build_cube(viejas) if len(viejas) else None)
+
+        ordenes = _concat([ordenes[~reemplazar], delta])
+        huellas = pd.concat([huellas[~reemplazar], delta_huellas], ignore_index=True)
+        almacen = _guardar(version, almacen, delta, delta_huellas, ordenes, huellas, cubo)
+        return almacen["ordenes"], {**resumen, "total": len(ordenes)}
@@ -3,13 +3,17 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-from config import COLUMNAS_MONETARIAS
+from config import COLUMNAS_MONETARIAS, COLUMNAS_CATEGORICAS
+from data_processing.readers import read_orders, read_xlsx, wanted_column
+from profiling import instrumentado
+
+# Columnas enteras que se reducen a int32 cuando el rango lo permite
+COLUMNAS_ENTERAS = COLUMNAS_MONETARIAS + ["CANTIDAD", "UTILIDAD"]
 
 
 def load_excel(file) -> pd.DataFrame:
-    """Lee el archivo Excel y retorna un DataFrame."""
-    df = pd.read_excel(file, engine="openpyxl")
-    return df
+    """Lee el archivo Excel (solo columnas usadas) y retorna un DataFrame."""
+    return read_xlsx(file)
 
 
 def _parse_date(series: pd.Series) -> pd.Series:
@@ -27,9 +31,84 @@ def _find_column(df: pd.DataFrame, *patterns: str):
     return None
 
 
+def _normalized_category(series: pd.Series) -> pd.Series:
+    """astype(str).strip().upper() calculado sobre los valores únicos, como category."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    norm = pd.Series(uniques, dtype=object).astype(str).str.strip().str.upper()
+    categories = pd.Index(norm.dropna().unique()).sort_values()
+    final = categories.get_indexer(norm)[codes] if len(codes) else codes
+    return pd.Series(pd.Categorical.from_codes(final, categories=categories), index=series.index)
+
+
+def downcast_int(series: pd.Series) -> pd.Series:
+    """int64 → int32 si todos los valores caben; si no, se deja igual."""
+    if len(series) and pd.api.types.is_integer_dtype(series):
+        info = np.iinfo(np.int32)
+        if series.min() >= info.min and series.max() <= info.max:
+            return series.astype(np.int32)
+    return series
+
+
+def uniform_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte a texto las columnas object con tipos mezclados (p.ej. int y str).
+
+    El Excel de Dropi a veces mezcla números y texto en columnas como
+    TELÉFONO o ID. Se normalizan al limpiar, antes del cache en disco, para
+    que un frame recién cargado y uno leído del Parquet sean idénticos.
+    """
+    mixed = [
+        c for c in df.columns
+        if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith("mixed")
+    ]
+    for c in mixed:
+        df[c] = df[c].where(df[c].isna(), df[c].astype(str)).infer_objects()
+    return df
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica el esquema compacto: texto repetitivo como category y enteros en int32."""
+    for col in COLUMNAS_CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in COLUMNAS_ENTERAS:
+        if col in df.columns:
+            df[col] = downcast_int(df[col])
+    if "TIENE_GUIA" in df.columns:
+        df["TIENE_GUIA"] = df["TIENE_GUIA"].astype(bool)
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Bytes por columna antes y después de limpiar (columnas eliminadas = 0)."""
+    antes = before.memory_usage(deep=True, index=False)
+    despues = after.memory_usage(deep=True, index=False)
+    cols = list(dict.fromkeys(list(antes.index) + list(despues.index)))
+    report = pd.DataFrame({
+        "Columna": cols,
+        "Tipo Antes": [str(before[c].dtype) if c in before.columns else "" for c in cols],
+        "Tipo Después": [str(after[c].dtype) if c in after.columns else "eliminada" for c in cols],
+        "Bytes Antes": antes.reindex(cols, fill_value=0).to_numpy(),
+        "Bytes Después": despues.reindex(cols, fill_value=0).to_numpy(),
+    })
+    total = pd.DataFrame([{
+        "Columna": "TOTAL", "Tipo Antes": "", "Tipo Después": "",
+        "Bytes Antes": int(report["Bytes Antes"].sum()),
+        "Bytes Después": int(report["Bytes Después"].sum()),
+    }])
+    return pd.concat([report, total], ignore_index=True)
+
+
+@instrumentado
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Limpia y estandariza el DataFrame de órdenes."""
-    df = df.copy()
+    """Limpia y estandariza el DataFrame de órdenes.
+
+    Devuelve un esquema compacto: solo las columnas que usa el dashboard,
+    dimensiones de texto como category, montos en int32 cuando caben.
+    """
+    # Selección de columnas sin copiar datos: cada paso reemplaza columnas
+    # completas, así que el frame de entrada nunca se modifica
+    df = df.copy(deep=False)
+    df = df.drop(columns=[c for c in df.columns if not wanted_column(c)])
 
     # Parsear fechas por nombre exacto o búsqueda parcial
     date_columns = {
@@ -53,20 +132,12 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     for col in COLUMNAS_MONETARIAS:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-            df[col] = np.floor(df[col]).astype(int)
+            df[col] = np.floor(df[col]).astype(np.int64)
 
-    # Normalizar ESTATUS a mayúsculas y strip
-    if "ESTATUS" in df.columns:
-        df["ESTATUS"] = df["ESTATUS"].astype(str).str.strip().str.upper()
-
-    # Normalizar CIUDAD DESTINO
-    if "CIUDAD DESTINO" in df.columns:
-        df["CIUDAD DESTINO"] = (
-            df["CIUDAD DESTINO"]
-            .astype(str)
-            .str.strip()
-            .str.upper()
-        )
+    # Normalizar ESTATUS y CIUDAD DESTINO a mayúsculas y strip
+    for col in ["ESTATUS", "CIUDAD DESTINO"]:
+        if col in df.columns:
+            df[col] = _normalized_category(df[col])
 
     # Asegurar CANTIDAD es numérica
     if "CANTIDAD" in df.columns:
@@ -75,13 +146,14 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     # Flag: tiene guía generada
     df["TIENE_GUIA"] = df["FECHA GUIA GENERADA"].notna()
 
-    return df
+    return compact_dtypes(uniform_text(df))
 
 
 @st.cache_data(show_spinner="Cargando y procesando datos...")
+@instrumentado
 def load_and_clean(file_content: bytes, file_name: str) -> pd.DataFrame:
-    """Carga y limpia el Excel con cache basado en contenido del archivo."""
+    """Carga y limpia el archivo (.xlsx, .csv o .parquet) con cache basado en contenido."""
     import io
-    df = load_excel(io.BytesIO(file_content))
+    df = read_orders(io.BytesIO(file_content), file_name)
     df = clean_data(df)
     return df
@@ -0,0 +1,50 @@
+"""Reglas manuales: estatus → categoría fijadas por el usuario.
+
+Se guardan en config.REGLAS_MANUALES y se aplican en cada carga junto con
+los veredictos de IA (ver classifier.apply_overrides). A diferencia de la
+IA, una regla manual vale para todas las órdenes del estatus, aunque las
+reglas deterministas ya lo hayan clasificado.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import REGLAS_MANUALES
+from data_processing.ai_classifier import normalize_status
+
+_lock = threading.Lock()
+
+
+def load_rules() -> dict:
+    """{estatus normalizado: categoria} guardados."""
+    try:
+        return json.loads(Path(REGLAS_MANUALES).read_text(encoding="utf-8"))
+    except (FileNotFoundError, OSError, ValueError):
+        return {}
+
+
+def _guardar(reglas: dict) -> None:
+    path = Path(REGLAS_MANUALES)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(reglas, indent=1, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def set_rule(estatus: str, categoria: str) -> None:
+    """Fija la categoría de un estatus (reemplaza una regla anterior)."""
+    with _lock:
+        reglas = load_rules()
+        reglas[normalize_status(estatus)] = categoria
+        _guardar(reglas)
+
+
+def remove_rules(estatus: list) -> None:
+    """Borra las reglas de los estatus dados."""
+    with _lock:
+        reglas = load_rules()
+        for e in estatus:
+            reglas.pop(normalize_status(e), None)
+        _guardar(reglas)
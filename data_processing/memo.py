@@ -0,0 +1,153 @@
+"""Memoización de resultados del analyzer por dataset y argumentos.
+
+Cada get_* decorado con @memoizado guarda su resultado bajo la clave
+(función, huella del dataset, argumentos normalizados). La huella sale de
+frame_cache.fingerprint: el pipeline la siembra con la clave de contenido
+del dataset (archivo + config + mapeo IA), así que en la app no hay que
+hashear el DataFrame. Un argumento `hoy` se reemplaza por la fecha de
+referencia efectiva: las métricas que dependen del día no se reutilizan
+al cambiar la fecha.
+
+El cache es un LRU acotado por tamaño estimado (config.ANALYZER_CACHE_MB)
+con contadores de aciertos y fallos por función. Los resultados se
+entregan como copias superficiales: asignar una columna en la página no
+altera lo cacheado (con copy-on-write la copia no duplica datos).
+"""
+
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from config import ANALYZER_CACHE_MB
+from data_processing.day_index import fecha_referencia
+from data_processing.frame_cache import fingerprint
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # clave → (resultado, bytes)
+_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_por_funcion = {}  # nombre → {"hits", "misses"}
+
+
+def _hashable(valor):
+    """Versión hasheable de un argumento (listas, dicts, arrays → tuplas)."""
+    if isinstance(valor, (list, tuple, pd.Index, np.ndarray, pd.Series)):
+        return tuple(_hashable(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in valor.items()))
+    if isinstance(valor, (set, frozenset)):
+        return frozenset(_hashable(v) for v in valor)
+    return valor
+
+
+def _tamano(valor) -> int:
+    """Bytes aproximados de un resultado (DataFrames sin contar texto en profundidad)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True))
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_tamano(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(_tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def _copia(valor):
+    """Copia superficial: protege el resultado cacheado de asignaciones en la página."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy(deep=False)
+    if isinstance(valor, dict):
+        return {k: _copia(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_copia(v) for v in valor]
+    return valor
+
+
+def _contar(nombre: str, evento: str) -> None:
+    _stats[evento] += 1
+    _por_funcion.setdefault(nombre, {"hits": 0, "misses": 0})[evento] += 1
+
+
+def _guardar(clave, valor) -> None:
+    global _bytes
+    limite = ANALYZER_CACHE_MB * 1024 * 1024
+    tamano = _tamano(valor)
+    if tamano > limite:
+        return
+    with _lock:
+        if clave in _cache:
+            return
+        _cache[clave] = (valor, tamano)
+        _bytes += tamano
+        while _bytes > limite:
+            _, (_, viejo) = _cache.popitem(last=False)
+            _bytes -= viejo
+            _stats["evictions"] += 1
+
+
+def memoizado(fn):
+    """Decorador para funciones fn(df, ...) del analyzer."""
+    firma = inspect.signature(fn)
+    nombre = fn.__name__
+    usa_fecha = "hoy" in firma.parameters
+
+    def clave(df, *args, **kwargs):
+        """(clave del cache, argumentos con defaults y fecha resuelta)."""
+        bound = firma.bind(df, *args, **kwargs)
+        bound.apply_defaults()
+        argumentos = dict(bound.arguments)
+        del argumentos[next(iter(firma.parameters))]
+        if usa_fecha:
+            argumentos["hoy"] = fecha_referencia(argumentos["hoy"])
+        return (nombre, fingerprint(df), _hashable(argumentos)), argumentos
+
+    @functools.wraps(fn)
+    def wrapper(df, *args, **kwargs):
+        k, argumentos = clave(df, *args, **kwargs)
+        with _lock:
+            hit = _cache.get(k)
+            if hit is not None:
+                _cache.move_to_end(k)
+                _contar(nombre, "hits")
+                return _copia(hit[0])
+            _contar(nombre, "misses")
+
+        # La fecha ya resuelta se pasa explícita: clave y cálculo usan el mismo día
+        valor = fn(df, **argumentos)
+        _guardar(k, valor)
+        return _copia(valor)
+
+    # functools.wraps copia el atributo a los decoradores de afuera (@instrumentado)
+    wrapper.memo_clave = clave
+    return wrapper
+
+
+def seed(fn, df, valor, *args, **kwargs) -> None:
+    """Registra un resultado precalculado de fn(df, *args, **kwargs) (p.ej. de un reporte)."""
+    k, _ = fn.memo_clave(df, *args, **kwargs)
+    _guardar(k, valor)
+
+
+def clear() -> None:
+    """Vacía el cache de resultados (los contadores se mantienen)."""
+    global _bytes
+    with _lock:
+        _cache.clear()
+        _bytes = 0
+
+
+def stats() -> dict:
+    """Entradas, tamaño, aciertos, fallos y expulsiones, total y por función."""
+    with _lock:
+        return {
+            "entradas": len(_cache),
+            "bytes": _bytes,
+            "max_bytes": ANALYZER_CACHE_MB * 1024 * 1024,
+            **_stats,
+            "por_funcion": {k: dict(v) for k, v in _por_funcion.items()},
+        }
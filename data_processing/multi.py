@@ -0,0 +1,114 @@
+"""Carga de varias exportaciones a la vez (varias tiendas o archivos mensuales).
+
+Cada archivo se lee y limpia en un proceso aparte (read_orders + clean_data
+dominan el tiempo de carga), así que N archivos tardan cerca de lo que
+tarda el más grande. Luego se unen, cada fila queda etiquetada con su
+ARCHIVO de origen y, si un ID aparece en varios archivos, se conserva la
+versión con la FECHA DE REPORTE más reciente (a igual fecha, la del archivo
+subido después). La TIENDA de cada archivo se asigna aparte (with_stores):
+renombrar una tienda no obliga a volver a leer los archivos.
+"""
+
+import io
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from config import MAX_PROCESOS_CARGA
+from data_processing.loader import clean_data, compact_dtypes
+from data_processing.readers import read_orders
+from profiling import instrumentado
+
+_executor = None
+
+# Fechas y periodos que suelen ir en el nombre de una exportación mensual
+_PERIODO = re.compile(
+    r"\d{4}[-_.]?\d{1,2}(?:[-_.]?\d{1,2})?|\d{1,2}[-_.]\d{1,2}[-_.]\d{2,4}|"
+    r"enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre",
+    re.IGNORECASE,
+)
+
+
+def parse_export(file_content: bytes, file_name: str) -> pd.DataFrame:
+    """read_orders + clean_data de un archivo (se ejecuta en los procesos del pool)."""
+    return clean_data(read_orders(io.BytesIO(file_content), file_name))
+
+
+def _pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido. spawn: no se hace fork del servidor con sus hilos."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=MAX_PROCESOS_CARGA, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+@instrumentado
+def parse_many(archivos: list) -> list:
+    """Limpia cada (contenido, nombre) en paralelo; mismo orden que archivos."""
+    # Con un archivo o un solo proceso el pool solo agrega el costo de serializar
+    if len(archivos) == 1 or MAX_PROCESOS_CARGA <= 1:
+        return [parse_export(*archivo) for archivo in archivos]
+    futuros = [_pool().submit(parse_export, contenido, nombre) for contenido, nombre in archivos]
+    return [f.result() for f in futuros]
+
+
+def unique_names(nombres: list) -> list:
+    """Nombres de archivo sin repetir (el segundo 'ordenes.xlsx' pasa a 'ordenes.xlsx (2)')."""
+    vistos = {}
+    unicos = []
+    for nombre in nombres:
+        vistos[nombre] = vistos.get(nombre, 0) + 1
+        unicos.append(nombre if vistos[nombre] == 1 else f"{nombre} ({vistos[nombre]})")
+    return unicos
+
+
+@instrumentado
+def combine(frames: list, nombres: list) -> pd.DataFrame:
+    """Une las exportaciones limpias con su ARCHIVO y una sola fila por ID."""
+    df = pd.concat(frames, ignore_index=True)
+    origen = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+    df["ARCHIVO"] = pd.Categorical.from_codes(origen, categories=unique_names(nombres))
+
+    # Orden estable por fecha de reporte: entre duplicados gana el último
+    if "FECHA DE REPORTE" in df.columns:
+        orden = df["FECHA DE REPORTE"].sort_values(kind="stable", na_position="first").index
+    else:
+        orden = df.index
+    ids = df["ID"].reindex(orden)
+    conservar = ~ids.duplicated(keep="last") | ids.isna()
+    df = df.iloc[np.sort(orden[conservar.to_numpy()])].reset_index(drop=True)
+
+    # concat de categóricas con categorías distintas cae a object: se recompacta
+    return _sin_categorias_vacias(compact_dtypes(df))
+
+
+def _sin_categorias_vacias(df: pd.DataFrame) -> pd.DataFrame:
+    """Quita de las columnas category los valores que ya no aparecen (tras deduplicar o filtrar)."""
+    return df.assign(**{
+        c: df[c].cat.remove_unused_categories() for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)
+    })
+
+
+def store_name(file_name: str) -> str:
+    """Tienda sugerida para un archivo: el nombre sin extensión ni fechas/periodos."""
+    base = Path(file_name).stem
+    limpio = re.sub(r"[\s_\-.]+", " ", _PERIODO.sub(" ", base)).strip()
+    return (limpio or base).upper()
+
+
+def with_stores(df: pd.DataFrame, tiendas: dict) -> pd.DataFrame:
+    """df con la columna TIENDA según {archivo: tienda} (sin copiar el resto de columnas)."""
+    archivo = df["ARCHIVO"].cat
+    nombres = np.asarray([tiendas.get(a, a) for a in archivo.categories], dtype=object)
+    tienda = pd.Series(nombres[archivo.codes], index=df.index).astype("category")
+    return df.assign(TIENDA=tienda)
+
+
+def filter_stores(df: pd.DataFrame, tiendas) -> pd.DataFrame:
+    """Solo las filas de las tiendas dadas, sin categorías vacías."""
+    return _sin_categorias_vacias(df[df["TIENDA"].isin(list(tiendas)).to_numpy()].reset_index(drop=True))
@@ -0,0 +1,279 @@
+"""Pipeline completo de carga + clasificación con cache por contenido."""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import config
+from data_processing import bundle, disk_cache, frame_cache
+from data_processing.incremental import load_store, merge_export, store_state
+from data_processing.multi import combine, filter_stores, parse_many, with_stores
+from data_processing.loader import load_and_clean
+from data_processing.classifier import classify_dataframe, apply_overrides
+
+
+def file_hash(file_content: bytes) -> str:
+    """Hash SHA-256 del contenido del archivo subido."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def config_key() -> str:
+    """Huella de la configuración que afecta la clasificación y la UTILIDAD."""
+    parts = [
+        config.ESTATUS_NUNCA_ENVIADO,
+        config.ESTATUS_PENDIENTE_ATASCADO,
+        config.ESTATUS_DEVOLUCION,
+        config.ESTATUS_ENTREGADO,
+        config.ESTATUS_EN_PROCESO,
+        config.UMBRAL_DIAS_GUIA_DEMORADA,
+        config.COLUMNAS_MONETARIAS,
+    ]
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# Subir este número invalida el cache en disco cuando cambia la lógica del pipeline
+PIPELINE_VERSION = 3
+
+
+def mapping_key(overrides: dict | None) -> tuple:
+    """Convierte {"ia": {...}, "manual": {...}} (ver apply_overrides) en una clave hashable y estable.
+
+    Sin mapeos la clave es (), la misma con la que cli.py genera los reportes.
+    """
+    return tuple(
+        (nombre, tuple(sorted(mapeo.items()))) for nombre, mapeo in sorted((overrides or {}).items()) if mapeo
+    )
+
+
+def _apply_key(df: pd.DataFrame, overrides: tuple) -> pd.DataFrame:
+    return apply_overrides(df, **{nombre: dict(mapeo) for nombre, mapeo in overrides})
+
+
+@st.cache_resource(show_spinner="Clasificando órdenes...", max_entries=8)
+def _classified(file_key: str, cfg_key: str, overrides: tuple,
+                _file_content: bytes, file_name: str) -> pd.DataFrame:
+    """Carga, limpia y clasifica. La clave es (hash archivo, config, mapeos IA/manuales).
+
+    Se usa cache_resource para devolver siempre el mismo objeto: las páginas
+    lo tratan como solo lectura y así no se copia el DataFrame en cada rerun.
+    Debajo hay un cache Parquet en disco que sobrevive reinicios del servidor.
+    La clave de contenido se siembra como huella del DataFrame: los
+    resultados memoizados del analyzer (ver memo) no necesitan hashearlo.
+    """
+    key = dataset_key(file_key, cfg_key, overrides)
+    df = disk_cache.load(key)
+    if df is not None:
+        frame_cache.seed(df, "fingerprint", key)
+        return df
+
+    df = load_and_clean(_file_content, file_name)
+    df = classify_dataframe(df)
+    if overrides:
+        df = _apply_key(df, overrides)
+
+    try:
+        disk_cache.save(key, df)
+    except Exception as e:
+        st.warning(f"No se pudo guardar el cache en disco: {e}")
+    frame_cache.seed(df, "fingerprint", key)
+    return df
+
+
+def dataset_key(file_key: str, cfg_key: str, overrides: tuple) -> str:
+    """Clave de contenido del dataset procesado (archivo + config + mapeos + versión)."""
+    extra = hashlib.sha256(repr((overrides, PIPELINE_VERSION)).encode("utf-8")).hexdigest()[:16]
+    return f"{file_key[:32]}-{cfg_key}-{extra}"
+
+
+def load_classified(file_content: bytes, file_name: str,
+                    file_key: str | None = None, overrides: dict | None = None) -> pd.DataFrame:
+    """DataFrame clasificado (con UTILIDAD) cacheado entre reruns.
+
+    file_key permite pasar un hash ya calculado para no re-hashear el archivo
+    en cada interacción.
+    """
+    if file_key is None:
+        file_key = file_hash(file_content)
+    return _classified(file_key, config_key(), mapping_key(overrides), file_content, file_name)
+
+
+def files_key(file_keys: list) -> str:
+    """Clave de un conjunto ordenado de archivos (el orden decide los empates al deduplicar)."""
+    return hashlib.sha256("\n".join(file_keys).encode("utf-8")).hexdigest()
+
+
+@st.cache_resource(show_spinner="Cargando exportaciones en paralelo...", max_entries=4)
+def _classified_many(key: str, cfg_key: str, overrides: tuple, _archivos: list) -> pd.DataFrame:
+    """Como _classified, para varios archivos leídos en paralelo y deduplicados por ID."""
+    clave = dataset_key(key, cfg_key, overrides)
+    df = disk_cache.load(clave)
+    if df is not None:
+        frame_cache.seed(df, "fingerprint", clave)
+        return df
+
+    df = combine(parse_many(_archivos), [nombre for _, nombre in _archivos])
+    df = classify_dataframe(df)
+    if overrides:
+        df = _apply_key(df, overrides)
+
+    try:
+        disk_cache.save(clave, df)
+    except Exception as e:
+        st.warning(f"No se pudo guardar el cache en disco: {e}")
+    frame_cache.seed(df, "fingerprint", clave)
+    return df
+
+
+def load_many(archivos: list, file_keys: list, overrides: dict | None = None) -> pd.DataFrame:
+    """DataFrame clasificado de varias exportaciones [(contenido, nombre)], con ARCHIVO.
+
+    file_keys son los hashes de cada archivo (ver file_hash), en el mismo orden.
+    """
+    return _classified_many(files_key(file_keys), config_key(), mapping_key(overrides), archivos)
+
+
+@st.cache_resource(max_entries=8)
+def _stores(key: str, tiendas: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    df = with_stores(_df, dict(tiendas))
+    frame_cache.seed(df, "fingerprint", f"{key}-{files_key([repr(tiendas)])[:16]}")
+    return df
+
+
+def load_stores(df: pd.DataFrame, tiendas: dict) -> pd.DataFrame:
+    """df con TIENDA según {archivo: tienda}; el mismo objeto mientras no cambien los nombres."""
+    return _stores(frame_cache.fingerprint(df), tuple(sorted(tiendas.items())), df)
+
+
+@st.cache_resource(max_entries=8)
+def _filtered(key: str, tiendas: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    df = filter_stores(_df, tiendas)
+    frame_cache.seed(df, "fingerprint", f"{key}-{files_key(list(tiendas))[:16]}")
+    return df
+
+
+def filter_by_store(df: pd.DataFrame, tiendas) -> pd.DataFrame:
+    """Solo las órdenes de las tiendas elegidas, cacheado por (dataset, tiendas).
+
+    Devolver siempre el mismo objeto mantiene los caches por DataFrame (cubo,
+    índices, métricas memoizadas) entre reruns.
+    """
+    return _filtered(frame_cache.fingerprint(df), tuple(sorted(tiendas)), df)
+
+
+def pipeline_version() -> str:
+    """Versión de configuración + lógica con la que se generan almacén y reportes."""
+    return f"{config_key()}-{PIPELINE_VERSION}"
+
+
+@st.cache_resource(show_spinner="Abriendo reporte precalculado...", max_entries=4)
+def _bundle(carpeta: str, generado: str, version: str):
+    return bundle.read_bundle(carpeta, version)
+
+
+def load_bundle(carpeta: str, generado: str, overrides: dict | None = None):
+    """Órdenes y kpis.json de un reporte de cli.py, o None si es de otra versión.
+
+    generado (de kpis.json) invalida el cache cuando el reporte se regenera.
+    Con mapeos IA/manuales las órdenes se reclasifican y las métricas se recalculan.
+    """
+    abierto = _bundle(carpeta, generado, pipeline_version())
+    clave = mapping_key(overrides)
+    if abierto is None or not clave:
+        return abierto
+    df, manifiesto = abierto
+    return _with_mapping(manifiesto["clave"], config_key(), clave, df), manifiesto
+
+
+@st.cache_resource
+def _fusiones() -> OrderedDict:
+    """(exportación, config) → (estado del almacén tras fusionarla, resumen); compartido entre sesiones."""
+    return OrderedDict()
+
+
+def _merged(clave: tuple, exportacion, mensaje: str):
+    """Fusiona la exportación con el almacén salvo que ya esté fusionada en su estado actual.
+
+    No se cachea el resultado de merge_export: el almacén en disco cambia con
+    cada fusión, así que se recuerda en qué generación quedó tras fusionar
+    esta exportación y solo se reutiliza mientras siga siendo esa. Volver a
+    elegir una exportación vieja la fusiona de nuevo; sus órdenes con FECHA DE
+    REPORTE anterior a la guardada se ignoran (ver incremental.merge_export).
+    """
+    version = pipeline_version()
+    fusiones = _fusiones()
+    previa = fusiones.get(clave)
+    if previa is not None and previa[0] == store_state(version):
+        almacen = load_store(version)
+        if almacen is not None and (almacen["id"], almacen["generacion"]) == previa[0]:
+            fusiones.move_to_end(clave, last=True)
+            return almacen["ordenes"], previa[1]
+    with st.spinner(mensaje):
+        df, resumen = merge_export(exportacion(), version=version)
+    fusiones[clave] = (store_state(version), resumen)
+    while len(fusiones) > 8:
+        fusiones.popitem(last=False)
+    return df, resumen
+
+
+@st.cache_resource(max_entries=4)
+def _with_mapping(key: str, cfg_key: str, overrides: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """_df (con huella key: reporte o generación del almacén) con los mapeos IA/manuales aplicados."""
+    df = _apply_key(_df, overrides)
+    # key puede ser más larga que lo que conserva dataset_key (p.ej. la generación del almacén)
+    frame_cache.seed(df, "fingerprint", dataset_key(files_key([key]), cfg_key, overrides))
+    return df
+
+
+def load_incremental_many(archivos: list, file_keys: list, tiendas: dict | None = None,
+                          overrides: dict | None = None):
+    """load_incremental para varias exportaciones [(contenido, nombre)] a la vez.
+
+    Se unen y deduplican (ver multi.combine), reciben su TIENDA según
+    {archivo: tienda} y se fusionan con el almacén como una sola.
+    """
+    cfg_key = config_key()
+    tiendas = tiendas or {}
+
+    def exportacion():
+        nuevas = combine(parse_many(archivos), [nombre for _, nombre in archivos])
+        return with_stores(nuevas, tiendas).drop(columns="ARCHIVO")
+
+    df, resumen = _merged(
+        (files_key(file_keys), cfg_key, tuple(sorted(tiendas.items()))),
+        exportacion,
+        "Fusionando exportaciones con el histórico...",
+    )
+    if clave := mapping_key(overrides):
+        df = _with_mapping(frame_cache.fingerprint(df), cfg_key, clave, df)
+    return df, resumen
+
+
+def load_incremental(file_content: bytes, file_name: str,
+                     file_key: str | None = None, tienda: str | None = None,
+                     overrides: dict | None = None):
+    """Histórico acumulado + esta exportación. Retorna (DataFrame, resumen del merge).
+
+    Solo las órdenes nuevas o con cambios se clasifican; el resto sale del
+    almacén en disco (ver data_processing.incremental). Con tienda, las
+    órdenes que agrega o cambia esta exportación quedan con esa TIENDA.
+    """
+    if file_key is None:
+        file_key = file_hash(file_content)
+    cfg_key = config_key()
+
+    def exportacion():
+        nuevas = load_and_clean(file_content, file_name)
+        if tienda is None:
+            return nuevas
+        return nuevas.assign(TIENDA=pd.Categorical(np.full(len(nuevas), tienda, dtype=object)))
+
+    df, resumen = _merged(
+        (file_key, cfg_key, tienda),
+        exportacion,
+        "Fusionando exportación con el histórico...",
+    )
+    if clave := mapping_key(overrides):
+        df = _with_mapping(frame_cache.fingerprint(df), cfg_key, clave, df)
+    return df, resumen
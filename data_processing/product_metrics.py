@@ -0,0 +1,82 @@
+"""Vectores de métricas por producto, indexados por nombre de producto.
+
+Una sola pasada sobre el cubo deja, por producto, las sumas que necesitan
+el buscador y la rentabilidad (enviados, entregados, devueltos, cancelados).
+Como todas son aditivas, las métricas combinadas de cualquier selección son
+la suma de las filas de los productos elegidos: el costo es O(seleccionados)
+en vez de filtrar el DataFrame o el cubo completo con isin.
+"""
+
+import numpy as np
+import pandas as pd
+from data_processing.cube import get_cube
+from data_processing.frame_cache import per_frame
+from profiling import instrumentado
+
+# Medidas por producto (todas sumas sobre el cubo)
+METRICAS = [
+    "filas",            # todas las órdenes
+    "total",            # TOTAL DE LA ORDEN de todas las órdenes
+    "env_filas",        # enviados (TIENE_GUIA)
+    "env_ids",
+    "env_flete",
+    "ent_filas",        # enviados y ENTREGADO
+    "ent_total",
+    "ent_flete",
+    "ent_costo",
+    "dev_filas",        # enviados y DEVOLUCION
+    "dev_flete",
+    "cancelados",       # NUNCA ENVIADO (con o sin guía)
+]
+
+
+@instrumentado
+def build_product_table(cube: pd.DataFrame) -> pd.DataFrame:
+    """Tabla producto → METRICAS (int64) con un único groupby sobre el cubo."""
+    env = cube["TIENE_GUIA"].to_numpy(dtype=bool)
+    ent = env & (cube["CATEGORIA"] == "ENTREGADO").to_numpy()
+    dev = env & (cube["CATEGORIA"] == "DEVOLUCION").to_numpy()
+    nunca = (cube["CATEGORIA"] == "NUNCA ENVIADO").to_numpy()
+
+    filas = cube["filas"].to_numpy()
+    total = cube["TOTAL DE LA ORDEN"].to_numpy()
+    flete = cube["PRECIO FLETE"].to_numpy()
+    work = pd.DataFrame({
+        "filas": filas,
+        "total": total,
+        "env_filas": np.where(env, filas, 0),
+        "env_ids": np.where(env, cube["ids"].to_numpy(), 0),
+        "env_flete": np.where(env, flete, 0),
+        "ent_filas": np.where(ent, filas, 0),
+        "ent_total": np.where(ent, total, 0),
+        "ent_flete": np.where(ent, flete, 0),
+        "ent_costo": np.where(ent, cube["COSTO Y"].to_numpy(), 0),
+        "dev_filas": np.where(dev, filas, 0),
+        "dev_flete": np.where(dev, flete, 0),
+        "cancelados": np.where(nunca, filas, 0),
+    }, copy=False)
+    tabla = work.groupby(cube["PRODUCTO"].to_numpy(), sort=True).sum().astype(np.int64)
+    tabla.index = pd.Index(tabla.index, dtype=object, name="PRODUCTO")
+    return tabla
+
+
+def get_product_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Tabla de métricas por producto de df, calculada una vez por objeto."""
+    return per_frame(df, "product_table", lambda d: build_product_table(get_cube(d)))
+
+
+def _posiciones(tabla, productos) -> np.ndarray:
+    """Posiciones en tabla de los productos pedidos (sin duplicados, ignora los que no existen)."""
+    pos = tabla.index.get_indexer(pd.unique(pd.Index(productos, dtype=object)))
+    return pos[pos >= 0]
+
+
+def select_products(tabla: pd.DataFrame, productos) -> pd.DataFrame:
+    """Filas de tabla para los productos pedidos."""
+    return tabla.iloc[_posiciones(tabla, productos)]
+
+
+def combined(tabla: pd.DataFrame, productos) -> pd.Series:
+    """Suma de METRICAS para la selección: O(productos seleccionados)."""
+    valores = tabla.to_numpy()[_posiciones(tabla, productos)]
+    return pd.Series(valores.sum(axis=0), index=tabla.columns)
@@ -0,0 +1,121 @@
+"""Lectores de exportaciones de Dropi: Excel, CSV y Parquet.
+
+Todos leen solo las columnas que usa el dashboard (config.COLUMNAS_REQUERIDAS
+más las opcionales) y devuelven el mismo DataFrame crudo que espera clean_data.
+
+Para .xlsx se usa python-calamine si está instalado (lector nativo, mucho más
+rápido que openpyxl). Si no, se recorre la hoja con openpyxl en modo
+read_only, fila a fila, sin construir el modelo completo del libro.
+"""
+
+import io
+import os
+
+import pandas as pd
+from config import COLUMNAS_REQUERIDAS, COLUMNAS_OPCIONALES, PATRONES_COLUMNAS_OPCIONALES
+from profiling import instrumentado
+
+_COLUMNAS_EXACTAS = set(COLUMNAS_REQUERIDAS) | set(COLUMNAS_OPCIONALES)
+
+
+def wanted_column(name) -> bool:
+    """True si la columna la usa alguna página o el pipeline."""
+    name = str(name).strip()
+    if name in _COLUMNAS_EXACTAS:
+        return True
+    upper = name.upper()
+    return any(p in upper for p in PATRONES_COLUMNAS_OPCIONALES)
+
+
+def _has_calamine() -> bool:
+    try:
+        import python_calamine  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _cell(value):
+    """Normaliza una celda de openpyxl igual que pd.read_excel."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if value == "":
+        return None
+    return value
+
+
+def _read_xlsx_openpyxl(file) -> pd.DataFrame:
+    """Lectura streaming con openpyxl read_only: una pasada, solo columnas usadas."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        selected = {}
+        for i, name in enumerate(header):
+            if name is not None and wanted_column(name) and str(name) not in selected:
+                selected[str(name)] = i
+
+        columns = {name: [] for name in selected}
+        positions = list(selected.items())
+        for row in rows:
+            values = [_cell(row[i]) if i < len(row) else None for _, i in positions]
+            if all(v is None for v in values):
+                continue
+            for (name, _), v in zip(positions, values):
+                columns[name].append(v)
+    finally:
+        wb.close()
+
+    return pd.DataFrame(columns)
+
+
+def read_xlsx(file) -> pd.DataFrame:
+    """Lee la primera hoja de un .xlsx."""
+    if _has_calamine():
+        return pd.read_excel(file, engine="calamine", usecols=wanted_column)
+    return _read_xlsx_openpyxl(file)
+
+
+def read_csv(file) -> pd.DataFrame:
+    """Lee un CSV (separador , o ; y UTF-8 con respaldo a latin-1)."""
+    raw = file.read() if hasattr(file, "read") else open(file, "rb").read()
+    first_line = raw.split(b"\n", 1)[0]
+    sep = ";" if first_line.count(b";") > first_line.count(b",") else ","
+    for encoding in ("utf-8-sig", "latin-1"):
+        try:
+            return pd.read_csv(io.BytesIO(raw), sep=sep, encoding=encoding,
+                               usecols=wanted_column, low_memory=False)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("No se pudo decodificar el CSV")
+
+
+def read_parquet(file) -> pd.DataFrame:
+    """Lee un Parquet cargando solo las columnas usadas."""
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file)
+    columns = [c for c in pf.schema_arrow.names if wanted_column(c)]
+    return pf.read(columns=columns).to_pandas()
+
+
+READERS = {
+    ".xlsx": read_xlsx,
+    ".csv": read_csv,
+    ".parquet": read_parquet,
+}
+
+
+@instrumentado
+def read_orders(file, file_name: str) -> pd.DataFrame:
+    """Lee el archivo de órdenes eligiendo el lector por extensión."""
+    ext = os.path.splitext(file_name)[1].lower()
+    reader = READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"Formato no soportado: {ext} (usa {', '.join(READERS)})")
+    return reader(file)
@@ -0,0 +1,191 @@
+"""Índice de búsqueda de productos por palabra clave.
+
+Se construye una sola vez por DataFrame (ver frame_cache) y responde en
+menos de un milisegundo aun con catálogos de decenas de miles de nombres:
+
+- Los nombres se normalizan (mayúsculas, sin tildes, solo letras y números)
+  y se parten en tokens.
+- El vocabulario de tokens está ordenado: los prefijos se resuelven con
+  búsqueda binaria.
+- Un índice invertido de trigramas → tokens resuelve subcadenas y propone
+  candidatos para tolerar errores de tipeo (distancia de edición acotada).
+- Consultas de varias palabras exigen que todas coincidan (AND) y el
+  resultado se ordena por relevancia. Los puntajes se acumulan en arreglos
+  NumPy sobre las listas de productos de cada token.
+- Además, la consulta completa se busca como subcadena en los nombres
+  normalizados (str.contains vectorizado): todo lo que encontraba el
+  escaneo `consulta in nombre` sigue apareciendo, aunque cruce palabras
+  ('MO AC' → 'TERMO ACERO') o sea un término corto ('XL' → 'CAMISETA MAXL').
+
+En el paso por tokens, los términos de menos de 3 caracteres solo coinciden
+con palabras completas; sus subcadenas salen de la búsqueda de la frase.
+"""
+
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from data_processing.frame_cache import per_frame
+
+# Puntaje por tipo de coincidencia de cada término
+PUNTAJE_EXACTO = 3.0
+PUNTAJE_PREFIJO = 2.0
+PUNTAJE_SUBCADENA = 1.5
+PUNTAJE_APROXIMADO = 1.0
+
+_NO_ALFANUMERICO = re.compile(r"[^A-Z0-9]+")
+
+
+def normalizar(texto: str) -> str:
+    """Mayúsculas, sin tildes ni signos: 'Audífono Bluetooth-X' → 'AUDIFONO BLUETOOTH X'."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", texto.upper()).strip()
+
+
+def _trigramas(token: str) -> set:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _distancia(a: str, b: str, maximo: int) -> int:
+    """Distancia de Levenshtein; corta en cuanto supera maximo."""
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    previa = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(previa[j] + 1, actual[j - 1] + 1, previa[j - 1] + (ca != cb)))
+        if min(actual) > maximo:
+            return maximo + 1
+        previa = actual
+    return previa[-1]
+
+
+def _max_errores(termino: str) -> int:
+    """Errores de tipeo tolerados según el largo del término."""
+    if len(termino) < 4:
+        return 0
+    return 1 if len(termino) < 8 else 2
+
+
+class ProductIndex:
+    """Índice invertido sobre los nombres de producto de un DataFrame."""
+
+    def __init__(self, productos):
+        self.productos = sorted({str(p) for p in productos})
+        postings = defaultdict(set)
+        for pid, nombre in enumerate(self.productos):
+            for token in normalizar(nombre).split():
+                postings[token].add(pid)
+
+        self._vocab = sorted(postings)
+        self._postings = [np.fromiter(sorted(postings[t]), dtype=np.int32) for t in self._vocab]
+        self._largo = np.array([len(p) for p in self.productos], dtype=np.int32)
+        self._nombres = np.array(self.productos, dtype=object)
+        self._normalizados = pd.Series([normalizar(p) for p in self.productos], dtype=object)
+        self._por_trigrama = defaultdict(set)
+        for tid, token in enumerate(self._vocab):
+            for tri in _trigramas(token):
+                self._por_trigrama[tri].add(tid)
+
+    def __len__(self):
+        return len(self.productos)
+
+    def _coincidencias(self, termino: str) -> dict:
+        """{id de token: puntaje} de los tokens que coinciden con un término."""
+        hits = {}
+        if len(termino) < 3:
+            # Solo la palabra exacta: las subcadenas cortas las cubre _frase
+            tid = bisect.bisect_left(self._vocab, termino)
+            if tid < len(self._vocab) and self._vocab[tid] == termino:
+                hits[tid] = PUNTAJE_EXACTO
+            return hits
+
+        # Exacto y prefijo: rango contiguo del vocabulario ordenado
+        lo = bisect.bisect_left(self._vocab, termino)
+        hi = bisect.bisect_left(self._vocab, termino + "\uffff")
+        for tid in range(lo, hi):
+            hits[tid] = PUNTAJE_EXACTO if self._vocab[tid] == termino else PUNTAJE_PREFIJO
+
+        # Subcadena: tokens que contienen todos los trigramas del término
+        tris = _trigramas(termino)
+        candidatos = set.intersection(*(self._por_trigrama.get(t, set()) for t in tris))
+        for tid in candidatos:
+            if tid not in hits and termino in self._vocab[tid]:
+                hits[tid] = PUNTAJE_SUBCADENA
+
+        if hits:
+            return hits
+
+        # Aproximado: tokens que comparten trigramas, filtrados por distancia
+        maximo = _max_errores(termino)
+        if not maximo:
+            return hits
+        candidatos = set()
+        for tri in tris:
+            candidatos |= self._por_trigrama.get(tri, set())
+        for tid in candidatos:
+            token = self._vocab[tid]
+            # Se compara también contra el prefijo del token: permite errores
+            # en palabras que el usuario todavía no termina de escribir
+            dist = min(_distancia(termino, token, maximo),
+                       _distancia(termino, token[:len(termino)], maximo))
+            if dist <= maximo:
+                hits[tid] = PUNTAJE_APROXIMADO - 0.25 * dist
+        return hits
+
+    def _frase(self, frase: str, pids: np.ndarray | None = None) -> np.ndarray:
+        """Máscara de productos (de pids, o todos) cuyo nombre normalizado contiene frase."""
+        nombres = self._normalizados if pids is None else self._normalizados.iloc[pids]
+        mascara = nombres.str.contains(frase, regex=False).to_numpy(dtype=bool)
+        if pids is None:
+            return mascara
+        completa = np.zeros(len(self.productos), dtype=bool)
+        completa[pids[mascara]] = True
+        return completa
+
+    def search(self, query: str, limite: int | None = None) -> list:
+        """Productos que coinciden con todas las palabras de query, del más al menos relevante."""
+        frase = normalizar(query)
+        terminos = frase.split()
+        if not terminos:
+            return self.productos[:limite] if limite else list(self.productos)
+
+        total = None
+        largos = None  # productos que coinciden con todos los términos de 3 o más caracteres
+        for termino in terminos:
+            puntajes = np.zeros(len(self.productos), dtype=np.float32)
+            for tid, puntaje in self._coincidencias(termino).items():
+                pids = self._postings[tid]
+                puntajes[pids] = np.maximum(puntajes[pids], puntaje)
+            # AND: un producto debe coincidir con todos los términos
+            total = puntajes if total is None else np.where((total > 0) & (puntajes > 0), total + puntajes, 0)
+            if len(termino) >= 3:
+                largos = puntajes > 0 if largos is None else largos & (puntajes > 0)
+
+        # La frase completa como subcadena (lo que encontraba el escaneo lineal).
+        # Con solo términos largos el paso por tokens ya la cubre: el primero
+        # coincide como subcadena, los del medio exactos y el último como prefijo.
+        # Con términos cortos se revisan los nombres que ya cumplen los largos.
+        if largos is None or any(len(t) < 3 for t in terminos):
+            candidatos = None if largos is None else np.flatnonzero(largos)
+            en_frase = self._frase(frase, candidatos)
+            total = np.where(total > 0, total, en_frase * (PUNTAJE_SUBCADENA * len(terminos)))
+        if not total.any():
+            return []
+
+        # Mayor puntaje primero; a igual puntaje, nombres más cortos y luego alfabético
+        pids = np.flatnonzero(total)
+        orden = pids[np.lexsort((pids, self._largo[pids], -total[pids]))]
+        if limite:
+            orden = orden[:limite]
+        return self._nombres[orden].tolist()
+
+
+def get_product_index(df) -> ProductIndex:
+    """Índice de búsqueda de los productos de df, construido una vez por objeto."""
+    return per_frame(df, "product_index", lambda d: ProductIndex(d["PRODUCTO"].dropna().unique()))
@@ -0,0 +1,241 @@
+"""Resumen del negocio serializado a texto compacto o JSON.
+
+Arma, a partir de los resultados del analyzer, las tablas rankeadas que
+resumen el negocio (productos perdiendo/ganando, ciudades por veredicto,
+transportadoras) y las serializa:
+
+- summary_text: texto compacto para el prompt del consejero IA
+- summary_json: la misma información como JSON, para descargas
+
+Cada tabla se parte una sola vez por veredicto (partition) y cada línea se
+formatea por columnas (render_lines), sin recorrer filas con iterrows. Las
+filas por sección salen de config.RESUMEN_TOP y se pueden recortar más
+para que el texto quepa en un presupuesto de tokens (fit_summary).
+"""
+
+import json
+from string import Formatter
+
+import numpy as np
+import pandas as pd
+from config import RESUMEN_TOP
+
+# Plantilla de cada línea por sección (los campos son columnas de la tabla)
+PLANTILLAS = {
+    "prod_perdiendo": (
+        "  - {PRODUCTO}: {Envíos} envíos, {Entregas} entregas, {Devoluciones} devs, "
+        "Ganancia=${Ganancia Entregas:,}, Pérdida=${Pérdida Devoluciones:,}, "
+        "Rentabilidad=${Rentabilidad Real:,}"
+    ),
+    "prod_ganando": "  - {PRODUCTO}: {Envíos} envíos, Rentabilidad=${Rentabilidad Real:,}, Rent/Envío=${Rent/Envío:,}",
+    "cities_no": (
+        "  - {CIUDAD DESTINO}: {Envíos} envíos, {Devoluciones} devs, {% Devolución}% dev, "
+        "Rentabilidad=${Rentabilidad:,}"
+    ),
+    "cities_prec": "  - {CIUDAD DESTINO}: {Envíos} envíos, {% Devolución}% dev, Rentabilidad=${Rentabilidad:,}",
+    "cities_ok": "  - {CIUDAD DESTINO}: {Envíos} envíos, {% Devolución}% dev, Rentabilidad=${Rentabilidad:,}",
+    "carriers": (
+        "  - {Transportadora}: {Envíos} envíos, {% Éxito}% éxito, {% Devolución}% dev, "
+        "Rentabilidad=${Rentabilidad:,}"
+    ),
+}
+
+
+def estimate_tokens(texto: str) -> int:
+    """Tokens aproximados de un texto en español (~3 caracteres por token, por lo alto)."""
+    return len(texto) // 3 + 1
+
+
+# ============================================================
+# TABLAS
+# ============================================================
+
+def partition(tabla: pd.DataFrame, clave) -> dict:
+    """{valor: filas de tabla con ese valor} en una sola pasada; conserva el orden de las filas.
+
+    clave es una columna de tabla o un arreglo alineado con sus filas.
+    """
+    if isinstance(clave, str):
+        clave = tabla[clave]
+    codigos, valores = pd.factorize(np.asarray(clave, dtype=object))
+    orden = np.argsort(codigos, kind="stable")
+    limites = np.searchsorted(codigos[orden], np.arange(len(valores) + 1))
+    return {
+        valor: tabla.iloc[orden[limites[i]:limites[i + 1]]] for i, valor in enumerate(valores)
+    }
+
+
+def _campos(plantilla: str) -> list:
+    return [campo for _, campo, _, _ in Formatter().parse(plantilla) if campo is not None]
+
+
+def _columna(valores: np.ndarray, formato: str) -> np.ndarray:
+    """Una columna ya formateada como texto (mismo resultado que format(valor, formato))."""
+    if not formato:
+        return valores.astype(str).astype(object)
+    return np.array([format(v, formato) for v in valores.tolist()], dtype=object)
+
+
+def render_lines(tabla: pd.DataFrame, plantilla: str, top: int | None = None) -> list:
+    """Una línea de texto por fila de tabla (las primeras top), armada columna a columna."""
+    tabla = tabla.head(top) if top is not None else tabla
+    if tabla.empty:
+        return []
+    lineas = np.full(len(tabla), "", dtype=object)
+    for literal, campo, formato, _ in Formatter().parse(plantilla):
+        if literal:
+            lineas = lineas + literal
+        if campo is not None:
+            lineas = lineas + _columna(tabla[campo].to_numpy(), formato)
+    return list(lineas + "\n")
+
+
+def to_records(tabla: pd.DataFrame, columnas: list, top: int | None = None) -> list:
+    """Filas de tabla (las primeras top) como dicts con tipos JSON."""
+    tabla = tabla.head(top) if top is not None else tabla
+    if tabla.empty:
+        return []
+    return json.loads(tabla[columnas].to_json(orient="records", force_ascii=False))
+
+
+# ============================================================
+# RESUMEN DEL NEGOCIO
+# ============================================================
+
+def business_summary(df: pd.DataFrame, top: dict | None = None, hoy=None) -> dict:
+    """Métricas, conteos y tablas rankeadas (hasta top[sección] filas) del negocio.
+
+    hoy es la fecha de referencia de las métricas generales (por defecto, hoy).
+    """
+    from data_processing.analyzer import (
+        get_carrier_analysis,
+        get_city_profitability,
+        get_general_metrics,
+        get_pnl_general,
+        get_product_profitability,
+    )
+
+    top = {**RESUMEN_TOP, **(top or {})}
+    products = get_product_profitability(df)
+    cities = get_city_profitability(df)
+    carriers = get_carrier_analysis(df)
+
+    vacia_prod, vacia_city = products.iloc[:0], cities.iloc[:0]
+    por_signo = partition(products, np.where(products["Rentabilidad Real"] < 0, "PERDIENDO", "GANANDO"))
+    perdiendo = por_signo.get("PERDIENDO", vacia_prod)
+    ganando = por_signo.get("GANANDO", vacia_prod)
+    por_veredicto = partition(cities, "Veredicto") if not cities.empty else {}
+    no_enviar = por_veredicto.get("NO ENVIAR", vacia_city)
+    precaucion = por_veredicto.get("PRECAUCIÓN", vacia_city)
+    ok = por_veredicto.get("OK", vacia_city)
+
+    tablas = {
+        "prod_perdiendo": perdiendo,
+        "prod_ganando": ganando.sort_values("Rentabilidad Real", ascending=False),
+        "cities_no": no_enviar,
+        "cities_prec": precaucion,
+        "cities_ok": ok.sort_values("Rentabilidad", ascending=False),
+        "carriers": carriers,
+    }
+    return {
+        "metricas": get_general_metrics(df, hoy=hoy),
+        "pnl": get_pnl_general(df),
+        "conteos": {
+            "prod_perdiendo": len(perdiendo),
+            "prod_ganando": len(ganando),
+            "cities_no": len(no_enviar),
+            "cities_prec": len(precaucion),
+            "perdida_evitable_prod": int(perdiendo["Pérdida Devoluciones"].sum()) if len(perdiendo) else 0,
+            "perdida_evitable_cities": int(no_enviar["Pérdida"].sum()) if len(no_enviar) else 0,
+        },
+        "tablas": {
+            clave: tabla.head(top[clave]) if top[clave] is not None else tabla
+            for clave, tabla in tablas.items()
+        },
+    }
+
+
+def summary_text(resumen: dict, max_filas: int | None = None) -> str:
+    """Texto compacto del resumen con a lo sumo max_filas por sección."""
+    metrics, pnl, n = resumen["metricas"], resumen["pnl"], resumen["conteos"]
+    texto = {
+        clave: "".join(render_lines(tabla, PLANTILLAS[clave], max_filas))
+        for clave, tabla in resumen["tablas"].items()
+    }
+
+    return f"""=== RESUMEN DEL NEGOCIO (DROPSHIPPING COLOMBIA - VEYNORI STORE) ===
+
+MÉTRICAS GENERALES:
+- Total órdenes: {metrics['total_ordenes']:,}
+- Envíos reales (con guía): {metrics['envios_reales']:,}
+- Entregados: {metrics['entregados']:,}
+- Devoluciones: {metrics['devoluciones']:,}
+- En proceso: {metrics['en_proceso']:,}
+- Nunca enviados: {metrics['nunca_enviados']:,}
+- Guías demoradas: {metrics['guia_demorada']:,}
+- Tasa de éxito: {metrics['tasa_exito']:.1%}
+- Tasa de devolución: {metrics['tasa_devolucion']:.1%}
+- Flete promedio: ${metrics['flete_promedio']:,}
+- Pérdida total por devoluciones (flete): ${metrics['perdida_total']:,}
+
+P&L (GANANCIAS Y PÉRDIDAS):
+- Ventas brutas (entregas): ${pnl['ventas_brutas']:,}
+- Costo producto: ${pnl['costo_producto']:,}
+- Flete entregas: ${pnl['flete_entregados']:,}
+- Flete devoluciones (pérdida): ${pnl['flete_devueltos']:,}
+- Flete en tránsito: ${pnl['flete_en_transito']:,}
+- Venta neta (sin publicidad): ${pnl['venta_neta']:,}
+- Utilidad entregas (R-T-Y): ${pnl['utilidad_entregas']:,}
+- Pedidos en tránsito: {pnl['proy_en_transito']:,}
+- Utilidad proyectada si todo se entrega: ${pnl['proy_utilidad_total']:,}
+
+PRODUCTOS ({n['prod_perdiendo']} perdiendo, {n['prod_ganando']} ganando):
+Top productos PERDIENDO dinero:
+{texto['prod_perdiendo']}
+Top productos GANANDO dinero:
+{texto['prod_ganando']}
+Pérdida evitable en productos no rentables: ${n['perdida_evitable_prod']:,}
+
+CIUDADES ({n['cities_no']} NO ENVIAR, {n['cities_prec']} PRECAUCIÓN):
+Ciudades donde NO conviene enviar (rentabilidad negativa):
+{texto['cities_no']}
+Ciudades en PRECAUCIÓN (>30% devolución pero rentables):
+{texto['cities_prec']}
+Top ciudades RENTABLES:
+{texto['cities_ok']}
+Pérdida evitable en ciudades NO ENVIAR: ${n['perdida_evitable_cities']:,}
+
+TRANSPORTADORAS:
+{texto['carriers']}"""
+
+
+def fit_summary(resumen: dict, presupuesto: int | None = None) -> str:
+    """summary_text recortando filas por sección hasta caber en presupuesto (tokens)."""
+    texto = summary_text(resumen)
+    if presupuesto is None or estimate_tokens(texto) <= presupuesto:
+        return texto
+    mas_larga = max(len(tabla) for tabla in resumen["tablas"].values())
+    for max_filas in range(mas_larga - 1, -1, -1):
+        texto = summary_text(resumen, max_filas)
+        if estimate_tokens(texto) <= presupuesto:
+            break
+    return texto
+
+
+def _json(valor):
+    """Escalares de numpy/pandas que json no serializa."""
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+
+def summary_json(resumen: dict, max_filas: int | None = None) -> str:
+    """El resumen como JSON: métricas, P&L, conteos y las columnas de cada sección."""
+    datos = {
+        "metricas": resumen["metricas"],
+        "pnl": resumen["pnl"],
+        "conteos": resumen["conteos"],
+        "secciones": {
+            clave: to_records(tabla, _campos(PLANTILLAS[clave]), max_filas)
+            for clave, tabla in resumen["tablas"].items()
+        },
+    }
+    return json.dumps(datos, indent=1, ensure_ascii=False, default=_json)
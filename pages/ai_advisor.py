@@ -1,149 +1,51 @@
 """Página: Consejero IA — Análisis y recomendaciones con Claude."""
 
-import streamlit as st
-
-
-def _build_data_summary(df):
-    """Construye un resumen de datos para enviar al modelo."""
-    from data_processing.analyzer import (
-        get_pnl_general,
-        get_product_profitability,
-        get_city_profitability,
-        get_carrier_analysis,
-        get_general_metrics,
-    )
-
-    metrics = get_general_metrics(df)
-    pnl = get_pnl_general(df)
-    products = get_product_profitability(df)
-    cities = get_city_profitability(df)
-    carriers = get_carrier_analysis(df)
-
-    # Top 15 productos perdiendo
-    prod_perdiendo = products[products["Rentabilidad Real"] < 0].head(15)
-    prod_perdiendo_text = ""
-    for _, r in prod_perdiendo.iterrows():
-        prod_perdiendo_text += (
-            f"  - {r['PRODUCTO']}: {r['Envíos']} envíos, "
-            f"{r['Entregas']} entregas, {r['Devoluciones']} devs, "
-            f"Ganancia=${r['Ganancia Entregas']:,}, "
-            f"Pérdida=${r['Pérdida Devoluciones']:,}, "
-            f"Rentabilidad=${r['Rentabilidad Real']:,}\n"
-        )
+import hashlib
+from collections import OrderedDict
 
-    # Top 10 productos ganando
-    prod_ganando = products[products["Rentabilidad Real"] >= 0].sort_values(
-        "Rentabilidad Real", ascending=False
-    ).head(10)
-    prod_ganando_text = ""
-    for _, r in prod_ganando.iterrows():
-        prod_ganando_text += (
-            f"  - {r['PRODUCTO']}: {r['Envíos']} envíos, "
-            f"Rentabilidad=${r['Rentabilidad Real']:,}, "
-            f"Rent/Envío=${r['Rent/Envío']:,}\n"
-        )
-
-    # Ciudades NO ENVIAR
-    cities_no = cities[cities["Veredicto"] == "NO ENVIAR"].head(15)
-    cities_no_text = ""
-    for _, r in cities_no.iterrows():
-        cities_no_text += (
-            f"  - {r['CIUDAD DESTINO']}: {r['Envíos']} envíos, "
-            f"{r['Devoluciones']} devs, {r['% Devolución']}% dev, "
-            f"Rentabilidad=${r['Rentabilidad']:,}\n"
-        )
+import streamlit as st
+from config import IA_MODELO, IA_PRESUPUESTO_PROMPT, IA_RESPUESTAS_MAX
+from data_processing.summary import business_summary, estimate_tokens, fit_summary
+from visualizations.downloads import summary_downloads
 
-    # Ciudades PRECAUCIÓN
-    cities_prec = cities[cities["Veredicto"] == "PRECAUCIÓN"].head(10)
-    cities_prec_text = ""
-    for _, r in cities_prec.iterrows():
-        cities_prec_text += (
-            f"  - {r['CIUDAD DESTINO']}: {r['Envíos']} envíos, "
-            f"{r['% Devolución']}% dev, Rentabilidad=${r['Rentabilidad']:,}\n"
-        )
+_PROMPT = """Eres un consultor experto en dropshipping y e-commerce en Colombia.
+Analiza los siguientes datos de la tienda "Veynori Store" que opera en la plataforma Dropi.
 
-    # Top ciudades rentables
-    cities_ok = cities[cities["Veredicto"] == "OK"].sort_values(
-        "Rentabilidad", ascending=False
-    ).head(10)
-    cities_ok_text = ""
-    for _, r in cities_ok.iterrows():
-        cities_ok_text += (
-            f"  - {r['CIUDAD DESTINO']}: {r['Envíos']} envíos, "
-            f"{r['% Devolución']}% dev, Rentabilidad=${r['Rentabilidad']:,}\n"
-        )
+{data_summary}
+{pub_context}
+{question_context}
 
-    # Transportadoras
-    carrier_text = ""
-    if not carriers.empty:
-        for _, r in carriers.iterrows():
-            carrier_text += (
-                f"  - {r['Transportadora']}: {r['Envíos']} envíos, "
-                f"{r['% Éxito']}% éxito, {r['% Devolución']}% dev, "
-                f"Rentabilidad=${r['Rentabilidad']:,}\n"
-            )
+INSTRUCCIONES:
+1. Da un DIAGNÓSTICO GENERAL del negocio (2-3 párrafos)
+2. Lista las ACCIONES INMEDIATAS (productos a pausar, ciudades a bloquear)
+3. Da RECOMENDACIONES ESTRATÉGICAS para mejorar rentabilidad
+4. Si hay pregunta específica del usuario, respóndela con datos concretos
+5. Usa números y datos específicos del resumen para respaldar cada recomendación
+6. Sé directo y práctico — el usuario necesita acciones concretas, no teoría
 
-    # Conteos generales
-    n_prod_perdiendo = len(products[products["Rentabilidad Real"] < 0])
-    n_prod_ganando = len(products[products["Rentabilidad Real"] >= 0])
-    n_cities_no = len(cities[cities["Veredicto"] == "NO ENVIAR"])
-    n_cities_prec = len(cities[cities["Veredicto"] == "PRECAUCIÓN"])
-    perdida_evitable_cities = int(
-        cities[cities["Veredicto"] == "NO ENVIAR"]["Pérdida"].sum()
-    ) if n_cities_no > 0 else 0
-    perdida_evitable_prod = int(
-        products[products["Rentabilidad Real"] < 0]["Pérdida Devoluciones"].sum()
-    ) if n_prod_perdiendo > 0 else 0
+Responde en español. Usa formato markdown con headers ##, bullets, y **negritas** para resaltar lo importante."""
 
-    summary = f"""=== RESUMEN DEL NEGOCIO (DROPSHIPPING COLOMBIA - VEYNORI STORE) ===
 
-MÉTRICAS GENERALES:
-- Total órdenes: {metrics['total_ordenes']:,}
-- Envíos reales (con guía): {metrics['envios_reales']:,}
-- Entregados: {metrics['entregados']:,}
-- Devoluciones: {metrics['devoluciones']:,}
-- En proceso: {metrics['en_proceso']:,}
-- Nunca enviados: {metrics['nunca_enviados']:,}
-- Guías demoradas: {metrics['guia_demorada']:,}
-- Tasa de éxito: {metrics['tasa_exito']:.1%}
-- Tasa de devolución: {metrics['tasa_devolucion']:.1%}
-- Flete promedio: ${metrics['flete_promedio']:,}
-- Pérdida total por devoluciones (flete): ${metrics['perdida_total']:,}
+def _build_data_summary(df, presupuesto: int | None = None, hoy=None) -> str:
+    """Construye un resumen de datos para enviar al modelo (ver data_processing.summary).
 
-P&L (GANANCIAS Y PÉRDIDAS):
-- Ventas brutas (entregas): ${pnl['ventas_brutas']:,}
-- Costo producto: ${pnl['costo_producto']:,}
-- Flete entregas: ${pnl['flete_entregados']:,}
-- Flete devoluciones (pérdida): ${pnl['flete_devueltos']:,}
-- Flete en tránsito: ${pnl['flete_en_transito']:,}
-- Venta neta (sin publicidad): ${pnl['venta_neta']:,}
-- Utilidad entregas (R-T-Y): ${pnl['utilidad_entregas']:,}
-- Pedidos en tránsito: {pnl['proy_en_transito']:,}
-- Utilidad proyectada si todo se entrega: ${pnl['proy_utilidad_total']:,}
+    Con presupuesto (tokens) las secciones de productos, ciudades y
+    transportadoras se recortan a las primeras filas hasta que el resumen cabe.
+    """
+    return fit_summary(business_summary(df, hoy=hoy), presupuesto)
 
-PRODUCTOS ({n_prod_perdiendo} perdiendo, {n_prod_ganando} ganando):
-Top productos PERDIENDO dinero:
-{prod_perdiendo_text}
-Top productos GANANDO dinero:
-{prod_ganando_text}
-Pérdida evitable en productos no rentables: ${perdida_evitable_prod:,}
 
-CIUDADES ({n_cities_no} NO ENVIAR, {n_cities_prec} PRECAUCIÓN):
-Ciudades donde NO conviene enviar (rentabilidad negativa):
-{cities_no_text}
-Ciudades en PRECAUCIÓN (>30% devolución pero rentables):
-{cities_prec_text}
-Top ciudades RENTABLES:
-{cities_ok_text}
-Pérdida evitable en ciudades NO ENVIAR: ${perdida_evitable_cities:,}
+@st.cache_resource
+def _respuestas() -> OrderedDict:
+    """Respuestas ya generadas por (resumen, publicidad, pregunta); compartidas entre sesiones."""
+    return OrderedDict()
 
-TRANSPORTADORAS:
-{carrier_text}"""
 
-    return summary
+def _clave_respuesta(data_summary: str, gasto_pub: int, pregunta: str) -> str:
+    return hashlib.sha256(repr((IA_MODELO, data_summary, gasto_pub, pregunta)).encode("utf-8")).hexdigest()
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de Consejero IA."""
     st.subheader("Consejero IA")
     st.caption(
@@ -166,12 +68,10 @@ def render(df):
     gasto_pub = st.number_input(
         "Gasto en publicidad (opcional, para incluir en el análisis)",
         min_value=0,
-        value=st.session_state.get("gasto_pub_advisor", 0),
         step=100000,
         format="%d",
         key="gasto_pub_ia",
     )
-    st.session_state["gasto_pub_advisor"] = gasto_pub
 
     # Pregunta personalizada
     pregunta = st.text_area(
@@ -180,12 +80,19 @@ def render(df):
         key="ai_advisor_question",
     )
 
+    # El mismo resumen que recibe el modelo, para revisarlo o compartirlo
+    summary_downloads(df, hoy=hoy)
+
     st.divider()
 
-    if st.button("Analizar y Aconsejar", disabled=not api_key, type="primary"):
-        with st.spinner("Recopilando datos del negocio..."):
-            data_summary = _build_data_summary(df)
+    nueva = st.checkbox(
+        "Pedir una respuesta nueva",
+        key="ai_advisor_nueva",
+        help="Sin marcar, si los datos, el gasto y la pregunta no cambiaron se reutiliza la última respuesta",
+    )
 
+    en_vivo = False
+    if st.button("Analizar y Aconsejar", disabled=not api_key, type="primary"):
         pub_context = ""
         if gasto_pub > 0:
             from data_processing.analyzer import get_pnl_general
@@ -204,49 +111,55 @@ PUBLICIDAD:
         if pregunta:
             question_context = f"\n\nPREGUNTA ESPECÍFICA DEL USUARIO:\n{pregunta}\n"
 
-        prompt = f"""Eres un consultor experto en dropshipping y e-commerce en Colombia.
-Analiza los siguientes datos de la tienda "Veynori Store" que opera en la plataforma Dropi.
-
-{data_summary}
-{pub_context}
-{question_context}
-
-INSTRUCCIONES:
-1. Da un DIAGNÓSTICO GENERAL del negocio (2-3 párrafos)
-2. Lista las ACCIONES INMEDIATAS (productos a pausar, ciudades a bloquear)
-3. Da RECOMENDACIONES ESTRATÉGICAS para mejorar rentabilidad
-4. Si hay pregunta específica del usuario, respóndela con datos concretos
-5. Usa números y datos específicos del resumen para respaldar cada recomendación
-6. Sé directo y práctico — el usuario necesita acciones concretas, no teoría
-
-Responde en español. Usa formato markdown con headers ##, bullets, y **negritas** para resaltar lo importante."""
-
-        with st.spinner("Claude está analizando tu negocio..."):
+        # El resumen se recorta para que el prompt completo quepa en el presupuesto
+        with st.spinner("Recopilando datos del negocio..."):
+            resto = estimate_tokens(_PROMPT.format(data_summary="", pub_context=pub_context,
+                                                   question_context=question_context))
+            data_summary = _build_data_summary(df, presupuesto=IA_PRESUPUESTO_PROMPT - resto, hoy=hoy)
+
+        prompt = _PROMPT.format(data_summary=data_summary, pub_context=pub_context,
+                                question_context=question_context)
+
+        clave = _clave_respuesta(data_summary, gasto_pub, pregunta)
+        respuestas = _respuestas()
+        advice = None if nueva else respuestas.get(clave)
+        if advice is not None:
+            respuestas.move_to_end(clave)
+            st.caption("Respuesta guardada: los datos, el gasto y la pregunta no cambiaron.")
+        else:
+            # La respuesta se muestra a medida que llega
+            st.divider()
             try:
                 from anthropic import Anthropic
 
                 client = Anthropic(api_key=api_key)
-                response = client.messages.create(
-                    model="claude-sonnet-4-5-20250929",
+                with client.messages.stream(
+                    model=IA_MODELO,
                     max_tokens=4096,
                     messages=[{"role": "user", "content": prompt}],
-                )
-                advice = response.content[0].text
-
-                # Guardar en session state
-                st.session_state["ai_advice"] = advice
-                st.session_state["ai_advice_question"] = pregunta
-
+                ) as stream:
+                    advice = st.write_stream(stream.text_stream)
             except Exception as e:
                 st.error(f"Error al consultar la IA: {e}")
                 return
 
+            respuestas[clave] = advice
+            while len(respuestas) > IA_RESPUESTAS_MAX:
+                respuestas.popitem(last=False)
+            en_vivo = True
+
+        # Guardar en session state
+        st.session_state["ai_advice"] = advice
+        st.session_state["ai_advice_question"] = pregunta
+
     # Mostrar resultado (persistente en session)
     if "ai_advice" in st.session_state and st.session_state["ai_advice"]:
-        st.divider()
-        if st.session_state.get("ai_advice_question"):
-            st.caption(f"Pregunta: {st.session_state['ai_advice_question']}")
-        st.markdown(st.session_state["ai_advice"])
+        # Recién transmitida ya está en pantalla
+        if not en_vivo:
+            st.divider()
+            if st.session_state.get("ai_advice_question"):
+                st.caption(f"Pregunta: {st.session_state['ai_advice_question']}")
+            st.markdown(st.session_state["ai_advice"])
 
         # Botón para copiar
         st.divider()
@@ -1,63 +1,126 @@
-"""Página: Clasificación IA de Estatus Desconocidos."""
+"""Página: Clasificación IA de Estatus Desconocidos y reglas manuales."""
 
+import pandas as pd
 import streamlit as st
-from data_processing.classifier import get_unknown_statuses, classify_with_ai, apply_ai_classifications
+from config import CATEGORIAS
+from data_processing.ai_classifier import clear_verdicts, load_verdicts
+from data_processing.classifier import ORIGENES, get_unknown_statuses, classify_with_ai
+from data_processing.manual_rules import load_rules, remove_rules, set_rule
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de clasificación IA."""
     st.subheader("Clasificación IA de Estatus")
 
+    # Resultado de la última clasificación (ya aplicado a los datos tras el rerun)
+    ultimos = st.session_state.pop("ai_ultimos", None)
+    if ultimos:
+        st.success("Clasificación completada y aplicada:")
+        for estatus, categoria in ultimos.items():
+            st.write(f"- **{estatus}** → {categoria}")
+
     unknown = get_unknown_statuses(df)
 
     if not unknown:
-        st.success("No hay estatus desconocidos. Todos fueron clasificados por reglas.")
-        return
-
-    st.warning(f"Se encontraron **{len(unknown)}** estatus no reconocidos:")
-
-    for s in unknown:
-        count = len(df[df["ESTATUS"] == s])
-        st.write(f"- **{s}** ({count} órdenes)")
-
-    st.divider()
-
-    # Input para API key
-    api_key = st.text_input(
-        "API Key de Claude (Anthropic)",
-        type="password",
-        value=st.session_state.get("anthropic_api_key", ""),
-        help="Ingresa tu API key de Anthropic para clasificar estatus con IA",
-    )
-
-    if api_key:
-        st.session_state["anthropic_api_key"] = api_key
+        st.success("No hay estatus desconocidos. Todos fueron clasificados por reglas o por IA.")
+    else:
+        st.warning(f"Se encontraron **{len(unknown)}** estatus no reconocidos:")
 
-    if st.button("Clasificar con IA", disabled=not api_key):
-        with st.spinner("Clasificando estatus con Claude..."):
-            results = classify_with_ai(unknown, api_key)
+        conteo = df["ESTATUS"].value_counts()
+        for s in unknown:
+            st.write(f"- **{s}** ({conteo.get(s, 0)} órdenes)")
 
-        if results:
-            st.success("Clasificación completada:")
-
-            # Mostrar resultados
-            for estatus, categoria in results.items():
-                count = len(df[df["ESTATUS"] == estatus])
-                st.write(f"- **{estatus}** → {categoria} ({count} órdenes)")
-
-            # Guardar en session state para aplicar
-            st.session_state["ai_classifications"] = results
-            st.info("Las clasificaciones se aplicarán al recargar los datos. Usa el botón de abajo.")
+        st.divider()
 
-            if st.button("Aplicar Clasificaciones"):
-                st.session_state["apply_ai"] = True
+        # Input para API key
+        api_key = st.text_input(
+            "API Key de Claude (Anthropic)",
+            type="password",
+            value=st.session_state.get("anthropic_api_key", ""),
+            help="Ingresa tu API key de Anthropic para clasificar estatus con IA",
+        )
+
+        if api_key:
+            st.session_state["anthropic_api_key"] = api_key
+
+        if st.button("Clasificar con IA", disabled=not api_key):
+            barra = st.progress(0.0, text="Clasificando estatus con Claude...")
+            results = classify_with_ai(
+                unknown, api_key,
+                progreso=lambda hechos, total: barra.progress(
+                    hechos / total, text=f"Clasificando estatus con Claude... lote {hechos} de {total}"
+                ),
+            )
+            barra.empty()
+
+            if results:
+                # Los veredictos quedan guardados: al recargar ya se aplican
+                st.session_state["ai_ultimos"] = results
                 st.rerun()
-        else:
             st.error("No se obtuvieron resultados de la IA.")
 
-    # Historial
-    if "ai_classifications" in st.session_state and st.session_state["ai_classifications"]:
+    # Veredictos guardados (se aplican en esta y en las próximas sesiones)
+    veredictos = load_verdicts()
+    if veredictos:
         st.divider()
-        st.subheader("Historial de Clasificaciones IA")
-        for estatus, categoria in st.session_state["ai_classifications"].items():
-            st.write(f"- **{estatus}** → {categoria}")
+        st.subheader("Veredictos de IA Guardados")
+        st.dataframe(
+            pd.DataFrame([
+                {"Estatus": estatus, "Categoría": v["categoria"], "Fecha": v["fecha"], "Modelo": v["modelo"]}
+                for estatus, v in sorted(veredictos.items())
+            ]),
+            hide_index=True,
+            use_container_width=True,
+        )
+        if st.button("Olvidar veredictos", help="Los estatus vuelven a quedar como desconocidos"):
+            clear_verdicts()
+            st.rerun()
+
+    _render_manual_rules(df, unknown)
+
+    # De dónde sale la categoría de cada orden
+    if "ORIGEN" in df.columns:
+        st.divider()
+        st.subheader("Origen de la Clasificación")
+        origen = df["ORIGEN"].value_counts().reindex(ORIGENES, fill_value=0)
+        etiquetas = {"REGLAS": "Reglas", "IA": "IA", "MANUAL": "Manual"}
+        cols = st.columns(len(ORIGENES))
+        for col, (nombre, n) in zip(cols, origen.items()):
+            col.metric(etiquetas[nombre], f"{n:,}")
+
+
+def _render_manual_rules(df, unknown):
+    """Formulario y listado de reglas manuales (estatus → categoría)."""
+    st.divider()
+    st.subheader("Reglas Manuales")
+    st.caption("Fijan la categoría de un estatus en todas sus órdenes; ganan sobre las reglas y la IA.")
+
+    # Primero los desconocidos, luego el resto por cantidad de órdenes
+    conteo = df["ESTATUS"].value_counts()
+    desconocidos = set(unknown)
+    opciones = unknown + [s for s in conteo[conteo > 0].index if s not in desconocidos]
+    col1, col2, col3 = st.columns([3, 2, 1])
+    estatus = col1.selectbox("Estatus", opciones, key="regla_estatus")
+    categoria = col2.selectbox(
+        "Categoría", [c for c in CATEGORIAS if c != "DESCONOCIDO"], key="regla_categoria"
+    )
+    col3.write("")
+    if col3.button("Guardar regla", disabled=estatus is None):
+        set_rule(estatus, categoria)
+        st.rerun()
+
+    reglas = load_rules()
+    if reglas:
+        st.dataframe(
+            pd.DataFrame([
+                {"Estatus": e, "Categoría": c, "Órdenes": int(conteo.get(e, 0))}
+                for e, c in sorted(reglas.items())
+            ]),
+            hide_index=True,
+            use_container_width=True,
+        )
+        quitar = st.multiselect("Quitar reglas", sorted(reglas), key="reglas_quitar")
+        if st.button("Quitar seleccionadas", disabled=not quitar):
+            remove_rules(quitar)
+            del st.session_state["reglas_quitar"]
+            st.rerun()
@@ -1,17 +1,21 @@
 """Página: Alertas Operativas."""
 
 import streamlit as st
+from visualizations.downloads import download_buttons
+from visualizations.tables import paged_table
 
 
 def _fmt(val):
     return f"${val:,}"
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de alertas operativas."""
     from data_processing.analyzer import get_operational_alerts
+    from data_processing.day_index import fecha_referencia
 
-    alerts = get_operational_alerts(df)
+    hoy = fecha_referencia(hoy)
+    alerts = get_operational_alerts(df, hoy=hoy)
 
     st.subheader("Alertas Operativas")
     st.caption("Pedidos que requieren atención inmediata")
@@ -39,16 +43,9 @@ def render(df):
     with st.expander(f"Flete Sobrecosto — {n_flete} pedidos", expanded=n_flete > 0):
         if n_flete > 0:
             st.warning(f"{n_flete} pedidos con flete superior a $20,000")
-            st.dataframe(flete.reset_index(drop=True), use_container_width=True)
-
-            csv = flete.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Descargar CSV - Flete Sobrecosto",
-                csv,
-                "alerta_flete_sobrecosto.csv",
-                "text/csv",
-                key="dl_flete",
-            )
+            paged_table(flete, "tabla_flete", dinero=["PRECIO FLETE"])
+
+            download_buttons(flete, "Flete Sobrecosto", "alerta_flete_sobrecosto", dataset=df, params=(hoy,))
         else:
             st.success("No hay pedidos con flete sobrecosto.")
 
@@ -56,16 +53,9 @@ def render(df):
     with st.expander(f"Guías Demoradas — {n_guia} pedidos", expanded=n_guia > 0):
         if n_guia > 0:
             st.warning(f"{n_guia} guías generadas hace más de 3 días sin despacho")
-            st.dataframe(guia.reset_index(drop=True), use_container_width=True)
-
-            csv = guia.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Descargar CSV - Guías Demoradas",
-                csv,
-                "alerta_guias_demoradas.csv",
-                "text/csv",
-                key="dl_guia",
-            )
+            paged_table(guia, "tabla_guia")
+
+            download_buttons(guia, "Guías Demoradas", "alerta_guias_demoradas", dataset=df, params=(hoy,))
         else:
             st.success("No hay guías demoradas.")
 
@@ -73,15 +63,8 @@ def render(df):
     with st.expander(f"Tránsito Demorado — {n_transito} pedidos", expanded=n_transito > 0):
         if n_transito > 0:
             st.warning(f"{n_transito} envíos con más de 6 días en tránsito")
-            st.dataframe(transito.reset_index(drop=True), use_container_width=True)
-
-            csv = transito.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Descargar CSV - Tránsito Demorado",
-                csv,
-                "alerta_transito_demorado.csv",
-                "text/csv",
-                key="dl_transito",
-            )
+            paged_table(transito, "tabla_transito")
+
+            download_buttons(transito, "Tránsito Demorado", "alerta_transito_demorado", dataset=df, params=(hoy,))
         else:
             st.success("No hay envíos con tránsito demorado.")
@@ -2,20 +2,25 @@
 
 import streamlit as st
 import plotly.graph_objects as go
+from config import MIN_ENVIOS_TRANSPORTADORA
 from data_processing.analyzer import get_carrier_analysis
+from visualizations.downloads import download_buttons
+from visualizations.tables import column_config
 
 
 def _fmt(val):
     return f"${val:,}"
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de transportadoras."""
-    carriers = get_carrier_analysis(df)
-
     st.subheader("Análisis por Transportadora")
     st.caption("Compara fletes, tasas de éxito y rentabilidad entre transportadoras")
 
+    st.session_state.setdefault("min_env_carrier", MIN_ENVIOS_TRANSPORTADORA)
+    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 100, key="min_env_carrier")
+    carriers = get_carrier_analysis(df, min_envios=min_envios)
+
     if carriers.empty:
         st.info("No hay datos suficientes de transportadoras.")
         return
@@ -106,12 +111,15 @@ def render(df):
     # Tabla completa
     st.subheader("Tabla Resumen")
 
-    display = carriers.copy()
-    for col in ["Flete Envío Prom", "Flete Dev Prom", "Flete Envío Total", "Flete Dev Total", "Ganancia", "Rentabilidad"]:
-        display[col] = display[col].apply(_fmt)
-
-    st.dataframe(display.reset_index(drop=True), use_container_width=True)
+    st.dataframe(
+        carriers,
+        use_container_width=True,
+        hide_index=True,
+        column_config=column_config(
+            dinero=["Flete Envío Prom", "Flete Dev Prom", "Flete Envío Total", "Flete Dev Total",
+                    "Ganancia", "Rentabilidad"],
+            porcentaje=["% Éxito", "% Devolución"],
+        ),
+    )
 
-    csv = carriers.to_csv(index=False).encode("utf-8")
-    st.download_button("Descargar CSV - Transportadoras", csv,
-                       "transportadoras_analisis.csv", "text/csv")
+    download_buttons(carriers, "Transportadoras", "transportadoras_analisis", dataset=df, params=(min_envios,))
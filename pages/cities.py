@@ -4,9 +4,13 @@ import streamlit as st
 import plotly.graph_objects as go
 from data_processing.analyzer import get_city_analysis, get_city_profitability
 from visualizations.charts import top_cities_bar, top_cities_total_bar
+from visualizations.downloads import download_buttons
+from visualizations.tables import paged_table
 
+_DINERO = ["Ganancia", "Pérdida", "Rentabilidad", "Rent/Envío"]
 
-def render(df):
+
+def render(df, hoy=None):
     """Renderiza la página de análisis por ciudad."""
     analysis = get_city_analysis(df)
 
@@ -24,9 +28,7 @@ def render(df):
             st.divider()
             st.dataframe(by_rate.reset_index(drop=True), use_container_width=True, height=500)
 
-            csv = by_rate.to_csv(index=False).encode("utf-8")
-            st.download_button("Descargar CSV - Ciudades por Tasa", csv,
-                               "ciudades_por_tasa.csv", "text/csv")
+            download_buttons(by_rate, "Ciudades por Tasa", "ciudades_por_tasa", dataset=df)
         else:
             st.info("No hay suficientes datos por ciudad.")
 
@@ -39,9 +41,7 @@ def render(df):
             st.divider()
             st.dataframe(by_total.reset_index(drop=True), use_container_width=True, height=500)
 
-            csv = by_total.to_csv(index=False).encode("utf-8")
-            st.download_button("Descargar CSV - Ciudades por Total", csv,
-                               "ciudades_por_total.csv", "text/csv")
+            download_buttons(by_total, "Ciudades por Total", "ciudades_por_total", dataset=df)
         else:
             st.info("No hay datos de ciudades.")
 
@@ -53,7 +53,8 @@ def _render_profitability(df):
     """Sub-tab de rentabilidad por ciudad."""
     city_profit = get_city_profitability(df)
 
-    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 50, 5, key="min_env_city_rent")
+    st.session_state.setdefault("min_env_city_rent", 5)
+    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 50, key="min_env_city_rent")
     filtered = city_profit[city_profit["Envíos"] >= min_envios]
 
     no_enviar = filtered[filtered["Veredicto"] == "NO ENVIAR"]
@@ -111,12 +112,9 @@ def _render_profitability(df):
         st.divider()
 
         # Tabla NO ENVIAR
-        display = no_enviar.copy().reset_index(drop=True)
-        st.dataframe(display, use_container_width=True, height=400)
+        paged_table(no_enviar, "tabla_no_enviar", dinero=_DINERO, porcentaje=["% Devolución"])
 
-        csv = no_enviar.to_csv(index=False).encode("utf-8")
-        st.download_button("Descargar CSV - Ciudades NO ENVIAR", csv,
-                           "ciudades_no_enviar.csv", "text/csv")
+        download_buttons(no_enviar, "Ciudades NO ENVIAR", "ciudades_no_enviar", dataset=df, params=(min_envios,))
     else:
         st.success("No hay ciudades con rentabilidad negativa con el filtro actual.")
 
@@ -126,10 +124,10 @@ def _render_profitability(df):
     if not precaucion.empty:
         st.subheader("Ciudades en PRECAUCIÓN")
         st.caption("Rentabilidad positiva pero >30% devolución — riesgo alto")
-        st.dataframe(precaucion.reset_index(drop=True), use_container_width=True, height=300)
+        paged_table(precaucion, "tabla_precaucion", dinero=_DINERO, porcentaje=["% Devolución"])
 
     st.divider()
 
     # Tabla completa
     st.subheader("Todas las Ciudades")
-    st.dataframe(filtered.reset_index(drop=True), use_container_width=True, height=400)
+    paged_table(filtered, "tabla_ciudades", dinero=_DINERO, porcentaje=["% Devolución"])
@@ -2,9 +2,11 @@
 
 import streamlit as st
 from data_processing.analyzer import get_client_analysis
+from visualizations.downloads import download_buttons
+from visualizations.tables import paged_table
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de análisis de clientes."""
     analysis = get_client_analysis(df)
     bloquear = analysis["bloquear"]
@@ -22,19 +24,9 @@ def render(df):
         with col3:
             st.metric("Monto Perdido Total", f"${int(bloquear['Monto Perdido'].sum()):,}")
 
-        st.dataframe(
-            bloquear.reset_index(drop=True),
-            use_container_width=True,
-            height=400,
-        )
+        paged_table(bloquear, "tabla_bloquear", dinero=["Monto Perdido"], porcentaje=["% Devolución"])
 
-        csv = bloquear.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "Descargar CSV - Clientes a Bloquear",
-            csv,
-            "clientes_bloquear.csv",
-            "text/csv",
-        )
+        download_buttons(bloquear, "Clientes a Bloquear", "clientes_bloquear", dataset=df)
     else:
         st.info("No se encontraron clientes con 3+ devoluciones.")
 
@@ -50,12 +42,6 @@ def render(df):
             height=400,
         )
 
-        csv = premiar.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "Descargar CSV - Clientes a Premiar",
-            csv,
-            "clientes_premiar.csv",
-            "text/csv",
-        )
+        download_buttons(premiar, "Clientes a Premiar", "clientes_premiar", dataset=df)
     else:
         st.info("No se encontraron clientes con entregas exitosas.")
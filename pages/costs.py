@@ -9,7 +9,7 @@ def _fmt(val):
     return f"${val:,}"
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de costos."""
     costs = get_cost_analysis(df)
 
@@ -4,9 +4,10 @@ import streamlit as st
 import plotly.graph_objects as go
 from data_processing.analyzer import get_novelty_analysis
 from visualizations.charts import novelty_bar
+from visualizations.downloads import download_buttons
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de novedades."""
     analysis = get_novelty_analysis(df)
 
@@ -78,10 +79,4 @@ def render(df):
             height=400,
         )
 
-        csv = nov_tipo.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "Descargar CSV - Novedades por Tipo",
-            csv,
-            "novedades_por_tipo.csv",
-            "text/csv",
-        )
+        download_buttons(nov_tipo, "Novedades por Tipo", "novedades_por_tipo", dataset=df)
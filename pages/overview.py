@@ -1,14 +1,21 @@
 """Página: Resumen General."""
 
 import streamlit as st
-from data_processing.analyzer import get_general_metrics, get_status_distribution, get_temporal_evolution
+from data_processing.analyzer import (
+    get_general_metrics, get_status_distribution, get_temporal_evolution, get_store_comparison,
+)
 from visualizations.kpis import render_kpi_cards, render_secondary_kpis
 from visualizations.charts import funnel_chart, status_pie_chart, temporal_line_chart, carrier_pie
+from visualizations.tables import column_config
 
 
-def render(df):
-    """Renderiza la página de resumen general."""
-    metrics = get_general_metrics(df)
+def render(df, hoy=None):
+    """Renderiza la página de resumen general.
+
+    hoy es la fecha de referencia de los datos (la de un reporte
+    precalculado); por defecto, la fecha actual.
+    """
+    metrics = get_general_metrics(df, hoy=hoy)
 
     # KPIs principales
     st.subheader("KPIs Principales")
@@ -21,6 +28,21 @@ def render(df):
 
     st.divider()
 
+    # Comparativo entre tiendas (carga de varios archivos)
+    tiendas = get_store_comparison(df)
+    if len(tiendas) > 1:
+        st.subheader("Comparativo por Tienda")
+        st.dataframe(
+            tiendas,
+            use_container_width=True,
+            hide_index=True,
+            column_config=column_config(
+                dinero=["Ventas Brutas", "Ganancia", "Pérdida Devoluciones", "Rentabilidad"],
+                porcentaje=["% Éxito", "% Devolución"],
+            ),
+        )
+        st.divider()
+
     # Funnel + Distribución de estatus
     col1, col2 = st.columns(2)
     with col1:
@@ -10,7 +10,7 @@ def _fmt(val):
     return f"${val:,}"
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de P&L general."""
     pnl = get_pnl_general(df)
 
@@ -139,7 +139,6 @@ def render(df):
     gasto_pub = st.number_input(
         "Gasto total en publicidad ($)",
         min_value=0,
-        value=0,
         step=100000,
         format="%d",
         key="gasto_pub_general",
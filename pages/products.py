@@ -8,10 +8,13 @@ from data_processing.analyzer import (
     get_product_profitability,
     get_product_search_metrics,
 )
+from data_processing.search_index import get_product_index
 from visualizations.charts import top_products_bar, profitability_bar
+from visualizations.downloads import download_buttons
+from visualizations.tables import paged_table
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de análisis de productos."""
     tab_dev, tab_rent, tab_buscar = st.tabs([
         "% Devolución", "Rentabilidad Real", "Buscador"
@@ -32,7 +35,8 @@ def _render_devolucion(df):
 
     st.subheader("Productos por Tasa de Devolución")
 
-    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 100, 5, key="min_env_dev")
+    st.session_state.setdefault("min_env_dev", 5)
+    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 100, key="min_env_dev")
     filtered = products[products["Envíos"] >= min_envios]
 
     total_productos = len(filtered)
@@ -55,24 +59,15 @@ def _render_devolucion(df):
 
     st.subheader("Detalle por Producto")
 
-    def highlight_action(row):
-        if "PAUSAR" in str(row.get("Acción", "")):
-            return ["background-color: #ffcccc"] * len(row)
-        return [""] * len(row)
-
-    st.dataframe(
-        filtered.reset_index(drop=True).style.apply(highlight_action, axis=1),
-        use_container_width=True,
-        height=500,
+    paged_table(
+        filtered,
+        "tabla_dev",
+        dinero=["Precio Prom", "Ticket Venta", "Flete Prom", "Precio/Unidad"],
+        porcentaje=["% Devolución", "% Éxito"],
+        resaltar=lambda p: p["Acción"].str.contains("PAUSAR"),
     )
 
-    csv = filtered.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "Descargar CSV - Productos Devolución",
-        csv,
-        "productos_devolucion.csv",
-        "text/csv",
-    )
+    download_buttons(filtered, "Productos Devolución", "productos_devolucion", dataset=df, params=(min_envios,))
 
 
 def _render_rentabilidad(df):
@@ -83,7 +78,8 @@ def _render_rentabilidad(df):
         "Ganancia de entregas exitosas - Flete perdido en envíos devueltos"
     )
 
-    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 100, 5, key="min_env_rent")
+    st.session_state.setdefault("min_env_rent", 5)
+    min_envios = st.slider("Mínimo de envíos para mostrar", 1, 100, key="min_env_rent")
     filtered = profit[profit["Envíos"] >= min_envios]
 
     # KPIs
@@ -112,29 +108,21 @@ def _render_rentabilidad(df):
     # Tabla
     st.subheader("Detalle de Rentabilidad")
 
-    def highlight_profit(row):
-        if row.get("Rentabilidad Real", 0) < 0:
-            return ["background-color: #ffcccc"] * len(row)
-        return [""] * len(row)
+    paged_table(
+        filtered,
+        "tabla_rent",
+        dinero=["Ganancia Entregas", "Pérdida Devoluciones", "Rentabilidad Real", "Rent/Envío"],
+        resaltar=lambda p: p["Rentabilidad Real"] < 0,
+    )
 
-    # Formatear columnas monetarias
-    display = filtered.copy().reset_index(drop=True)
-    for col in ["Ganancia Entregas", "Pérdida Devoluciones", "Rentabilidad Real", "Rent/Envío"]:
-        display[col] = display[col].apply(lambda x: f"${x:,}")
+    download_buttons(filtered, "Rentabilidad Productos", "productos_rentabilidad", dataset=df, params=(min_envios,))
 
-    st.dataframe(
-        display.style.apply(highlight_profit, axis=1),
-        use_container_width=True,
-        height=500,
-    )
 
-    csv = filtered.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "Descargar CSV - Rentabilidad Productos",
-        csv,
-        "productos_rentabilidad.csv",
-        "text/csv",
-    )
+def _preseleccionar(index):
+    """Al cambiar la búsqueda, preselecciona los resultados si son 10 o menos."""
+    search = st.session_state["prod_search_keyword"]
+    matches = index.search(search)
+    st.session_state["prod_search_select"] = matches if search and len(matches) <= 10 else []
 
 
 def _render_buscador(df):
@@ -142,27 +130,30 @@ def _render_buscador(df):
     st.subheader("Buscador de Productos")
     st.caption("Busca por palabra clave y selecciona para ver rentabilidad combinada")
 
-    all_products = sorted(df["PRODUCTO"].unique().tolist())
+    index = get_product_index(df)
 
     search = st.text_input(
         "Busca por palabra clave",
         placeholder="Ej: hidor, linterna, audifono, dron...",
         key="prod_search_keyword",
+        on_change=_preseleccionar,
+        args=(index,),
     )
 
-    if search:
-        matches = [p for p in all_products if search.upper() in p.upper()]
-    else:
-        matches = all_products
+    matches = index.search(search)
 
     if not matches:
         st.warning(f"No se encontraron productos con '{search}'")
         return
 
+    # La selección guardada puede venir de otro dataset
+    encontrados = set(matches)
+    st.session_state["prod_search_select"] = [
+        p for p in st.session_state.get("prod_search_select", []) if p in encontrados
+    ]
     selected = st.multiselect(
         f"Selecciona productos ({len(matches)} encontrados)",
         options=matches,
-        default=matches if search and len(matches) <= 10 else [],
         key="prod_search_select",
     )
 
@@ -251,6 +242,5 @@ def _render_buscador(df):
     if len(selected) > 1:
         st.divider()
         st.subheader("Desglose por Producto")
-        profit = get_product_profitability(df)
-        detail = profit[profit["PRODUCTO"].isin(selected)].reset_index(drop=True)
+        detail = get_product_profitability(df, selected).reset_index(drop=True)
         st.dataframe(detail, use_container_width=True)
@@ -4,14 +4,15 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 from data_processing.analyzer import get_product_search_metrics, get_product_profitability
+from data_processing.search_index import get_product_index
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de búsqueda de productos."""
     st.subheader("Buscador de Productos")
 
-    # Lista de productos únicos
-    all_products = sorted(df["PRODUCTO"].unique().tolist())
+    # Índice de búsqueda (se construye una vez por dataset)
+    index = get_product_index(df)
 
     # Buscador
     search = st.text_input(
@@ -19,11 +20,8 @@ def render(df):
         placeholder="Ej: hidrolavadora, linterna, audifono...",
     )
 
-    # Filtrar productos que coincidan
-    if search:
-        matches = [p for p in all_products if search.upper() in p.upper()]
-    else:
-        matches = all_products
+    # Productos que coinciden, ordenados por relevancia
+    matches = index.search(search)
 
     if not matches:
         st.warning(f"No se encontraron productos con '{search}'")
@@ -156,6 +154,5 @@ def render(df):
         st.divider()
         st.subheader("Desglose por Producto")
 
-        profit = get_product_profitability(df)
-        detail = profit[profit["PRODUCTO"].isin(selected)].reset_index(drop=True)
+        detail = get_product_profitability(df, selected).reset_index(drop=True)
         st.dataframe(detail, use_container_width=True)
@@ -3,11 +3,15 @@
 import streamlit as st
 from visualizations.charts import delayed_ranges_bar, stuck_ranges_bar
 from data_processing.analyzer import get_temporal_analysis
+from data_processing.day_index import fecha_referencia
+from visualizations.downloads import download_buttons
+from visualizations.tables import paged_table
 
 
-def render(df):
+def render(df, hoy=None):
     """Renderiza la página de análisis temporal."""
-    analysis = get_temporal_analysis(df)
+    hoy = fecha_referencia(hoy)
+    analysis = get_temporal_analysis(df, hoy=hoy)
 
     tab_dem, tab_atas = st.tabs(["Enviados Demorados", "Atascados en Pendiente"])
 
@@ -33,19 +37,9 @@ def render(df):
                 )
 
             st.subheader("Detalle de Envíos Demorados")
-            st.dataframe(
-                detalle.reset_index(drop=True),
-                use_container_width=True,
-                height=400,
-            )
-
-            csv = detalle.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Descargar CSV - Demorados",
-                csv,
-                "envios_demorados.csv",
-                "text/csv",
-            )
+            paged_table(detalle, "tabla_demorados")
+
+            download_buttons(detalle, "Demorados", "envios_demorados", dataset=df, params=(hoy,))
         else:
             st.success("No hay envíos demorados.")
 
@@ -71,18 +65,8 @@ def render(df):
                 )
 
             st.subheader("Detalle de Pedidos Atascados")
-            st.dataframe(
-                detalle.reset_index(drop=True),
-                use_container_width=True,
-                height=400,
-            )
-
-            csv = detalle.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Descargar CSV - Atascados",
-                csv,
-                "pedidos_atascados.csv",
-                "text/csv",
-            )
+            paged_table(detalle, "tabla_atascados")
+
+            download_buttons(detalle, "Atascados", "pedidos_atascados", dataset=df, params=(hoy,))
         else:
             st.success("No hay pedidos atascados.")
@@ -0,0 +1,152 @@
+"""Instrumentación liviana por etapa: tiempo, filas y memoria de cada llamada.
+
+Las funciones de carga, clasificación, análisis y gráficos se decoran con
+@instrumentado; los bloques sueltos se miden con `with etapa(...)`. Solo se
+registra algo mientras hay una línea de tiempo activa en el hilo actual
+(ver iniciar/terminar): fuera del modo desarrollador el decorador cuesta
+una consulta a un atributo thread-local.
+
+Cada registro guarda el nombre, el inicio relativo al rerun, la duración,
+la profundidad de anidamiento, las filas de entrada y salida (si son
+DataFrame o Series) y, si se pidió, la diferencia de memoria según
+tracemalloc. tracemalloc no ve los buffers de Arrow: es una cota inferior.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import marshal
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from importlib.util import find_spec
+
+_local = threading.local()
+
+
+def _linea():
+    return getattr(_local, "linea", None)
+
+
+def _filas(obj):
+    """Filas de un DataFrame o Series; None para cualquier otro valor."""
+    if hasattr(obj, "shape") and hasattr(obj, "iloc"):
+        return int(obj.shape[0])
+    return None
+
+
+def iniciar(memoria: bool = False) -> None:
+    """Abre una línea de tiempo para el rerun actual en este hilo."""
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not memoria and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _local.linea = {"t0": time.perf_counter(), "registros": [], "nivel": 0, "memoria": memoria}
+
+
+def terminar() -> dict | None:
+    """Cierra la línea de tiempo del hilo y la devuelve (None si no había)."""
+    linea = _linea()
+    _local.linea = None
+    if linea is None:
+        return None
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "total": time.perf_counter() - linea["t0"],
+        "memoria": linea["memoria"],
+        "registros": linea["registros"],
+    }
+
+
+@contextmanager
+def etapa(nombre: str, entrada=None):
+    """Mide el bloque como una etapa; yield un dict donde fijar 'salida'."""
+    linea = _linea()
+    if linea is None:
+        yield {}
+        return
+
+    registro = {
+        "etapa": nombre,
+        "nivel": linea["nivel"],
+        "inicio": time.perf_counter() - linea["t0"],
+        "duracion": None,
+        "filas_entrada": _filas(entrada),
+        "filas_salida": None,
+        "memoria": None,
+    }
+    linea["registros"].append(registro)
+    linea["nivel"] += 1
+    mem0 = tracemalloc.get_traced_memory()[0] if linea["memoria"] else None
+    salida = {}
+    t0 = time.perf_counter()
+    try:
+        yield salida
+    finally:
+        registro["duracion"] = time.perf_counter() - t0
+        linea["nivel"] -= 1
+        if "salida" in salida:
+            registro["filas_salida"] = _filas(salida["salida"])
+        if mem0 is not None and tracemalloc.is_tracing():
+            registro["memoria"] = tracemalloc.get_traced_memory()[0] - mem0
+
+
+def instrumentado(fn=None, *, nombre: str | None = None):
+    """Decorador: registra cada llamada a fn como una etapa."""
+    if fn is None:
+        return functools.partial(instrumentado, nombre=nombre)
+    etiqueta = nombre or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _linea() is None:
+            return fn(*args, **kwargs)
+        with etapa(etiqueta, args[0] if args else None) as medida:
+            medida["salida"] = resultado = fn(*args, **kwargs)
+        return resultado
+
+    return wrapper
+
+
+def to_json(timeline: dict) -> str:
+    """Línea de tiempo serializada para descargar."""
+    return json.dumps(timeline, indent=1, ensure_ascii=False)
+
+
+def motores() -> list:
+    """Perfiladores disponibles: cProfile siempre, pyinstrument si está instalado."""
+    return ["cProfile"] + (["pyinstrument"] if find_spec("pyinstrument") else [])
+
+
+@contextmanager
+def perfil(motor: str = "cProfile", limite: int = 40):
+    """Perfila el bloque; al salir el dict tiene 'texto', 'archivo', 'extension' y 'mime'."""
+    resultado = {"motor": motor}
+    if motor == "pyinstrument":
+        from pyinstrument import Profiler
+
+        perfilador = Profiler()
+        perfilador.start()
+        try:
+            yield resultado
+        finally:
+            perfilador.stop()
+            resultado.update(texto=perfilador.output_text(), archivo=perfilador.output_html().encode("utf-8"),
+                             extension=".html", mime="text/html")
+        return
+
+    perfilador = cProfile.Profile()
+    perfilador.enable()
+    try:
+        yield resultado
+    finally:
+        perfilador.disable()
+        stats = pstats.Stats(perfilador, stream=io.StringIO())
+        stats.sort_stats("cumulative").print_stats(limite)
+        # Mismo formato que Stats.dump_stats: se abre con pstats o snakeviz
+        resultado.update(texto=stats.stream.getvalue(), archivo=marshal.dumps(stats.stats),
+                         extension=".prof", mime="application/octet-stream")
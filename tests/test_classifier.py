@@ -0,0 +1,67 @@
+"""Paridad de la clasificación vectorizada con classify_status (regla escalar)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+from benchmarks.synthetic import generate_orders
+from data_processing.classifier import classify_dataframe, classify_series, classify_status
+from data_processing.loader import clean_data
+
+CONFIGURADOS = (
+    config.ESTATUS_NUNCA_ENVIADO
+    + config.ESTATUS_PENDIENTE_ATASCADO
+    + config.ESTATUS_DEVOLUCION
+    + config.ESTATUS_ENTREGADO
+    + config.ESTATUS_EN_PROCESO
+)
+
+ESTATUS = (
+    CONFIGURADOS
+    + [e.lower() for e in CONFIGURADOS]
+    + [f"  {e.title()} " for e in CONFIGURADOS]
+    + ["ESTATUS NUEVO", "", " ", "nan", np.nan, None]
+)
+
+
+def _esperado(estatus, guias):
+    # Nulos: la versión fila por fila recibía el texto "nan"
+    return [classify_status(str(e) if e is not None else "nan", bool(g)) for e, g in zip(estatus, guias)]
+
+
+@pytest.mark.parametrize("tiene_guia", [False, True])
+@pytest.mark.parametrize("categorica", [False, True], ids=["object", "category"])
+def test_classify_series_igual_a_classify_status(tiene_guia, categorica):
+    estatus = pd.Series(ESTATUS, dtype=object)
+    if categorica:
+        estatus = estatus.astype("category")
+    guias = pd.Series(np.full(len(estatus), tiene_guia))
+
+    resultado = classify_series(estatus, guias)
+
+    assert isinstance(resultado.dtype, pd.CategoricalDtype)
+    assert resultado.astype(str).tolist() == _esperado(ESTATUS, guias)
+
+
+def test_classify_series_guias_mezcladas_conserva_indice():
+    rng = np.random.default_rng(1)
+    estatus = pd.Series(rng.choice(np.array(CONFIGURADOS + ["x"], dtype=object), 2000), index=np.arange(2000) * 3)
+    guias = pd.Series(rng.random(2000) < 0.5, index=estatus.index)
+
+    resultado = classify_series(estatus, guias)
+
+    assert resultado.index.equals(estatus.index)
+    assert resultado.astype(str).tolist() == _esperado(estatus, guias)
+
+
+def test_classify_dataframe_igual_a_fila_por_fila():
+    df = clean_data(generate_orders(5000))
+    esperado = pd.Series(_esperado(df["ESTATUS"], df["TIENE_GUIA"]), index=df.index)
+
+    categoria = classify_dataframe(df)["CATEGORIA"].astype(str)
+
+    # La única diferencia permitida es GUIA DEMORADA, que depende de las fechas
+    demorada = categoria == "GUIA DEMORADA"
+    assert (df.loc[demorada, "ESTATUS"] == "GUIA_GENERADA").all()
+    assert categoria[~demorada].equals(esperado[~demorada])
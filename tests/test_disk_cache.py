@@ -0,0 +1,32 @@
+"""El cache en disco es transparente: un frame leído del Parquet es idéntico al recién limpiado."""
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from data_processing import disk_cache
+from data_processing.classifier import classify_dataframe
+from data_processing.loader import clean_data
+
+
+def _exportacion_mezclada():
+    """Como el Excel de Dropi: TELÉFONO e ID con números y texto en la misma columna."""
+    raw = generate_orders(500)
+    for col in ("ID", "TELÉFONO"):
+        valores = raw[col].astype(object)
+        valores[::3] = valores[::3].astype(str) + "-A"
+        raw[col] = valores
+    return raw
+
+
+def test_clean_data_normaliza_columnas_mezcladas():
+    df = clean_data(_exportacion_mezclada())
+    for col in ("ID", "TELÉFONO"):
+        assert pd.api.types.infer_dtype(df[col], skipna=True) == "string"
+
+
+def test_frame_frio_y_tibio_identicos(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    frio = classify_dataframe(clean_data(_exportacion_mezclada()))
+    disk_cache.save("prueba", frio)
+    tibio = disk_cache.load("prueba")
+    pd.testing.assert_frame_equal(tibio, frio)
@@ -0,0 +1,43 @@
+"""El histórico incremental conserva la TIENDA de cada orden, también sobre un histórico sin ella."""
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_orders
+from data_processing import incremental
+from data_processing.loader import clean_data
+
+
+def test_tienda_sobre_historico_sin_tienda(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(incremental, "_actual", None)
+    limpio = clean_data(generate_orders(600))
+    viejas, nuevas = limpio.iloc[:400], limpio.iloc[400:]
+    incremental.merge_export(viejas, "v")
+
+    tienda = pd.Categorical(["NORTE"] * len(nuevas))
+    df, resumen = incremental.merge_export(nuevas.assign(TIENDA=tienda), "v")
+    assert resumen["nuevas"] == len(nuevas)
+    assert isinstance(df["TIENDA"].dtype, pd.CategoricalDtype)
+    assert list(df["TIENDA"].cat.categories) == ["NORTE"]
+    assert df["TIENDA"].isna().sum() == len(viejas)
+
+    # Releído desde disco (partes con y sin TIENDA) queda igual
+    monkeypatch.setattr(incremental, "_actual", None)
+    releido = incremental.load_store("v")["ordenes"]
+    pd.testing.assert_series_equal(releido["TIENDA"], df["TIENDA"])
+
+
+def test_renombrar_tienda_reemplaza_sus_ordenes(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(incremental, "_actual", None)
+    limpio = clean_data(generate_orders(300))
+    incremental.merge_export(limpio.assign(TIENDA=pd.Categorical(["NORTE"] * len(limpio))), "v")
+    mitad = len(limpio) // 2
+    tiendas = pd.Categorical(["SUR"] * mitad + ["NORTE"] * (len(limpio) - mitad))
+    df, resumen = incremental.merge_export(limpio.assign(TIENDA=tiendas), "v")
+    assert resumen["cambiadas"] == mitad
+    assert sorted(df["TIENDA"].cat.categories) == ["NORTE", "SUR"]
+    assert (df["TIENDA"] == "SUR").sum() == mitad
+
+    monkeypatch.setattr(incremental, "_actual", None)
+    assert sorted(incremental.load_store("v")["ordenes"]["TIENDA"].cat.categories) == ["NORTE", "SUR"]
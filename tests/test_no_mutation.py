@@ -0,0 +1,63 @@
+"""El pipeline no hace copias defensivas: ninguna etapa puede escribir en el frame que recibe.
+
+Los frames limpios y clasificados se comparten entre reruns y sesiones
+(cache_resource, cache en disco, métricas memoizadas); una escritura in
+situ los corrompería sin error visible.
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_orders
+from data_processing import analyzer, memo
+from data_processing.classifier import apply_overrides, classify_dataframe
+from data_processing.loader import clean_data
+
+
+def _sin_cambios(df, fn):
+    antes = df.copy(deep=True)
+    resultado = fn(df)
+    pd.testing.assert_frame_equal(df, antes)
+    return resultado
+
+
+def _analyzers():
+    return [nombre for nombre in dir(analyzer) if nombre.startswith("get_") and callable(getattr(analyzer, nombre))]
+
+
+@pytest.fixture(scope="module")
+def clasificado():
+    raw = generate_orders(1500)
+    limpio = _sin_cambios(raw, clean_data)
+    return _sin_cambios(limpio, classify_dataframe)
+
+
+@pytest.fixture(params=["una tienda", "varias tiendas"])
+def dataset(request, clasificado):
+    if request.param == "una tienda":
+        return clasificado
+    tiendas = pd.Categorical((clasificado.index % 2).map({0: "NORTE", 1: "SUR"}))
+    return clasificado.assign(TIENDA=tiendas)
+
+
+@pytest.mark.parametrize("nombre", _analyzers())
+def test_analyzer_no_modifica_el_frame(dataset, nombre):
+    fn = getattr(analyzer, nombre)
+    memo.clear()
+    if nombre == "get_product_search_metrics":
+        productos = dataset["PRODUCTO"].dropna().unique()[:3].tolist()
+        _sin_cambios(dataset, lambda d: fn(d, productos))
+    elif nombre in ("get_general_metrics", "get_temporal_analysis", "get_operational_alerts"):
+        _sin_cambios(dataset, lambda d: fn(d, hoy=datetime.date(2025, 6, 30)))
+        _sin_cambios(dataset, fn)
+    else:
+        _sin_cambios(dataset, fn)
+    # Segunda llamada: resultado memoizado
+    _sin_cambios(dataset, fn if nombre != "get_product_search_metrics" else lambda d: fn(d, productos))
+
+
+def test_apply_overrides_no_modifica_el_frame(clasificado):
+    estatus = str(clasificado["ESTATUS"].iloc[0])
+    _sin_cambios(clasificado, lambda d: apply_overrides(d, ia={"ESTADO RARO": "ENTREGADO"}, manual={estatus: "DEVOLUCION"}))
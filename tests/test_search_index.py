@@ -0,0 +1,42 @@
+"""Paridad de ProductIndex.search con el escaneo `consulta in nombre` que reemplazó."""
+
+import pytest
+
+from benchmarks.bench_search import _catalogo, _escaneo, consultas_aleatorias
+from data_processing.search_index import ProductIndex
+
+NOMBRES = ["CAMISETA MAXL", "KIT 2X1 CREMA", "TERMO ACERO", "GEL ANTIBACTERIAL", "Audífono Bluetooth-X"]
+
+
+@pytest.fixture(scope="module")
+def catalogo():
+    productos = _catalogo(3000)
+    return productos, ProductIndex(productos)
+
+
+@pytest.mark.parametrize("consulta", ["XL", "X1", "MO AC", "a", "2x1 c", "ACERO", "cremA"])
+def test_subcadenas_del_escaneo(consulta):
+    index = ProductIndex(NOMBRES)
+    assert set(_escaneo(NOMBRES, consulta)) <= set(index.search(consulta))
+
+
+def test_terminos_cortos_no_son_prefijo_de_otra_palabra():
+    assert ProductIndex(NOMBRES).search("A ANTI") == []
+
+
+def test_tildes_y_errores_de_tipeo():
+    index = ProductIndex(NOMBRES)
+    assert index.search("audifono") == ["Audífono Bluetooth-X"]
+    assert index.search("bluetoth") == ["Audífono Bluetooth-X"]
+
+
+def test_paridad_consultas_aleatorias(catalogo):
+    productos, index = catalogo
+    for consulta in consultas_aleatorias(productos, 400):
+        faltan = set(_escaneo(productos, consulta)) - set(index.search(consulta))
+        assert not faltan, consulta
+
+
+def test_sin_consulta_devuelve_todo(catalogo):
+    productos, index = catalogo
+    assert index.search("  ") == sorted(productos)
@@ -4,8 +4,10 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from config import COLORES_CATEGORIAS
+from profiling import instrumentado
 
 
+@instrumentado
 def funnel_chart(metrics: dict) -> go.Figure:
     """Funnel: Órdenes → Enviados → Entregados."""
     fig = go.Figure(go.Funnel(
@@ -22,9 +24,11 @@ def funnel_chart(metrics: dict) -> go.Figure:
     return fig
 
 
+@instrumentado
 def status_pie_chart(df: pd.DataFrame) -> go.Figure:
     """Distribución por categoría de estatus."""
-    dist = df["CATEGORIA"].value_counts().reset_index()
+    dist = df["CATEGORIA"].value_counts()
+    dist = dist[dist > 0].reset_index()
     dist.columns = ["Categoría", "Cantidad"]
 
     colors = [COLORES_CATEGORIAS.get(cat, "#bdc3c7") for cat in dist["Categoría"]]
@@ -44,6 +48,7 @@ def status_pie_chart(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentado
 def temporal_line_chart(evolution: pd.DataFrame) -> go.Figure:
     """Evolución temporal de entregas vs devoluciones."""
     if evolution.empty:
@@ -76,6 +81,7 @@ def temporal_line_chart(evolution: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentado
 def top_products_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     """Top N productos con mayor % devolución."""
     top = df.head(n).copy()
@@ -101,6 +107,7 @@ def top_products_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     return fig
 
 
+@instrumentado
 def top_cities_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     """Top N ciudades con mayor % devolución."""
     top = df.head(n).copy()
@@ -126,6 +133,7 @@ def top_cities_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     return fig
 
 
+@instrumentado
 def top_cities_total_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     """Top N ciudades con más devoluciones totales."""
     top = df.head(n).copy()
@@ -148,6 +156,7 @@ def top_cities_total_bar(df: pd.DataFrame, n: int = 10) -> go.Figure:
     return fig
 
 
+@instrumentado
 def delayed_ranges_bar(rangos: pd.DataFrame) -> go.Figure:
     """Demorados por rangos de días."""
     fig = go.Figure(go.Bar(
@@ -167,6 +176,7 @@ def delayed_ranges_bar(rangos: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentado
 def stuck_ranges_bar(rangos: pd.DataFrame) -> go.Figure:
     """Atascados por rangos de días."""
     fig = go.Figure(go.Bar(
@@ -186,6 +196,7 @@ def stuck_ranges_bar(rangos: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentado
 def novelty_bar(top_novedades: pd.DataFrame, n: int = 10) -> go.Figure:
     """Top novedades más frecuentes."""
     top = top_novedades.head(n).copy()
@@ -208,9 +219,11 @@ def novelty_bar(top_novedades: pd.DataFrame, n: int = 10) -> go.Figure:
     return fig
 
 
+@instrumentado
 def carrier_pie(df: pd.DataFrame) -> go.Figure:
     """Distribución por transportadora."""
-    dist = df["TRANSPORTADORA"].value_counts().reset_index()
+    dist = df["TRANSPORTADORA"].value_counts()
+    dist = dist[dist > 0].reset_index()
     dist.columns = ["Transportadora", "Cantidad"]
 
     fig = go.Figure(go.Pie(
@@ -227,6 +240,7 @@ def carrier_pie(df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+@instrumentado
 def profitability_bar(df: pd.DataFrame, n: int = 15) -> go.Figure:
     """Top productos con peor y mejor rentabilidad real."""
     # Peores 15
@@ -252,6 +266,7 @@ def profitability_bar(df: pd.DataFrame, n: int = 15) -> go.Figure:
     return fig
 
 
+@instrumentado
 def cost_loss_bar(top_df: pd.DataFrame, title: str, y_col: str) -> go.Figure:
     """Barras horizontales para top pérdidas por ciudad o producto."""
     top = top_df.sort_values("Pérdida Total", ascending=True).copy()
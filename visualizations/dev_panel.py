@@ -0,0 +1,72 @@
+"""Panel del modo desarrollador: línea de tiempo del rerun y perfiles."""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+import profiling
+from data_processing import memo
+
+
+def timeline_frame(timeline: dict) -> pd.DataFrame:
+    """Registros de la línea de tiempo como tabla (tiempos en ms, memoria en MB)."""
+    registros = pd.DataFrame(timeline["registros"], columns=[
+        "etapa", "nivel", "inicio", "duracion", "filas_entrada", "filas_salida", "memoria",
+    ])
+    return pd.DataFrame({
+        "Etapa": ["· " * n + e for n, e in zip(registros["nivel"], registros["etapa"])],
+        "Inicio (ms)": (registros["inicio"] * 1e3).round(1),
+        "Duración (ms)": (registros["duracion"].astype(float) * 1e3).round(1),
+        "Filas Entrada": registros["filas_entrada"].astype("Int64"),
+        "Filas Salida": registros["filas_salida"].astype("Int64"),
+        "Memoria (MB)": (registros["memoria"].astype(float) / 1024 ** 2).round(2),
+    })
+
+
+def timeline_chart(tabla: pd.DataFrame) -> go.Figure:
+    """Barras horizontales de cada etapa sobre el eje de tiempo del rerun."""
+    fig = go.Figure(go.Bar(
+        y=tabla["Etapa"],
+        x=tabla["Duración (ms)"],
+        base=tabla["Inicio (ms)"],
+        orientation="h",
+        marker_color="#3498db",
+        hovertemplate="%{y}<br>%{x:.1f} ms<extra></extra>",
+    ))
+    fig.update_layout(
+        xaxis_title="ms desde el inicio del rerun",
+        yaxis=dict(autorange="reversed"),
+        height=max(250, 22 * len(tabla)),
+        margin=dict(t=10, b=40, l=10, r=10),
+    )
+    return fig
+
+
+def memo_frame(stats: dict) -> pd.DataFrame:
+    """Aciertos y fallos del cache de métricas por función del analyzer."""
+    tabla = pd.DataFrame.from_dict(stats["por_funcion"], orient="index", columns=["hits", "misses"])
+    tabla = tabla.rename(columns={"hits": "Aciertos", "misses": "Fallos"}).rename_axis("Función")
+    return tabla.sort_values("Fallos", ascending=False).reset_index()
+
+
+def render_dev_panel(timeline: dict | None, reporte: dict | None = None):
+    """Línea de tiempo del último rerun, descarga JSON y perfil de la página."""
+    if not timeline:
+        st.caption("Sin mediciones en este rerun.")
+        return
+
+    tabla = timeline_frame(timeline)
+    st.caption(f"Rerun: {timeline['total'] * 1e3:,.0f} ms · {len(tabla)} etapas")
+    st.dataframe(tabla, hide_index=True, use_container_width=True)
+    st.plotly_chart(timeline_chart(tabla), use_container_width=True)
+    st.download_button("Descargar línea de tiempo (JSON)", profiling.to_json(timeline).encode("utf-8"),
+                       "timeline.json", "application/json", key="dev_timeline_json")
+
+    metricas = memo.stats()
+    if metricas["por_funcion"]:
+        st.caption(f"Métricas memoizadas: {metricas['hits']} aciertos · {metricas['misses']} fallos")
+        st.dataframe(memo_frame(metricas), hide_index=True, use_container_width=True)
+
+    if reporte and "archivo" in reporte:
+        st.download_button(f"Descargar perfil ({reporte['motor']})", reporte["archivo"],
+                           f"perfil{reporte['extension']}", reporte["mime"], key="dev_perfil_archivo")
+        st.code(reporte["texto"], language=None)
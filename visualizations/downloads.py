@@ -0,0 +1,54 @@
+"""Botones de descarga de tablas en CSV, Excel y Parquet."""
+
+import streamlit as st
+from data_processing import exports
+from data_processing.frame_cache import fingerprint
+
+FORMATOS_DESCARGA = ("csv", "xlsx", "parquet")
+
+
+def download_buttons(tabla, titulo: str, archivo: str, dataset=None, params=(),
+                     formatos=FORMATOS_DESCARGA):
+    """Un botón por formato para descargar tabla; el archivo se genera al hacer clic.
+
+    dataset es el DataFrame del que sale tabla y params los filtros que la
+    producen: juntos forman la clave del cache de exportaciones.
+    """
+    def generar(formato):
+        clave = None if dataset is None else (fingerprint(dataset), archivo, tuple(params))
+        return exports.export(tabla, formato, clave)
+
+    for col, formato in zip(st.columns(len(formatos)), formatos):
+        nombre, mime, extension, _ = exports.FORMATOS[formato]
+        with col:
+            _boton(
+                f"Descargar {nombre} - {titulo}",
+                lambda formato=formato: generar(formato),
+                f"{archivo}{extension}",
+                mime,
+                key=f"dl_{archivo}_{formato}",
+            )
+
+
+def summary_downloads(df, archivo: str = "resumen_negocio", hoy=None):
+    """Botones para descargar el resumen del negocio (el mismo que lee el consejero IA)."""
+    from data_processing.summary import business_summary, summary_json, summary_text
+
+    formatos = (
+        ("Texto", "text/plain", ".txt", summary_text),
+        ("JSON", "application/json", ".json", summary_json),
+    )
+    for col, (nombre, mime, extension, serializar) in zip(st.columns(len(formatos)), formatos):
+        with col:
+            _boton(
+                f"Descargar resumen - {nombre}",
+                lambda serializar=serializar: serializar(business_summary(df, hoy=hoy)).encode("utf-8"),
+                f"{archivo}{extension}",
+                mime,
+                key=f"dl_{archivo}_{extension[1:]}",
+            )
+
+
+def _boton(label, generar, archivo, mime, key):
+    # Streamlit >= 1.52 ejecuta el callable de data recién al hacer clic
+    st.download_button(label, generar, archivo, mime, key=key, on_click="ignore")
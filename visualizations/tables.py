@@ -0,0 +1,109 @@
+"""Tabla paginada: filtra, ordena y pagina en el servidor.
+
+Solo la página visible viaja al navegador. Los montos y porcentajes se
+formatean con column_config (los valores siguen siendo numéricos) y el
+resaltado de filas se aplica con Styler únicamente sobre esa página.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import COLOR_RESALTADO, TABLA_FILAS_PAGINA, TABLA_OPCIONES_PAGINA
+
+_SIN_ORDEN = "(sin ordenar)"
+_CONTROLES = ("filtro", "orden", "desc", "filas", "pagina")
+
+
+def table_keys(*tablas: str) -> list:
+    """Claves de los widgets de cada paged_table (para conservarlas al cambiar de página, ver app.py)."""
+    return [f"{tabla}_{control}" for tabla in tablas for control in _CONTROLES]
+
+
+def _es_texto(serie: pd.Series) -> bool:
+    return isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(serie.dtype)
+
+
+def _contiene(serie: pd.Series, texto: str) -> np.ndarray:
+    """Filas de serie que contienen texto (sin distinguir mayúsculas)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Se busca en las categorías y se expande por código
+        cats = pd.Series(serie.cat.categories).astype(str).str.contains(texto, case=False, regex=False)
+        codigos = serie.cat.codes.to_numpy()
+        return np.append(cats.to_numpy(dtype=bool), False)[codigos]
+    return serie.astype(str).str.contains(texto, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+
+def filtrar_ordenar(tabla: pd.DataFrame, texto: str = "", columna=None, descendente=False) -> np.ndarray:
+    """Posiciones de tabla que contienen texto en alguna columna de texto, en el orden pedido."""
+    pos = np.arange(len(tabla))
+    texto = texto.strip()
+    if texto:
+        mask = np.zeros(len(tabla), dtype=bool)
+        for col in tabla.columns:
+            if _es_texto(tabla[col]):
+                mask |= _contiene(tabla[col], texto)
+        pos = pos[mask]
+
+    if columna is not None and len(pos):
+        valores = tabla[columna].iloc[pos].reset_index(drop=True)
+        orden = valores.sort_values(ascending=not descendente, kind="stable", na_position="last").index
+        pos = pos[orden.to_numpy()]
+    return pos
+
+
+def column_config(dinero=(), porcentaje=()) -> dict:
+    """column_config de st.dataframe: columnas en dinero ($1,234) y porcentaje (12.3%)."""
+    config = {c: st.column_config.NumberColumn(format="dollar", step=1) for c in dinero}
+    config.update({c: st.column_config.NumberColumn(format="%.1f%%") for c in porcentaje})
+    return config
+
+
+def paged_table(tabla: pd.DataFrame, key: str, dinero=(), porcentaje=(), resaltar=None,
+                height=None):
+    """Tabla paginada con filtro de texto y orden por columna.
+
+    dinero y porcentaje son las columnas a mostrar como $ y %; resaltar es
+    una función página → máscara booleana de filas a pintar.
+    """
+    col_filtro, col_orden, col_desc, col_filas = st.columns([3, 2, 1, 1])
+    with col_filtro:
+        texto = st.text_input("Filtrar", key=f"{key}_filtro", placeholder="Buscar en la tabla...")
+    with col_orden:
+        columna = st.selectbox("Ordenar por", [_SIN_ORDEN, *tabla.columns], key=f"{key}_orden")
+    with col_desc:
+        descendente = st.checkbox("Desc.", key=f"{key}_desc")
+    with col_filas:
+        # Valor inicial por Session State: app.py reasigna estas claves en cada rerun
+        st.session_state.setdefault(f"{key}_filas", TABLA_FILAS_PAGINA)
+        filas = st.selectbox("Filas", TABLA_OPCIONES_PAGINA, key=f"{key}_filas")
+
+    pos = filtrar_ordenar(tabla, texto, None if columna == _SIN_ORDEN else columna, descendente)
+    total = len(pos)
+    paginas = max(1, -(-total // filas))
+
+    pagina = 1
+    if paginas > 1:
+        # El filtro pudo dejar menos páginas que la seleccionada
+        if st.session_state.get(f"{key}_pagina", 1) > paginas:
+            st.session_state[f"{key}_pagina"] = paginas
+        pagina = int(st.number_input("Página", 1, paginas, key=f"{key}_pagina"))
+
+    inicio = (pagina - 1) * filas
+    visible = tabla.iloc[pos[inicio:inicio + filas]].reset_index(drop=True)
+    st.caption(f"Filas {inicio + 1 if total else 0:,}–{min(inicio + filas, total):,} de {total:,}"
+               f" · página {pagina} de {paginas}")
+
+    data = visible
+    if resaltar is not None and not visible.empty:
+        mask = np.asarray(resaltar(visible), dtype=bool)
+        estilos = np.where(mask, f"background-color: {COLOR_RESALTADO}", "")
+        data = visible.style.apply(lambda d: np.repeat(estilos[:, None], d.shape[1], axis=1), axis=None)
+
+    opciones = {"height": height} if height else {}
+    st.dataframe(
+        data,
+        use_container_width=True,
+        hide_index=True,
+        column_config=column_config(dinero, porcentaje),
+        **opciones,
+    )